@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Benchmark for the car processor.
+
+This script times the per-record ``process`` path against the vectorized
+``process_frame`` path on synthetic listings and checks that both keep the
+same rows.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.data.processors.car_processor import CarProcessor
+
+TITLES = [
+    "Toyota Corolla XEi 2.0",
+    "2019 Honda Civic EXL",
+    "Chevrolet Onix 1.0 Turbo 2021",
+    "Volkswagen Gol 1.6",
+    "Fiat Argo Drive",
+]
+
+
+def make_records(count, distinct_titles=5000, seed=0):
+    """Generate synthetic car listings drawing from a pool of distinct titles."""
+    rng = random.Random(seed)
+    titles = [f"{rng.choice(TITLES)} {index}" for index in range(distinct_titles)]
+    records = []
+    for _ in range(count):
+        record = {
+            "title": rng.choice(titles),
+            "price": rng.uniform(20000, 200000),
+            "mileage": rng.randint(0, 200000),
+            "source": "benchmark",
+            "url": "https://example.test/listing",
+        }
+        if rng.random() < 0.8:
+            record["year"] = rng.randint(2005, 2023)
+        records.append(record)
+    return records
+
+
+def main():
+    """Run the processor benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the per-record and vectorized car processor")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100000, 1000000],
+        help="Numbers of rows to process (default: 100000 1000000)",
+    )
+    parser.add_argument(
+        "--titles",
+        type=int,
+        default=5000,
+        help="Number of distinct titles; listings of the same trim share titles (default: 5000)",
+    )
+    
+    args = parser.parse_args()
+    processor = CarProcessor()
+    
+    print(f"{'rows':>10}{'process':>12}{'frame':>12}{'speedup':>10}")
+    for size in args.sizes:
+        records = make_records(size, args.titles)
+        frame = pd.DataFrame(records)
+        
+        start = time.perf_counter()
+        processed = processor.process(records)
+        per_record = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        processed_frame = processor.process_frame(frame)
+        vectorized = time.perf_counter() - start
+        
+        assert len(processed) == len(processed_frame)
+        print(f"{size:>10}{per_record:>11.2f}s{vectorized:>11.2f}s{per_record / vectorized:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Benchmark for the car validator.
+
+This script times the per-record ``validate`` path against the vectorized
+``validate_frame`` path on synthetic listings and checks that both reject the
+same number of rows.
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.data.validators.car_validator import CarValidator
+
+
+def make_records(count, invalid_ratio=0.1, seed=0):
+    """Generate synthetic car listings, some of which break a validation rule."""
+    rng = random.Random(seed)
+    records = []
+    for index in range(count):
+        record = {
+            "title": f"Car {index}",
+            "price": rng.uniform(20000, 200000),
+            "year": rng.randint(2005, 2023),
+            "mileage": rng.randint(0, 200000),
+            "source": "benchmark",
+            "url": f"https://example.test/{index}",
+        }
+        if rng.random() < invalid_ratio:
+            record[rng.choice(["price", "year", "mileage"])] = -1
+        records.append(record)
+    return records
+
+
+def main():
+    """Run the validator benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the per-record and vectorized car validator")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100000, 1000000],
+        help="Numbers of rows to validate (default: 100000 1000000)",
+    )
+    parser.add_argument(
+        "--invalid",
+        type=float,
+        default=0.1,
+        help="Fraction of rows breaking a rule (default: 0.1)",
+    )
+    
+    args = parser.parse_args()
+    validator = CarValidator()
+    
+    # Per-row warnings of the record path would dominate the timings otherwise
+    logging.disable(logging.WARNING)
+    
+    print(f"{'rows':>10}{'validate':>12}{'frame':>12}{'speedup':>10}")
+    for size in args.sizes:
+        records = make_records(size, args.invalid)
+        frame = pd.DataFrame(records)
+        
+        start = time.perf_counter()
+        _, invalid = validator.validate(records)
+        per_record = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        _, invalid_frame, _ = validator.validate_frame(frame)
+        vectorized = time.perf_counter() - start
+        
+        assert len(invalid) == len(invalid_frame)
+        print(f"{size:>10}{per_record:>11.3f}s{vectorized:>11.3f}s{per_record / vectorized:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+Benchmark for the cars.com HTML parser backends.
+
+This script times each parser backend of the cars.com collector against saved
+results pages and checks that they all extract identical listings.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import timeit
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.data.collectors.cars_com_collector import PARSERS, CarsComCollector
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(__file__), "..", "tests", "data", "fixtures", "cars_com_*.html")
+
+
+def main():
+    """Run the parser benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the cars.com parser backends")
+    parser.add_argument(
+        "fixtures",
+        nargs="?",
+        default=DEFAULT_FIXTURES,
+        help="Glob of saved results pages (default: tests/data/fixtures/cars_com_*.html)",
+    )
+    parser.add_argument(
+        "-n",
+        "--number",
+        type=int,
+        default=50,
+        help="Number of parses per page and backend (default: 50)",
+    )
+    
+    args = parser.parse_args()
+    
+    pages = [open(path, encoding="utf-8").read() for path in sorted(glob.glob(args.fixtures))]
+    if not pages:
+        print(f"No fixtures found for {args.fixtures}")
+        return 1
+    
+    collectors = {
+        name: CarsComCollector(config={"max_pages": 1, "delay": 0, "parser": name})
+        for name in PARSERS
+    }
+    
+    # All backends must produce the same listings
+    results = {
+        name: [collector._extract_listings(collector._parse_html(page)) for page in pages]
+        for name, collector in collectors.items()
+    }
+    baseline = results["html.parser"]
+    for name, result in results.items():
+        if result != baseline:
+            print(f"{name} output differs from html.parser")
+            return 1
+    
+    print(f"{len(pages)} page(s), {sum(len(listings) for listings in baseline)} listings, {args.number} runs each")
+    
+    baseline_time = None
+    for name, collector in collectors.items():
+        elapsed = timeit.timeit(
+            lambda: [collector._extract_listings(collector._parse_html(page)) for page in pages],
+            number=args.number,
+        )
+        per_page = elapsed / (args.number * len(pages)) * 1000
+        baseline_time = baseline_time or per_page
+        print(f"{name:<12} {per_page:8.3f} ms/page  {baseline_time / per_page:5.2f}x")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Benchmark for the listing deduplicator.
+
+This script clusters synthetic listings in which a share of the cars is
+listed twice with a reworded title, and reports how the running time grows
+with the number of listings.
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.data.processors.deduplicator import ListingDeduplicator
+
+MODELS = [
+    ("Toyota", "Corolla", ["XEi", "GLi", "Altis", "2.0", "Hybrid"]),
+    ("Honda", "Civic", ["EXL", "LXR", "Touring", "2.0", "1.5 Turbo"]),
+    ("Volkswagen", "Gol", ["1.0", "1.6", "Trendline", "Comfortline"]),
+    ("Chevrolet", "Onix", ["LT", "LTZ", "Premier", "1.0 Turbo"]),
+]
+
+WORDS = [
+    "único dono", "revisado", "ipva pago", "garantia", "teto solar", "couro", "manual", "chave reserva",
+    "blindado", "multimedia", "câmera de ré", "sensor", "rodas aro 17", "pneus novos", "laudo cautelar",
+    "aceito troca", "financio", "baixa km", "impecável", "pintura original", "placa final 1", "branco",
+    "prata", "preto",
+]
+
+
+def make_records(count, duplicate_ratio=0.2, seed=0):
+    """Generate synthetic listings, some of which are relisted by another source."""
+    rng = random.Random(seed)
+    records = []
+    while len(records) < count:
+        brand, model, trims = rng.choice(MODELS)
+        year = rng.randint(2010, 2023)
+        words = rng.sample(trims, 2) + rng.sample(WORDS, 5)
+        record = {
+            "title": f"{brand} {model} {' '.join(words[:2])} {year}",
+            "description": " ".join(words[2:] + [str(rng.randint(0, 10 ** 6))]),
+            "brand": brand,
+            "model": model,
+            "year": year,
+            "mileage": rng.randint(0, 200000),
+            "price": rng.uniform(20000, 200000),
+            "source": "cars.com",
+        }
+        records.append(record)
+        
+        if rng.random() < duplicate_ratio:
+            relisted = dict(record, source="webmotors", mileage=record["mileage"] + rng.randint(0, 500))
+            relisted["title"] = f"{year} {brand} {model} {' '.join(reversed(words[:2]))}"
+            records.append(relisted)
+    return records[:count]
+
+
+def main():
+    """Run the deduplicator benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the listing deduplicator")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10000, 50000, 100000],
+        help="Numbers of listings to cluster (default: 10000 50000 100000)",
+    )
+    
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    
+    print(f"{'listings':>10}{'clusters':>10}{'seconds':>10}{'us/listing':>12}")
+    for size in args.sizes:
+        records = make_records(size)
+        
+        start = time.perf_counter()
+        clusters = len(set(ListingDeduplicator().cluster(records)))
+        elapsed = time.perf_counter() - start
+        
+        print(f"{size:>10}{clusters:>10}{elapsed:>10.2f}{elapsed / size * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Benchmark for the local financing simulator.
+
+This script times installment grids of the vectorized amortization engine and
+compares the cost per cell with a scalar Python loop.
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.services.webmotors.financing import FinancingSimulator
+
+
+def scalar_grid(price, down_payments, terms, rates):
+    """Compute the same grid one cell at a time."""
+    return [
+        [
+            [(price - down) * rate / (1 - (1 + rate) ** -term) for rate in rates]
+            for term in terms
+        ]
+        for down in down_payments
+    ]
+
+
+def main():
+    """Run the financing benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the local financing simulator")
+    parser.add_argument("--down-payments", type=int, default=50, help="Number of down payments (default: 50)")
+    parser.add_argument("--rates", type=int, default=20, help="Number of monthly rates (default: 20)")
+    parser.add_argument("-n", "--number", type=int, default=20, help="Number of runs (default: 20)")
+    
+    args = parser.parse_args()
+    
+    simulator = FinancingSimulator()
+    price = 100000.0
+    down_payments = np.linspace(0, price * 0.6, args.down_payments)
+    terms = np.array([12, 18, 24, 30, 36, 42, 48, 54, 60])
+    rates = np.linspace(0.008, 0.03, args.rates)
+    cells = len(down_payments) * len(terms) * len(rates)
+    
+    vectorized = timeit.timeit(
+        lambda: simulator.installments(price, down_payments, terms, monthly_rates=rates),
+        number=args.number,
+    ) / args.number
+    scalar = timeit.timeit(
+        lambda: scalar_grid(price, down_payments.tolist(), terms.tolist(), rates.tolist()),
+        number=args.number,
+    ) / args.number
+    
+    print(f"Grid of {cells} cells ({len(down_payments)} down payments x {len(terms)} terms x {len(rates)} rates)")
+    print(f"{'vectorized':<12}{vectorized * 1000:>10.3f} ms{vectorized / cells * 1e6:>12.4f} us/cell")
+    print(f"{'scalar':<12}{scalar * 1000:>10.3f} ms{scalar / cells * 1e6:>12.4f} us/cell")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+Benchmark for the raw JSON Lines archive.
+
+This script compares archiving raw listings with a single indented JSON dump,
+which needs the whole run in memory, against streaming them page by page with
+``JsonLinesWriter`` for each available compression and serializer.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_records import make_records
+from src.data import jsonl_archive
+from src.data.jsonl_archive import JsonLinesWriter, iter_json_lines
+
+
+def files_size(paths):
+    """Return the total size in bytes of files."""
+    return sum(os.path.getsize(path) for path in paths)
+
+
+def main():
+    """Run the archive benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark JSON dumps against streamed JSON Lines archives")
+    parser.add_argument("--count", type=int, default=100000, help="Number of listings (default: 100000)")
+    parser.add_argument("--page-size", type=int, default=1000, help="Listings per written page (default: 1000)")
+    
+    args = parser.parse_args()
+    records = make_records(args.count)
+    
+    print(f"{'output':<28}{'write s':>10}{'read s':>10}{'size':>12}")
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "raw.json")
+        start = time.perf_counter()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2)
+        write_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        with open(path, encoding="utf-8") as f:
+            json.load(f)
+        read_elapsed = time.perf_counter() - start
+        print(f"{'indented JSON dump':<28}{write_elapsed:>10.2f}{read_elapsed:>10.2f}{files_size([path]) / 2 ** 20:>10.1f}MB")
+        
+        compressions = ["gzip"] + (["zstd"] if jsonl_archive.zstandard is not None else [])
+        serializers = ["json"] + (["orjson"] if jsonl_archive.orjson is not None else [])
+        for compression in compressions:
+            for serializer in serializers:
+                prefix = os.path.join(root, f"{compression}_{serializer}", "raw")
+                start = time.perf_counter()
+                with JsonLinesWriter(prefix, compression=compression, serializer=serializer) as writer:
+                    for page_start in range(0, len(records), args.page_size):
+                        writer.write(records[page_start:page_start + args.page_size])
+                write_elapsed = time.perf_counter() - start
+                start = time.perf_counter()
+                for _ in iter_json_lines(writer.paths):
+                    pass
+                read_elapsed = time.perf_counter() - start
+                label = f"JSON Lines {compression}, {serializer}"
+                size = files_size(writer.paths) / 2 ** 20
+                print(f"{label:<28}{write_elapsed:>10.2f}{read_elapsed:>10.2f}{size:>10.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
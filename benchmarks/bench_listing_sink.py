@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+Benchmark for the listing sink.
+
+This script compares the previous output of a run, the raw, processed, valid
+and combined listings each dumped as indented JSON, with writing the listings
+once per page to the partitioned dataset of ``ListingSink``.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_records import make_records
+from src.data.listing_sink import ListingSink
+
+
+def directory_size(path):
+    """Return the total size in bytes of the files under a directory."""
+    return sum(
+        os.path.getsize(os.path.join(directory, filename))
+        for directory, _, filenames in os.walk(path)
+        for filename in filenames
+    )
+
+
+def main():
+    """Run the sink benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark JSON dumps against the partitioned listing sink")
+    parser.add_argument("--count", type=int, default=100000, help="Number of listings (default: 100000)")
+    parser.add_argument("--page-size", type=int, default=1000, help="Listings per written page (default: 1000)")
+    
+    args = parser.parse_args()
+    records = make_records(args.count)
+    for index, record in enumerate(records):
+        record["source"] = "webmotors" if index % 2 else "cars.com"
+    
+    print(f"{'output':<24}{'seconds':>10}{'size':>12}")
+    with tempfile.TemporaryDirectory() as root:
+        json_dir = os.path.join(root, "json")
+        os.makedirs(json_dir)
+        start = time.perf_counter()
+        for name in ["raw", "processed", "valid", "all_data"]:
+            with open(os.path.join(json_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+                json.dump(records, f, indent=2)
+        elapsed = time.perf_counter() - start
+        print(f"{'4 indented JSON dumps':<24}{elapsed:>10.2f}{directory_size(json_dir) / 2 ** 20:>10.1f}MB")
+        
+        for use_parquet in [True, False]:
+            sink_dir = os.path.join(root, "parquet" if use_parquet else "jsonl")
+            start = time.perf_counter()
+            with ListingSink(sink_dir, use_parquet=use_parquet) as sink:
+                for page_start in range(0, len(records), args.page_size):
+                    sink.write(records[page_start:page_start + args.page_size])
+            elapsed = time.perf_counter() - start
+            label = "sink, Parquet zstd" if use_parquet else "sink, JSON Lines gzip"
+            print(f"{label:<24}{elapsed:>10.2f}{directory_size(sink_dir) / 2 ** 20:>10.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
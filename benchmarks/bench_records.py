@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Memory benchmark for the listing representations.
+
+This script measures the memory held by synthetic Webmotors-like listings as
+plain dictionaries and as ``ListingBatch`` columns, with and without the
+nested fields that have no column. Dictionaries are measured on a sample and
+extrapolated; batches are built at full size chunk by chunk.
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.data.records import ListingBatch
+
+MODELS = [
+    ("Toyota", "Corolla", ["XEi 2.0", "GLi 1.8", "Altis Hybrid"]),
+    ("Honda", "Civic", ["EXL 2.0", "Touring 1.5 Turbo"]),
+    ("Volkswagen", "Gol", ["1.0", "1.6 Trendline"]),
+    ("Chevrolet", "Onix", ["LT 1.0", "Premier 1.0 Turbo"]),
+]
+
+
+def make_records(count, start=0, seed=0):
+    """Generate synthetic processed Webmotors listings with nested details."""
+    rng = random.Random(seed + start)
+    records = []
+    for index in range(start, start + count):
+        brand, model, versions = rng.choice(MODELS)
+        version = rng.choice(versions)
+        year = rng.randint(2010, 2023)
+        price = round(rng.uniform(20000, 200000), 2)
+        mileage = rng.randint(0, 200000)
+        records.append({
+            "id": str(10 ** 8 + index),
+            "title": f"{brand} {model} {version} {year}",
+            "brand": brand,
+            "model": model,
+            "year": year,
+            "price": price,
+            "mileage": mileage,
+            "source": "webmotors",
+            "url": f"https://www.webmotors.com.br/comprar/{index}",
+            "color": rng.choice(["Branco", "Preto", "Prata"]),
+            "transmission": "Automática",
+            "fuel": "Flex",
+            "doors": 4,
+            "features": ["Airbag", "ABS", "Ar condicionado", "Direção elétrica"],
+            "images": [f"https://image.webmotors.com.br/{index}/{photo}.jpg" for photo in range(3)],
+            "seller": {"name": "Loja", "type": "dealer"},
+            "location": {"city": "São Paulo", "state": "SP"},
+            "price_per_mile": price / mileage if mileage else None,
+            "age": 2023 - year,
+            "price_per_age": price / (2023 - year) if year < 2023 else None,
+        })
+    return records
+
+
+def measure(build):
+    """Return the object built by a function and the bytes it holds."""
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, current
+
+
+def main():
+    """Run the memory benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the memory of the listing representations")
+    parser.add_argument("--count", type=int, default=1000000, help="Number of listings (default: 1000000)")
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=100000,
+        help="Number of listings held as dictionaries to extrapolate from (default: 100000)",
+    )
+    parser.add_argument("--chunk", type=int, default=100000, help="Listings per batch chunk (default: 100000)")
+    
+    args = parser.parse_args()
+    
+    _, dict_bytes = measure(lambda: make_records(args.sample))
+    per_dict = dict_bytes / args.sample
+    
+    print(f"{'representation':<28}{'bytes/listing':>14}{'total':>12}{'seconds':>10}")
+    print(f"{'dicts (extrapolated)':<28}{per_dict:>14.0f}{per_dict * args.count / 2 ** 20:>10.0f}MB{'':>10}")
+    
+    for keep_extra in [True, False]:
+        def build():
+            batches = [
+                ListingBatch.from_records(make_records(min(args.chunk, args.count - start), start), keep_extra)
+                for start in range(0, args.count, args.chunk)
+            ]
+            return ListingBatch.concat(batches)
+        
+        start_time = time.perf_counter()
+        batch, batch_bytes = measure(build)
+        elapsed = time.perf_counter() - start_time
+        
+        assert len(batch) == args.count
+        label = "batch" if keep_extra else "batch without nested fields"
+        print(f"{label:<28}{batch_bytes / args.count:>14.0f}{batch_bytes / 2 ** 20:>10.0f}MB{elapsed:>10.1f}")
+        del batch
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Benchmark for the Webmotors collector against the local stub server.
+
+This script crawls a stub Webmotors API with configurable latency and error rate
+and reports the wall time for different detail-fetch worker counts, with and
+without the on-disk response cache.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.data.collectors.webmotors_collector import WebmotorsCollector
+from src.services.testing.stub_server import StubServer
+
+
+def run(server, max_workers, cache_dir=None):
+    """Run one crawl and return its wall time and listing count."""
+    config = {"max_pages": server.pages, "filters": {}, "max_workers": max_workers}
+    if cache_dir:
+        config["cache"] = {"cache_dir": cache_dir}
+    
+    collector = WebmotorsCollector(config=config)
+    start = time.perf_counter()
+    listings = collector.collect()
+    return time.perf_counter() - start, len(listings)
+
+
+def main():
+    """Run the collector benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the Webmotors collector offline")
+    parser.add_argument("--pages", type=int, default=3, help="Catalog pages (default: 3)")
+    parser.add_argument("--per-page", type=int, default=20, help="Vehicles per page (default: 20)")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub response delay in seconds (default: 0.02)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Stub 503 probability (default: 0)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 4, 16],
+        help="Detail-fetch worker counts to compare (default: 1 4 16)",
+    )
+    
+    args = parser.parse_args()
+    
+    server = StubServer(
+        pages=args.pages,
+        per_page=args.per_page,
+        latency=args.latency,
+        error_rate=args.error_rate,
+    )
+    
+    with server:
+        os.environ.update({
+            "WEBMOTORS_CLIENT_ID": "bench_client_id",
+            "WEBMOTORS_CLIENT_SECRET": "bench_client_secret",
+            "WEBMOTORS_API_USERNAME": "bench_username",
+            "WEBMOTORS_API_PASSWORD": "bench_password",
+            "WEBMOTORS_API_BASE_URL": server.url,
+            "WEBMOTORS_AUTH_BASE_URL": server.auth_url,
+        })
+        
+        for workers in args.workers:
+            elapsed, count = run(server, workers)
+            print(f"workers={workers:<3} {elapsed:7.3f}s  {count} listings")
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold, _ = run(server, max(args.workers), cache_dir)
+            warm, count = run(server, max(args.workers), cache_dir)
+            print(f"cache cold  {cold:7.3f}s")
+            print(f"cache warm  {warm:7.3f}s  {count} listings")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 import streamlit as st
 from ui.page_manager import render_sidebar, render_current_page
+from data import db_manager
 
 def main():
     # Set page configuration
@@ -10,6 +11,9 @@ def main():
         initial_sidebar_state="expanded"
     )
     
+    # Load all brand logos once so pages render them from memory
+    db_manager.prefetch_logos()
+    
     # Render the sidebar with navigation
     render_sidebar()
     
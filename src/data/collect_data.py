@@ -2,18 +2,32 @@
 Data collection script.
 
 This script collects, processes, and validates car data from various sources.
+Each collector runs its collect, process, validate and save chain in its own
+worker, so sources hitting different hosts are crawled at the same time.
 """
 
-import json
 import logging
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Type
 
+import pandas as pd
+
+from data.collectors.base_collector import BaseCollector
 from data.collectors.cars_com_collector import CarsComCollector
 from data.collectors.webmotors_collector import WebmotorsCollector
 from data.processors.car_processor import CarProcessor
+from data.processors.deduplicator import ListingDeduplicator
+from data.processors.parallel import ParallelFrameExecutor, frame_to_records
+from data.processors.title_parser import TitleParser
+from data.jsonl_archive import JsonLinesWriter
+from data.listing_sink import ListingSink
+from data.listing_store import ListingStore
+from data.records import ListingBatch
 from data.validators.car_validator import CarValidator
+from src.services.metrics import write_metrics
 
 # Configure logging
 logging.basicConfig(
@@ -22,107 +36,313 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# A collector class and the configuration it is created with
+CollectorSpec = Tuple[Type[BaseCollector], Dict[str, Any]]
 
-def collect_data(
-    output_dir: str = "data/raw",
-    config: Optional[Dict[str, Any]] = None,
-) -> List[Dict[str, Any]]:
+
+def get_collector_specs(output_dir: str) -> List[CollectorSpec]:
     """
-    Collect, process, and validate car data.
+    Get the collectors run by default.
     
     Args:
         output_dir: Directory to save the collected data
-        config: Configuration dictionary
-        
+    
     Returns:
-        List of processed and validated car dictionaries
+        List of collector classes and their configurations
     """
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
+    data_dir = os.path.dirname(os.path.abspath(output_dir))
     
-    # Initialize collectors
-    collectors = [
-        CarsComCollector(
-            config={
+    # Cache responses on disk so re-runs with the same filters are mostly local reads
+    cache_config = {
+        "cache_dir": os.path.join(data_dir, "cache", "http"),
+        "ttl": 3600,
+    }
+    
+    return [
+        (
+            CarsComCollector,
+            {
                 "max_pages": 3,
                 "delay": 1.0,
-            }
+                "max_workers": 3,
+                "cache": cache_config,
+            },
         ),
-        WebmotorsCollector(
-            config={
+        (
+            WebmotorsCollector,
+            {
                 "max_pages": 3,
                 "filters": {
                     "brand": "Toyota",
                     "model": "Corolla",
                     "year": 2020,
                 },
-            }
+                # Fetch vehicle details concurrently
+                "max_workers": 4,
+                "cache": cache_config,
+                # Only fetch details of new or changed vehicles, resuming interrupted runs
+                "state_file": os.path.join(data_dir, "state", "webmotors.json"),
+                # Download listing images once into a shared content-addressed store
+                "image_store": {"root": os.path.join(data_dir, "images")},
+            },
         ),
         # Add more collectors here
     ]
+
+
+def run_collector(
+    collector_class: Type[BaseCollector],
+    collector_config: Dict[str, Any],
+    output_dir: str,
+    process_workers: Optional[int] = None,
+    archive_raw: bool = False,
+    pack_results: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run the collect, process, validate and save chain of a single collector.
     
-    # Initialize processor and validator
-    processor = CarProcessor()
-    validator = CarValidator()
+    The collector is created inside the worker so the job can run in a thread or
+    in a separate process. Errors are caught and reported in the result.
     
-    # Collect data from all sources
-    all_data = []
+    By default each page is processed and validated as soon as it is collected,
+    and its valid listings are appended to the ``listings`` dataset of the output
+    directory. With ``process_workers``, the whole crawl is collected first and
+    then processed and validated in chunks on that many processes, which is
+    faster for large backfills.
     
-    for collector in collectors:
+    Args:
+        collector_class: Class of the collector to run
+        collector_config: Configuration of the collector
+        output_dir: Directory to save the collected data
+        process_workers: Number of processes for the process and validate stages
+        archive_raw: Whether to also stream the raw listings to compressed JSON
+            Lines files under the ``raw`` directory of the output directory
+        pack_results: Whether to hand the valid listings back as a ListingBatch,
+            which is much cheaper to pickle when the result crosses a process
+            boundary than a list of dictionaries
+    
+    Returns:
+        Dictionary with the collector name, valid data (a list of dictionaries or
+        a ListingBatch), counts, timings, request metrics and error
+    """
+    started_at = time.perf_counter()
+    timings = {"collect": 0.0, "process": 0.0, "validate": 0.0, "save": 0.0}
+    result = {
+        "name": collector_class.__name__,
+        "valid_data": ListingBatch.from_records([]) if pack_results else [],
+        "counts": {"collected": 0, "processed": 0, "valid": 0, "invalid": 0},
+        "timings": timings,
+        "metrics": None,
+        "error": None,
+    }
+    
+    try:
+        collector = collector_class(config=collector_config)
+        result["name"] = collector.name
         logger.info(f"Collecting data from {collector.name}")
         
+        # Initialize processor and validator
+        processor = CarProcessor(title_parser=TitleParser.from_db_manager())
+        validator = CarValidator()
+        
+        # Append valid listings to a columnar dataset partitioned by source and date
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        sink = ListingSink(os.path.join(output_dir, "listings"), run_id=f"{timestamp}_{collector.name}")
+        
+        # Archive raw listings page by page instead of keeping them for a single dump
+        archive = None
+        if archive_raw:
+            archive = JsonLinesWriter(os.path.join(output_dir, "raw", f"{collector.name}_{timestamp}"))
+        
+        data = []
+        collected_count = 0
+        processed_count = 0
+        valid_data = []
+        invalid_count = 0
+        
         try:
-            # Collect data
-            data = collector.collect()
-            logger.info(f"Collected {len(data)} items from {collector.name}")
+            # Process and validate each page as soon as it has been collected
+            pages = collector.iter_pages()
+            while True:
+                step_start = time.perf_counter()
+                page = next(pages, None)
+                timings["collect"] += time.perf_counter() - step_start
+                if page is None:
+                    break
+                
+                collected_count += len(page)
+                if archive is not None:
+                    step_start = time.perf_counter()
+                    archive.write(page)
+                    timings["save"] += time.perf_counter() - step_start
+                if process_workers:
+                    data.extend(page)
+                    continue
+                
+                step_start = time.perf_counter()
+                processed_page = processor.process(page)
+                processed_count += len(processed_page)
+                timings["process"] += time.perf_counter() - step_start
+                
+                step_start = time.perf_counter()
+                valid_page, invalid_page = validator.validate(processed_page)
+                valid_data.extend(valid_page)
+                invalid_count += len(invalid_page)
+                timings["validate"] += time.perf_counter() - step_start
+                
+                step_start = time.perf_counter()
+                sink.write(valid_page)
+                timings["save"] += time.perf_counter() - step_start
             
-            # Process data
-            processed_data = processor.process(data)
-            logger.info(f"Processed {len(processed_data)} items from {collector.name}")
-            
-            # Validate data
-            valid_data, invalid_data = validator.validate(processed_data)
-            logger.info(f"Validated {len(processed_data)} items: {len(valid_data)} valid, {len(invalid_data)} invalid")
+            if process_workers and data:
+                # Both stages run in the workers, so their time is reported as processing
+                step_start = time.perf_counter()
+                executor = ParallelFrameExecutor(processor, validator, max_workers=process_workers)
+                valid_frame, invalid_frame, _ = executor.run(pd.DataFrame(data))
+                valid_data = frame_to_records(valid_frame)
+                processed_count = len(valid_frame) + len(invalid_frame)
+                invalid_count = len(invalid_frame)
+                timings["process"] += time.perf_counter() - step_start
+                
+                step_start = time.perf_counter()
+                sink.write(valid_data)
+                timings["save"] += time.perf_counter() - step_start
+        finally:
+            sink.close()
+            if archive is not None:
+                archive.close()
+        
+        logger.info(f"Collected {collected_count} items from {collector.name}")
+        logger.info(f"Processed {processed_count} items from {collector.name}")
+        logger.info(f"Validated {processed_count} items: {len(valid_data)} valid, {invalid_count} invalid")
+        
+        # Only pack the valid listings into columns when they are pickled
+        result["valid_data"] = ListingBatch.from_records(valid_data) if pack_results else valid_data
+        result["counts"] = {
+            "collected": collected_count,
+            "processed": processed_count,
+            "valid": len(valid_data),
+            "invalid": invalid_count,
+        }
+        
+        result["metrics"] = collector.get_metrics()
+    
+    except Exception as e:
+        logger.error(f"Error collecting data from {result['name']}: {e}")
+        result["error"] = str(e)
+    
+    timings["total"] = time.perf_counter() - started_at
+    return result
+
+
+def collect_data(
+    output_dir: str = "data/raw",
+    config: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Collect, process, and validate car data.
+    
+    Supported configuration keys:
+        collectors: List of (collector class, config) pairs to run instead of the defaults
+        executor: "thread" (default) or "process" worker pool for the collectors
+        max_workers: Maximum number of collectors running at once (default: all)
+        process_workers: Number of processes for the process and validate stages
+            of each collector (default: process pages in the collector worker)
+        deduplicate: Whether to keep a single listing per cluster of near-duplicates
+            across collectors (default: True)
+        archive_raw: Whether to also stream the raw listings of each collector to
+            compressed JSON Lines files (default: False; see ``JsonLinesWriter``)
+        store_path: SQLite listing store the final listings are upserted into, or
+            None to skip it (default: ``listings.db`` next to the output directory)
+    
+    Valid listings are written per page to the ``listings`` dataset of the output
+    directory and the final listings of all collectors to the ``all_listings``
+    dataset, both partitioned by source and collection date (see ``ListingSink``).
+    
+    Args:
+        output_dir: Directory to save the collected data
+        config: Configuration dictionary
+    
+    Returns:
+        List of processed and validated car dictionaries
+    """
+    config = config or {}
+    
+    # Create output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Initialize collectors
+    collector_specs = config.get("collectors")
+    if collector_specs is None:
+        collector_specs = get_collector_specs(output_dir)
+    
+    executor_type = config.get("executor", "thread")
+    if executor_type not in ["thread", "process"]:
+        raise ValueError(f"Unknown executor type: {executor_type}")
+    
+    executor_class = ProcessPoolExecutor if executor_type == "process" else ThreadPoolExecutor
+    max_workers = config.get("max_workers") or max(1, len(collector_specs))
+    process_workers = config.get("process_workers")
+    archive_raw = config.get("archive_raw", False)
+    
+    # Collect data from all sources
+    all_data = []
+    metrics = {}
+    started_at = time.perf_counter()
+    
+    with executor_class(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                run_collector,
+                collector_class,
+                collector_config,
+                output_dir,
+                process_workers,
+                archive_raw,
+                executor_type == "process",
+            )
+            for collector_class, collector_config in collector_specs
+        ]
+        
+        # Gather results in collector order so the output is deterministic
+        for (collector_class, _), future in zip(collector_specs, futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Worker for {collector_class.__name__} failed: {e}")
+                continue
             
             # Add valid data to the collection
-            all_data.extend(valid_data)
-            
-            # Save raw data
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            raw_filename = os.path.join(output_dir, f"{collector.name}_{timestamp}_raw.json")
-            
-            with open(raw_filename, "w") as f:
-                json.dump(data, f, indent=2)
-            
-            logger.info(f"Saved raw data to {raw_filename}")
+            valid_data = result["valid_data"]
+            all_data.extend(valid_data.to_records() if isinstance(valid_data, ListingBatch) else valid_data)
+            if result.get("metrics"):
+                metrics[result["name"]] = result["metrics"]
             
-            # Save processed data
-            processed_filename = os.path.join(output_dir, f"{collector.name}_{timestamp}_processed.json")
-            
-            with open(processed_filename, "w") as f:
-                json.dump(processed_data, f, indent=2)
-            
-            logger.info(f"Saved processed data to {processed_filename}")
-            
-            # Save valid data
-            valid_filename = os.path.join(output_dir, f"{collector.name}_{timestamp}_valid.json")
-            
-            with open(valid_filename, "w") as f:
-                json.dump(valid_data, f, indent=2)
-            
-            logger.info(f"Saved valid data to {valid_filename}")
-            
-        except Exception as e:
-            logger.error(f"Error collecting data from {collector.name}: {e}")
+            timings = ", ".join(f"{step} {seconds:.2f}s" for step, seconds in result["timings"].items())
+            status = f"failed ({result['error']})" if result["error"] else f"{result['counts']['valid']} valid"
+            logger.info(f"{result['name']}: {status}; {timings}")
+    
+    logger.info(f"Ran {len(collector_specs)} collectors in {time.perf_counter() - started_at:.2f}s")
+    
+    # Drop the same car listed by several sources in this run
+    if config.get("deduplicate", True):
+        all_data = ListingDeduplicator().deduplicate(all_data)
     
     # Save all collected data
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    all_data_filename = os.path.join(output_dir, f"all_data_{timestamp}.json")
     
-    with open(all_data_filename, "w") as f:
-        json.dump(all_data, f, indent=2)
+    with ListingSink(os.path.join(output_dir, "all_listings"), run_id=timestamp) as sink:
+        sink.write(all_data)
+    
+    # Accumulate listings across runs for the dashboard queries
+    store_path = config.get("store_path", os.path.join(os.path.dirname(os.path.abspath(output_dir)), "listings.db"))
+    if store_path:
+        with ListingStore(store_path) as store:
+            store.upsert(all_data)
     
-    logger.info(f"Saved all data to {all_data_filename}")
+    # Save per-endpoint request metrics of the API clients
+    if metrics:
+        write_metrics(metrics, output_dir, f"metrics_{timestamp}")
     
     return all_data
 
@@ -132,4 +352,4 @@ if __name__ == "__main__":
     data = collect_data()
     
     # Print summary
-    logger.info(f"Collected a total of {len(data)} valid car listings") 
\ No newline at end of file
+    logger.info(f"Collected a total of {len(data)} valid car listings")
@@ -5,7 +5,7 @@ This module defines the base interface for all data collectors.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 
 class BaseCollector(ABC):
@@ -13,6 +13,8 @@ class BaseCollector(ABC):
     Base class for all data collectors.
     
     This abstract class defines the interface that all data collectors must implement.
+    Collectors stream their results page by page through ``iter_pages`` so callers
+    can start processing before the whole source has been downloaded.
     """
     
     def __init__(self, name: str, config: Optional[Dict[str, Any]] = None):
@@ -27,6 +29,25 @@ class BaseCollector(ABC):
         self.config = config or {}
     
     @abstractmethod
+    def iter_pages(self) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Collect data from the source one page at a time.
+        
+        Yields:
+            A list of dictionaries containing the data of each collected page
+        """
+        pass
+    
+    def iter_listings(self) -> Iterator[Dict[str, Any]]:
+        """
+        Collect data from the source one listing at a time.
+        
+        Yields:
+            A dictionary for each collected listing
+        """
+        for page in self.iter_pages():
+            yield from page
+    
     def collect(self) -> List[Dict[str, Any]]:
         """
         Collect data from the source.
@@ -34,7 +55,16 @@ class BaseCollector(ABC):
         Returns:
             A list of dictionaries containing the collected data
         """
-        pass
+        return list(self.iter_listings())
+    
+    def get_metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        Get request metrics recorded while collecting.
+        
+        Returns:
+            A metrics snapshot, or None if the collector does not record metrics
+        """
+        return None
     
     @abstractmethod
     def validate_config(self) -> bool:
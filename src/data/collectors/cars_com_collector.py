@@ -5,23 +5,39 @@ This module implements a collector for the cars.com website.
 """
 
 import logging
-import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
+from requests.adapters import HTTPAdapter
 
+from src.services.http_cache import HTTPCache
 from .base_collector import BaseCollector
+from .rate_limiter import TokenBucket
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Supported HTML parser backends
+PARSERS = ["html.parser", "lxml", "cards"]
+
+# Restricts parsing to the listing cards, skipping the rest of the page
+CARD_STRAINER = SoupStrainer(class_=lambda value: bool(value) and "vehicle-card" in value.split())
+
 
 class CarsComCollector(BaseCollector):
     """
     Collector for cars.com website.
     
-    This collector scrapes car listings from cars.com.
+    This collector scrapes car listings from cars.com. Pages can be fetched by
+    several worker threads sharing a token bucket, so ``delay`` (or ``rate``)
+    acts as a request rate rather than a pause before every page.
+    
+    The ``parser`` option selects how result pages are parsed: ``html.parser``
+    (default), ``lxml`` for the faster C parser, or ``cards`` to build a tree of
+    the listing cards only, using lxml when it is installed.
     """
     
     def __init__(
@@ -45,6 +61,16 @@ class CarsComCollector(BaseCollector):
         self.search_path = search_path
         self.session = requests.Session()
         
+        # Keep one pooled connection per worker thread
+        pool_size = max(10, self.config.get("max_workers", 1))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # Optional on-disk cache for results pages
+        cache_config = self.config.get("cache")
+        self.cache = HTTPCache(**cache_config) if cache_config else None
+        
         # Set default headers to mimic a browser
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -75,54 +101,153 @@ class CarsComCollector(BaseCollector):
             logger.error("delay must be a non-negative number")
             return False
         
+        rate = self.config.get("rate", 1.0)
+        if not isinstance(rate, (int, float)) or rate <= 0:
+            logger.error("rate must be a positive number")
+            return False
+        
+        if self.config.get("parser", "html.parser") not in PARSERS:
+            logger.error(f"parser must be one of {PARSERS}")
+            return False
+        
+        for param in ["max_workers", "burst"]:
+            value = self.config.get(param, 1)
+            if not isinstance(value, int) or value < 1:
+                logger.error(f"{param} must be a positive integer")
+                return False
+        
         return True
     
-    def collect(self) -> List[Dict[str, Any]]:
+    def _create_rate_limiter(self) -> TokenBucket:
         """
-        Collect car listings from cars.com.
+        Create the token bucket shared by the page workers.
+        
+        The rate comes from the ``rate`` option (requests per second) or, if it is
+        not set, from ``delay`` as one request per ``delay`` seconds.
         
         Returns:
-            A list of dictionaries containing car listings
+            The token bucket limiting page requests
+        """
+        rate = self.config.get("rate")
+        if rate is None:
+            delay = self.config.get("delay", 1.0)
+            rate = 1.0 / delay if delay > 0 else 0.0
+        
+        return TokenBucket(rate, self.config.get("burst", 1))
+    
+    def iter_pages(self) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Collect car listings from cars.com one results page at a time.
+        
+        Yields:
+            A list of dictionaries containing the car listings of each page
         """
         if not self.validate_config():
             logger.error("Invalid configuration")
-            return []
+            return
         
-        all_listings = []
+        total_listings = 0
         max_pages = self.config.get("max_pages", 1)
-        delay = self.config.get("delay", 1.0)
+        max_workers = self.config.get("max_workers", 1)
+        rate_limiter = self._create_rate_limiter()
+        pages = range(1, max_pages + 1)
         
-        for page in range(1, max_pages + 1):
-            logger.info(f"Collecting page {page} of {max_pages}")
-            
-            # Construct the URL for the current page
-            url = f"{self.base_url}{self.search_path}?page={page}"
+        def fetch_page(page: int) -> Optional[List[Dict[str, Any]]]:
+            return self._fetch_page(page, max_pages, rate_limiter)
+        
+        # Several pages are in flight at once, but results are yielded in page order
+        executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+        futures = [executor.submit(fetch_page, page) for page in pages] if executor else []
+        
+        try:
+            results = (future.result() for future in futures) if executor else map(fetch_page, pages)
             
-            try:
-                # Add a delay to avoid overloading the server
-                time.sleep(delay)
+            for listings in results:
+                if listings is None:
+                    continue
                 
-                # Make the request
+                total_listings += len(listings)
+                yield listings
+        finally:
+            if executor:
+                # Drop pages not started yet if the consumer stops early
+                for future in futures:
+                    future.cancel()
+                executor.shutdown(wait=True)
+        
+        logger.info(f"Collected a total of {total_listings} listings")
+    
+    def _fetch_page(
+        self,
+        page: int,
+        max_pages: int,
+        rate_limiter: TokenBucket,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch and parse a single results page.
+        
+        Args:
+            page: The page number
+            max_pages: The total number of pages being collected
+            rate_limiter: Token bucket shared by all page workers
+            
+        Returns:
+            A list of dictionaries containing the page listings, or None if it failed
+        """
+        logger.info(f"Collecting page {page} of {max_pages}")
+        
+        # Construct the URL for the current page
+        url = f"{self.base_url}{self.search_path}?page={page}"
+        
+        try:
+            # Wait for the rate limiter only when the request reaches the server,
+            # so pages served from the cache are not throttled
+            if self.cache:
+                response = self.cache.request(self.session, "GET", url, before_request=rate_limiter.acquire)
+            else:
+                rate_limiter.acquire()
                 response = self.session.get(url)
-                response.raise_for_status()
-                
-                # Parse the HTML
-                soup = BeautifulSoup(response.text, "html.parser")
-                
-                # Extract car listings
-                listings = self._extract_listings(soup)
-                all_listings.extend(listings)
-                
-                logger.info(f"Collected {len(listings)} listings from page {page}")
-                
-            except requests.RequestException as e:
-                logger.error(f"Error collecting page {page}: {e}")
+            response.raise_for_status()
             
-            except Exception as e:
-                logger.error(f"Unexpected error collecting page {page}: {e}")
+            # Parse the HTML
+            soup = self._parse_html(response.text)
+            
+            # Extract car listings
+            listings = self._extract_listings(soup)
+            
+            logger.info(f"Collected {len(listings)} listings from page {page}")
+            return listings
+            
+        except requests.RequestException as e:
+            logger.error(f"Error collecting page {page}: {e}")
+        
+        except Exception as e:
+            logger.error(f"Unexpected error collecting page {page}: {e}")
+        
+        return None
+    
+    def _parse_html(self, html: str) -> BeautifulSoup:
+        """
+        Parse a results page with the configured parser backend.
+        
+        Args:
+            html: The HTML of the results page
+            
+        Returns:
+            BeautifulSoup object containing the parsed HTML
+        """
+        parser = self.config.get("parser", "html.parser")
+        lxml_available = builder_registry.lookup("lxml") is not None
+        
+        if parser == "cards":
+            builder = "lxml" if lxml_available else "html.parser"
+            return BeautifulSoup(html, builder, parse_only=CARD_STRAINER)
+        
+        if parser == "lxml" and not lxml_available:
+            logger.warning("lxml is not installed, falling back to html.parser")
+            parser = "html.parser"
         
-        logger.info(f"Collected a total of {len(all_listings)} listings")
-        return all_listings
+        return BeautifulSoup(html, parser)
     
     def _extract_listings(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
         """
@@ -145,10 +270,10 @@ class CarsComCollector(BaseCollector):
         for element in listing_elements:
             try:
                 # Extract listing data
-                title_element = element.select_one(".title")
-                price_element = element.select_one(".price")
-                year_element = element.select_one(".year")
-                mileage_element = element.select_one(".mileage")
+                title_element = element.find(class_="title")
+                price_element = element.find(class_="price")
+                year_element = element.find(class_="year")
+                mileage_element = element.find(class_="mileage")
                 
                 # Create listing dictionary
                 listing = {
@@ -213,7 +338,7 @@ class CarsComCollector(BaseCollector):
         Returns:
             The extracted URL
         """
-        link_element = element.select_one("a")
+        link_element = element.find("a")
         
         if link_element and "href" in link_element.attrs:
             href = link_element["href"]
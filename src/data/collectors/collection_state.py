@@ -0,0 +1,157 @@
+"""
+Collection state module for incremental data collection.
+
+This module persists what a collector has already seen so later runs only
+fetch new or changed vehicles and can resume an interrupted crawl.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from src.services.file_utils import atomic_write
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Catalog fields whose changes make a known vehicle worth fetching again
+FINGERPRINT_FIELDS = ("price", "mileage")
+
+
+class CollectionState:
+    """
+    Persisted state of a collector.
+    
+    The state records a content fingerprint for every known vehicle and, for each
+    filter set being crawled, the last page that was completely handled. It is
+    saved to a JSON file after every page so a crash loses at most one page.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the collection state.
+        
+        Args:
+            path: JSON file where the state is persisted
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.vehicles: Dict[str, str] = {}
+        self.cursors: Dict[str, int] = {}
+        self._load()
+    
+    @staticmethod
+    def fingerprint(vehicle: Dict[str, Any], fields: Iterable[str] = FINGERPRINT_FIELDS) -> str:
+        """
+        Compute the content fingerprint of a vehicle.
+        
+        Args:
+            vehicle: Vehicle data from catalog
+            fields: Fields included in the fingerprint
+        
+        Returns:
+            Hex digest of the fingerprinted fields
+        """
+        values = json.dumps([vehicle.get(field) for field in fields], default=str)
+        return hashlib.sha1(values.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def filters_key(filters: Dict[str, Any]) -> str:
+        """
+        Build the key identifying a filter set.
+        
+        Args:
+            filters: Query filters of the crawl
+        
+        Returns:
+            Canonical JSON representation of the filters
+        """
+        return json.dumps(filters, sort_keys=True, default=str)
+    
+    def is_changed(self, vehicle_id: str, fingerprint: str) -> bool:
+        """
+        Check whether a vehicle is new or changed since it was last collected.
+        
+        Args:
+            vehicle_id: ID of the vehicle
+            fingerprint: Current fingerprint of the vehicle
+        
+        Returns:
+            True if the vehicle needs to be fetched, False otherwise
+        """
+        with self._lock:
+            return self.vehicles.get(str(vehicle_id)) != fingerprint
+    
+    def resume_page(self, filters: Dict[str, Any]) -> int:
+        """
+        Get the page a crawl of the given filters should start from.
+        
+        Args:
+            filters: Query filters of the crawl
+        
+        Returns:
+            The page after the last completed one, or 1 for a fresh crawl
+        """
+        with self._lock:
+            return self.cursors.get(self.filters_key(filters), 0) + 1
+    
+    def complete_page(
+        self,
+        filters: Dict[str, Any],
+        page: Optional[int],
+        fingerprints: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Record a completely handled page and save the state.
+        
+        Args:
+            filters: Query filters of the crawl
+            page: The last page of the contiguous run of completed pages, or None
+                to only record the fingerprints when an earlier page failed
+            fingerprints: Fingerprints of the vehicles collected from the page
+        """
+        with self._lock:
+            if page is not None:
+                self.cursors[self.filters_key(filters)] = page
+            for vehicle_id, fingerprint in (fingerprints or {}).items():
+                self.vehicles[str(vehicle_id)] = fingerprint
+            self._save()
+    
+    def finish(self, filters: Dict[str, Any]) -> None:
+        """
+        Mark the crawl of the given filters as finished and save the state.
+        
+        Args:
+            filters: Query filters of the crawl
+        """
+        with self._lock:
+            self.cursors.pop(self.filters_key(filters), None)
+            self._save()
+    
+    def _load(self) -> None:
+        """Load the state from its file, starting empty if it does not exist."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable collection state {self.path}: {e}")
+            return
+        
+        self.vehicles = data.get("vehicles", {})
+        self.cursors = data.get("cursors", {})
+    
+    def _save(self) -> None:
+        """Atomically write the state to its file."""
+        data = {
+            "vehicles": self.vehicles,
+            "cursors": self.cursors,
+        }
+        
+        try:
+            atomic_write(self.path, json.dumps(data).encode("utf-8"))
+        except OSError as e:
+            logger.error(f"Failed to save collection state {self.path}: {e}")
@@ -0,0 +1,222 @@
+"""
+Search-space partitioning module for parallel crawls.
+
+This module splits a broad catalog query into disjoint filter shards, e.g. one
+per brand, year and state, crawls the shards concurrently and deduplicates
+vehicles that show up in more than one shard.
+"""
+
+import itertools
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Filter dimensions that can be partitioned and the DBManager getter of their values
+PARTITION_DIMENSIONS = {
+    "brand": "get_brands",
+    "year": "get_years",
+    "state": "get_state_abbreviations",
+}
+
+
+class SearchPartitioner:
+    """
+    Split a catalog query into disjoint filter shards.
+    
+    Every dimension that is not already fixed by the query filters is expanded
+    into one shard per reference value, so the shards together cover the query
+    and never overlap on those dimensions.
+    """
+    
+    def __init__(self, values: Dict[str, List[Any]]):
+        """
+        Initialize the partitioner.
+        
+        Args:
+            values: Reference values of each partitioned dimension
+        """
+        self.values = values
+    
+    @classmethod
+    def from_db_manager(
+        cls,
+        dimensions: Iterable[str] = tuple(PARTITION_DIMENSIONS),
+        db_manager: Optional[Any] = None,
+        values: Optional[Dict[str, List[Any]]] = None,
+    ) -> "SearchPartitioner":
+        """
+        Create a partitioner from the DBManager reference tables.
+        
+        Args:
+            dimensions: Dimensions to partition, in shard order
+            db_manager: DBManager providing the reference values; defaults to the shared instance
+            values: Explicit values overriding the reference tables per dimension
+        
+        Returns:
+            The partitioner
+        """
+        values = values or {}
+        if db_manager is None and any(dimension not in values for dimension in dimensions):
+            from src.data.db_manager import db_manager
+        
+        return cls({
+            dimension: list(values[dimension]) if dimension in values
+            else getattr(db_manager, PARTITION_DIMENSIONS[dimension])()
+            for dimension in dimensions
+        })
+    
+    def partition(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Split query filters into shards.
+        
+        Args:
+            filters: Query filters of the whole crawl
+        
+        Returns:
+            A list of filter sets, one per shard
+        """
+        dimensions = [
+            dimension for dimension, values in self.values.items()
+            if dimension not in filters and values
+        ]
+        
+        shards = [
+            {**filters, **dict(zip(dimensions, combination))}
+            for combination in itertools.product(*(self.values[dimension] for dimension in dimensions))
+        ]
+        
+        logger.info(f"Partitioned query into {len(shards)} shards by {', '.join(dimensions) or 'nothing'}")
+        return shards
+
+
+class VehicleDeduplicator:
+    """
+    Thread-safe registry of the vehicles already claimed by a crawl.
+    
+    Shards claim each vehicle before fetching its details, so a vehicle listed
+    in several shards is only fetched and emitted once. Claims of vehicles whose
+    details could not be fetched are released, so another shard can retry them.
+    """
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._seen = set()
+        self.duplicates = 0
+    
+    def claim(self, vehicle_id: Any) -> bool:
+        """
+        Claim a vehicle.
+        
+        Args:
+            vehicle_id: ID of the vehicle
+        
+        Returns:
+            True if the vehicle was not claimed before, False otherwise
+        """
+        with self._lock:
+            key = str(vehicle_id)
+            if key in self._seen:
+                self.duplicates += 1
+                return False
+            
+            self._seen.add(key)
+            return True
+    
+    def release(self, vehicle_id: Any) -> None:
+        """
+        Release the claim of a vehicle that could not be collected.
+        
+        Args:
+            vehicle_id: ID of the vehicle
+        """
+        with self._lock:
+            self._seen.discard(str(vehicle_id))
+    
+    def __len__(self) -> int:
+        """Return the number of claimed vehicles."""
+        return len(self._seen)
+
+
+def crawl_shards(
+    shards: List[Dict[str, Any]],
+    crawl: Callable[[Dict[str, Any]], Iterator[List[Dict[str, Any]]]],
+    max_workers: int = 4,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Crawl shards concurrently and merge their pages as they arrive.
+    
+    Workers hand pages over through a bounded queue, so a slow consumer applies
+    backpressure instead of buffering the whole crawl in memory. A worker only
+    resumes the crawl of its shard once the consumer has finished with its page,
+    i.e. asks for the next one, so crawls that checkpoint after yielding a page
+    never record pages the consumer has not handled. Closing the returned
+    generator stops the workers after their current page.
+    
+    Args:
+        shards: Filter sets to crawl
+        crawl: Function crawling one shard and yielding its pages
+        max_workers: Maximum number of shards crawled at once
+    
+    Yields:
+        The pages of all shards, in completion order
+    """
+    if not shards:
+        return
+    
+    pages = queue.Queue(maxsize=max_workers * 2)
+    stop = threading.Event()
+    done = object()
+    
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def hand_over(page: List[Dict[str, Any]]) -> bool:
+        handled = threading.Event()
+        if not put((page, handled)):
+            return False
+        while not handled.wait(timeout=0.1):
+            if stop.is_set():
+                return False
+        return True
+    
+    def worker(shard: Dict[str, Any]) -> None:
+        try:
+            for page in crawl(shard):
+                if not hand_over(page):
+                    return
+        except Exception as e:
+            logger.error(f"Error crawling shard {shard}: {e}")
+        finally:
+            put(done)
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = [executor.submit(worker, shard) for shard in shards]
+    
+    try:
+        remaining = len(shards)
+        while remaining:
+            item = pages.get()
+            if item is done:
+                remaining -= 1
+            else:
+                page, handled = item
+                yield page
+                handled.set()
+    finally:
+        stop.set()
+        # Shards not started yet are dropped; running ones see the stop event
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
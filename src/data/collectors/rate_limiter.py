@@ -0,0 +1,59 @@
+"""
+Rate limiter module for data collection.
+
+This module implements a thread-safe token bucket used by collectors to keep
+concurrent requests within a politeness budget.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    
+    Tokens are added at ``rate`` per second up to ``burst`` tokens. Each request
+    takes one token, blocking until one is available, so any number of worker
+    threads sharing the bucket never exceed the configured rate on average.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize the token bucket.
+        
+        Args:
+            rate: Tokens added per second; a non-positive rate disables limiting
+            burst: Maximum number of tokens that can accumulate
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """
+        Take a token, waiting until one is available.
+        
+        Returns:
+            The number of seconds spent waiting
+        """
+        if self.rate <= 0:
+            return 0.0
+        
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                
+                wait = (1 - self._tokens) / self.rate
+            
+            time.sleep(wait)
+            waited += wait
@@ -6,10 +6,15 @@ This module implements a collector for the Webmotors API.
 
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
 
+from src.services.http_cache import HTTPCache
 from src.services.webmotors.client import WebmotorsClient
+from ..image_store import ImageStore
 from .base_collector import BaseCollector
+from .collection_state import CollectionState
+from .partitioner import PARTITION_DIMENSIONS, SearchPartitioner, VehicleDeduplicator, crawl_shards
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -19,7 +24,13 @@ class WebmotorsCollector(BaseCollector):
     """
     Collector for Webmotors API.
     
-    This collector retrieves car listings from the Webmotors API.
+    This collector retrieves car listings from the Webmotors API. When a
+    ``state_file`` is configured, collection is incremental: only new or changed
+    vehicles are fetched and an interrupted crawl resumes after its last page.
+    When ``partition`` is configured, the query is split into disjoint filter
+    shards (e.g. brand x year x state) that are crawled in parallel. When
+    ``image_store`` is configured, listing images are downloaded to a local
+    content-addressed store and their paths added to the listings.
     """
     
     def __init__(
@@ -35,7 +46,13 @@ class WebmotorsCollector(BaseCollector):
             config: Optional configuration dictionary
         """
         super().__init__(name, config)
-        self.client = WebmotorsClient()
+        cache_config = self.config.get("cache")
+        self.client = WebmotorsClient(
+            pool_size=self.config.get("pool_size"),
+            cache=HTTPCache(**cache_config) if cache_config else None,
+        )
+        image_store_config = self.config.get("image_store")
+        self.image_store = ImageStore(**image_store_config) if image_store_config else None
     
     def validate_config(self) -> bool:
         """
@@ -60,82 +77,284 @@ class WebmotorsCollector(BaseCollector):
             logger.error("filters must be a dictionary")
             return False
         
+        max_workers = self.config.get("max_workers", 1)
+        if not isinstance(max_workers, int) or max_workers < 1:
+            logger.error("max_workers must be a positive integer")
+            return False
+        
+        partition = self.config.get("partition")
+        if partition is not None:
+            if not isinstance(partition, dict):
+                logger.error("partition must be a dictionary")
+                return False
+            
+            dimensions = partition.get("dimensions", list(PARTITION_DIMENSIONS))
+            unknown = [dimension for dimension in dimensions if dimension not in PARTITION_DIMENSIONS]
+            if unknown:
+                logger.error(f"Unsupported partition dimensions: {unknown}")
+                return False
+            
+            shard_workers = partition.get("max_workers", 4)
+            if not isinstance(shard_workers, int) or shard_workers < 1:
+                logger.error("partition max_workers must be a positive integer")
+                return False
+        
         return True
     
-    def collect(self) -> List[Dict[str, Any]]:
+    def get_metrics(self) -> Optional[Dict[str, Any]]:
         """
-        Collect car listings from Webmotors API.
+        Get per-endpoint request metrics of the Webmotors client.
         
         Returns:
-            A list of dictionaries containing car listings
+            The client metrics snapshot
+        """
+        return self.client.get_metrics()
+    
+    def iter_pages(self) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Collect car listings from Webmotors API one catalog page at a time.
+        
+        Yields:
+            A list of dictionaries containing the car listings of each page
         """
         if not self.validate_config():
             logger.error("Invalid configuration")
-            return []
+            return
         
         # Get configuration from environment variables if not provided
         max_pages = self.config.get("max_pages", int(os.getenv("MAX_PAGES", "3")))
         filters = self.config.get("filters", {})
+        max_workers = self.config.get("max_workers", 1)
         
-        all_listings = []
+        total_listings = 0
         
-        # Authenticate with the API
-        if not self.client.authenticate():
+        # Authenticate with the API, reusing a cached token when possible
+        if not self.client.get_access_token():
             logger.error("Failed to authenticate with Webmotors API")
-            return []
+            return
+        
+        # Known vehicles and crawl progress persisted between runs
+        state_file = self.config.get("state_file")
+        state = CollectionState(state_file) if state_file else None
+        
+        # Detail requests of a page are fanned out over a shared thread pool
+        executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+        
+        partition = self.config.get("partition")
+        if partition is not None:
+            # Crawl disjoint filter shards in parallel, fetching each vehicle once
+            partitioner = SearchPartitioner.from_db_manager(
+                partition.get("dimensions", list(PARTITION_DIMENSIONS)),
+                values=partition.get("values"),
+            )
+            seen = VehicleDeduplicator()
+            pages = crawl_shards(
+                partitioner.partition(filters),
+                lambda shard: self._crawl(shard, max_pages, executor, state, seen),
+                partition.get("max_workers", 4),
+            )
+        else:
+            seen = None
+            pages = self._crawl(filters, max_pages, executor, state)
+        
+        try:
+            for listings in pages:
+                total_listings += len(listings)
+                yield listings
+        finally:
+            pages.close()
+            if executor:
+                executor.shutdown(wait=True)
         
-        for page in range(1, max_pages + 1):
+        if seen is not None:
+            logger.info(f"Skipped {seen.duplicates} vehicles listed in several shards")
+        logger.info(f"Collected a total of {total_listings} listings")
+    
+    def _crawl(
+        self,
+        filters: Dict[str, Any],
+        max_pages: int,
+        executor: Optional[Executor] = None,
+        state: Optional[CollectionState] = None,
+        seen: Optional[VehicleDeduplicator] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Crawl the catalog pages of one filter set.
+        
+        Args:
+            filters: Query filters for the catalog
+            max_pages: Maximum number of pages to collect
+            executor: Optional executor used to fetch details concurrently
+            state: Optional collection state used for incremental collection
+            seen: Optional registry of vehicles already claimed by other shards
+            
+        Yields:
+            A list of dictionaries containing the car listings of each page
+        """
+        start_page = state.resume_page(filters) if state else 1
+        if start_page > 1:
+            logger.info(f"Resuming collection from page {start_page}")
+        
+        # The cursor only moves over pages completed without a gap, so a resumed
+        # crawl retries any page that failed before it
+        contiguous = True
+        
+        for page in range(start_page, max_pages + 1):
             logger.info(f"Collecting page {page} of {max_pages}")
             
             # Add page to filters
             page_filters = filters.copy()
             page_filters["page"] = page
             
+            # Vehicles of the page claimed from the other shards
+            claimed = []
+            
             try:
                 # Get catalog data
                 catalog = self.client.get_catalog(params=page_filters)
                 
                 if not catalog:
                     logger.warning(f"No data returned for page {page}")
+                    contiguous = False
                     continue
                 
                 # Extract vehicles from catalog
                 vehicles = catalog.get("vehicles", [])
                 
-                # Process each vehicle
-                for vehicle in vehicles:
-                    try:
-                        # Get vehicle details
-                        vehicle_id = vehicle.get("id")
-                        if vehicle_id:
-                            vehicle_details = self.client.get_vehicle_details(vehicle_id)
-                            
-                            if vehicle_details:
-                                # Create listing dictionary
-                                listing = self._create_listing(vehicle, vehicle_details)
-                                all_listings.append(listing)
-                            else:
-                                logger.warning(f"Failed to get details for vehicle {vehicle_id}")
-                        else:
-                            logger.warning("Vehicle ID not found in catalog data")
-                            
-                    except Exception as e:
-                        logger.error(f"Error processing vehicle: {e}")
+                # Skip vehicles that have not changed since the last run
+                fingerprints = {}
+                if state:
+                    fingerprints = {
+                        str(vehicle["id"]): state.fingerprint(vehicle)
+                        for vehicle in vehicles
+                        if vehicle.get("id")
+                    }
+                    vehicles = [
+                        vehicle for vehicle in vehicles
+                        if not vehicle.get("id") or state.is_changed(vehicle["id"], fingerprints[str(vehicle["id"])])
+                    ]
+                    logger.info(f"Skipping {len(fingerprints) - len(vehicles)} unchanged vehicles on page {page}")
                 
-                logger.info(f"Collected {len(vehicles)} listings from page {page}")
+                # Skip vehicles already collected from another shard
+                if seen is not None:
+                    vehicles = [vehicle for vehicle in vehicles if not vehicle.get("id") or seen.claim(vehicle["id"])]
+                    claimed = [vehicle["id"] for vehicle in vehicles if vehicle.get("id")]
+                
+                # Fetch details for each vehicle, keeping the catalog order
+                listings = self._fetch_listings(vehicles, executor)
                 
-                # Check if we've reached the last page
-                if "pagination" in catalog and "totalPages" in catalog["pagination"]:
-                    total_pages = catalog["pagination"]["totalPages"]
-                    if page >= total_pages:
-                        logger.info(f"Reached last page ({total_pages})")
-                        break
+                # Let other shards retry the vehicles whose details failed
+                fetched = {str(listing["id"]) for listing in listings}
+                for vehicle_id in claimed:
+                    if str(vehicle_id) not in fetched:
+                        seen.release(vehicle_id)
+                
+                # Download the images of the page to the local store
+                if self.image_store:
+                    self._attach_images(listings)
+                
+                logger.info(f"Collected {len(vehicles)} listings from page {page}")
                 
             except Exception as e:
                 logger.error(f"Error collecting page {page}: {e}")
+                contiguous = False
+                for vehicle_id in claimed:
+                    seen.release(vehicle_id)
+                continue
+            
+            yield listings
+            
+            # The consumer is done with the page, so it can be checkpointed; shards
+            # are only resumed by crawl_shards once their page has been handled
+            if state:
+                state.complete_page(
+                    filters,
+                    page if contiguous else None,
+                    {str(listing["id"]): fingerprints[str(listing["id"])] for listing in listings},
+                )
+            
+            # Check if we've reached the last page
+            if "pagination" in catalog and "totalPages" in catalog["pagination"]:
+                total_pages = catalog["pagination"]["totalPages"]
+                if page >= total_pages:
+                    logger.info(f"Reached last page ({total_pages})")
+                    break
+        
+        if state:
+            state.finish(filters)
+    
+    def _fetch_listings(
+        self,
+        vehicles: List[Dict[str, Any]],
+        executor: Optional[Executor] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch details for a page of vehicles and build their listings.
+        
+        Args:
+            vehicles: Vehicle data from a catalog page
+            executor: Optional executor used to fetch details concurrently
+            
+        Returns:
+            A list of listings in the same order as the vehicles
+        """
+        if executor:
+            results = executor.map(self._fetch_listing, vehicles)
+        else:
+            results = map(self._fetch_listing, vehicles)
+        
+        return [listing for listing in results if listing is not None]
+    
+    def _attach_images(self, listings: List[Dict[str, Any]]) -> None:
+        """
+        Download the images of a page of listings and add their local paths.
         
-        logger.info(f"Collected a total of {len(all_listings)} listings")
-        return all_listings
+        Each listing gets ``image_paths`` and ``thumbnail_paths`` aligned with the
+        images that could be stored; images that failed to download are left out.
+        
+        Args:
+            listings: Listings of a catalog page
+        """
+        paths = self.image_store.prefetch(url for listing in listings for url in listing.get("images") or [])
+        
+        for listing in listings:
+            stored = [url for url in listing.get("images") or [] if url in paths]
+            listing["image_paths"] = [paths[url] for url in stored]
+            listing["thumbnail_paths"] = [
+                path for path in (self.image_store.get_thumbnail_path(url) for url in stored) if path
+            ]
+    
+    def _fetch_listing(self, vehicle: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Fetch details for a single vehicle and build its listing.
+        
+        Errors are logged and isolated so one vehicle cannot fail the whole page.
+        
+        Args:
+            vehicle: Vehicle data from catalog
+            
+        Returns:
+            A dictionary containing the listing data, or None if it failed
+        """
+        try:
+            # Get vehicle details
+            vehicle_id = vehicle.get("id")
+            if not vehicle_id:
+                logger.warning("Vehicle ID not found in catalog data")
+                return None
+            
+            vehicle_details = self.client.get_vehicle_details(vehicle_id)
+            
+            if not vehicle_details:
+                logger.warning(f"Failed to get details for vehicle {vehicle_id}")
+                return None
+            
+            # Create listing dictionary
+            return self._create_listing(vehicle, vehicle_details)
+            
+        except Exception as e:
+            logger.error(f"Error processing vehicle: {e}")
+            return None
     
     def _create_listing(self, vehicle: Dict[str, Any], details: Dict[str, Any]) -> Dict[str, Any]:
         """
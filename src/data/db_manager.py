@@ -3,6 +3,15 @@ import pandas as pd
 import requests
 from pathlib import Path
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+try:
+    from services.http_cache import HTTPCache
+except ImportError:
+    # Imported through the src package without src on the path, e.g. by benchmarks
+    from src.services.http_cache import HTTPCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -11,17 +20,40 @@ logger = logging.getLogger(__name__)
 class DBManager:
     """
     Manages database operations for static data like brands, models, years, states, and versions.
-    Also handles brand logo retrieval from a third-party repository.
+    Also handles brand logo retrieval from a third-party repository. Logos are kept
+    in memory and in an on-disk HTTP cache revalidated with ETag/Last-Modified, so
+    repeated lookups do not reach the network.
     """
     
-    def __init__(self, db_dir="db"):
+    def __init__(
+        self,
+        db_dir="db",
+        logo_cache_dir="data/cache/logos",
+        logo_ttl=7 * 24 * 3600,
+        logo_timeout=5.0,
+        logo_retry_delay=300.0,
+    ):
         """
         Initialize the DBManager with the path to the database directory.
         
         Args:
             db_dir (str): Path to the database directory containing CSV files.
+            logo_cache_dir (str): Directory of the on-disk logo cache.
+            logo_ttl (float): Seconds a cached logo is used before it is revalidated.
+            logo_timeout (float): Timeout in seconds of logo requests.
+            logo_retry_delay (float): Seconds before a logo that failed with a network
+                or server error is requested again.
         """
         self.db_dir = db_dir
+        self.logo_cache_dir = logo_cache_dir
+        self.logo_ttl = logo_ttl
+        self.logo_timeout = logo_timeout
+        self.logo_retry_delay = logo_retry_delay
+        self._logos = {}
+        self._missing_logos = {}
+        self._logo_lock = threading.Lock()
+        self._logo_cache = None
+        self._logo_session = None
         self._ensure_db_dir_exists()
         self._load_data()
     
@@ -107,6 +139,34 @@ class DBManager:
         """
         return self.states["name"].tolist() if not self.states.empty else []
     
+    def get_state_abbreviation(self, state_name):
+        """
+        Get the abbreviation of a state, as used by listings.
+        
+        Args:
+            state_name (str): Name of the state.
+            
+        Returns:
+            str: Abbreviation of the state, e.g. "SP" for "São Paulo".
+        """
+        if self.states.empty:
+            return None
+        
+        state_row = self.states[self.states["name"] == state_name]
+        if state_row.empty:
+            return None
+        
+        return state_row["abbreviation"].iloc[0]
+    
+    def get_state_abbreviations(self):
+        """
+        Get the abbreviations of all states, as used by listings and the Webmotors API.
+        
+        Returns:
+            list: List of state abbreviations.
+        """
+        return self.states["abbreviation"].tolist() if not self.states.empty else []
+    
     def get_versions_by_model(self, model_name):
         """
         Get all versions for a specific model.
@@ -146,26 +206,110 @@ class DBManager:
         """
         Get the logo for a specific brand.
         
+        Logos already loaded are served from memory; otherwise they are read from
+        the on-disk cache, which only contacts the server once its entry is stale.
+        Failed fetches are remembered, so missing logos do not trigger new requests
+        on every page render: logos the server does not have (404/410) for
+        ``logo_ttl`` seconds, and other failures, e.g. the network being down,
+        only for ``logo_retry_delay`` seconds.
+        
         Args:
             brand_name (str): Name of the brand.
             
         Returns:
             bytes: Logo image data.
         """
+        with self._logo_lock:
+            logo = self._logos.get(brand_name)
+            if logo is None and self._is_missing_logo(brand_name):
+                return None
+        if logo is not None:
+            return logo
+        
         logo_url = self.get_brand_logo_url(brand_name)
         if not logo_url:
             return None
         
+        retry_delay = self.logo_retry_delay
         try:
-            response = requests.get(logo_url)
+            cache, session = self._get_logo_cache()
+            response = cache.request(session, "GET", logo_url, timeout=self.logo_timeout)
             if response.status_code == 200:
+                with self._logo_lock:
+                    self._logos[brand_name] = response.content
                 return response.content
             else:
                 logger.error(f"Failed to retrieve logo for {brand_name}: {response.status_code}")
-                return None
+                if response.status_code in (404, 410):
+                    retry_delay = self.logo_ttl
         except Exception as e:
             logger.error(f"Error retrieving logo for {brand_name}: {e}")
-            return None
+        
+        with self._logo_lock:
+            self._missing_logos[brand_name] = time.monotonic() + retry_delay
+        return None
+    
+    def _is_missing_logo(self, brand_name):
+        """
+        Check whether a logo failed recently enough not to be requested again.
+        
+        Must be called with the logo lock held.
+        
+        Args:
+            brand_name (str): Name of the brand.
+        
+        Returns:
+            bool: True if the logo should not be requested yet.
+        """
+        retry_at = self._missing_logos.get(brand_name)
+        if retry_at is None:
+            return False
+        if time.monotonic() >= retry_at:
+            del self._missing_logos[brand_name]
+            return False
+        return True
+    
+    def prefetch_logos(self, max_workers=8):
+        """
+        Load the logos of all brands in parallel.
+        
+        Brands whose logo is already in memory or recently failed to load are
+        skipped, so calling this again, e.g. on every Streamlit rerun, makes no
+        requests until a failed logo is due to be retried.
+        
+        Args:
+            max_workers (int): Maximum number of concurrent logo requests.
+            
+        Returns:
+            int: Number of brands with a logo available.
+        """
+        brands = self.get_brands()
+        with self._logo_lock:
+            missing = [brand for brand in brands if brand not in self._logos and not self._is_missing_logo(brand)]
+        
+        if missing:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(self.get_brand_logo, missing))
+            logger.info(f"Prefetched logos of {len(missing)} brands")
+        
+        with self._logo_lock:
+            return sum(1 for brand in brands if brand in self._logos)
+    
+    def _get_logo_cache(self):
+        """
+        Get the on-disk logo cache and its HTTP session, creating them on first use.
+        
+        Returns:
+            tuple: The HTTPCache and the requests session used for logos.
+        """
+        with self._logo_lock:
+            if self._logo_cache is None:
+                self._logo_session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+                self._logo_session.mount("https://", adapter)
+                self._logo_session.mount("http://", adapter)
+                self._logo_cache = HTTPCache(cache_dir=self.logo_cache_dir, ttl=self.logo_ttl, stale_if_error=True)
+            return self._logo_cache, self._logo_session
     
     def save_data(self):
         """Save all data to CSV files."""
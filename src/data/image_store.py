@@ -0,0 +1,254 @@
+"""
+Image store module.
+
+This module downloads listing images concurrently and stores them on disk by
+content hash, so identical stock photos used by many listings are kept once.
+Thumbnails are generated once per image when Pillow is installed.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import mimetypes
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.services.file_utils import atomic_write
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# File extensions of the supported image content types
+IMAGE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/gif": ".gif",
+}
+
+
+class ImageStore:
+    """
+    Content-addressed on-disk store of listing images.
+    
+    Images are saved under ``objects/`` by the SHA-256 of their bytes and
+    thumbnails under ``thumbnails/``. An index maps every downloaded URL to its
+    content hash, so a URL is only downloaded once across runs.
+    """
+    
+    def __init__(
+        self,
+        root: str = "data/images",
+        max_workers: int = 8,
+        thumbnail_size: Tuple[int, int] = (320, 240),
+        timeout: float = 10.0,
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        Initialize the image store.
+        
+        Args:
+            root: Directory where images, thumbnails and the index are stored
+            max_workers: Maximum number of concurrent downloads
+            thumbnail_size: Maximum width and height of the thumbnails
+            timeout: Timeout in seconds of each download
+            session: Optional HTTP session used for downloads
+        """
+        self.root = root
+        self.max_workers = max_workers
+        self.thumbnail_size = tuple(thumbnail_size)
+        self.timeout = timeout
+        self.session = session or self._create_session()
+        self._lock = threading.Lock()
+        self._index_path = os.path.join(root, "index.json")
+        self._index: Dict[str, str] = self._load_index()
+        
+        if Image is None:
+            logger.warning("Pillow is not installed, thumbnails will not be generated")
+    
+    def _create_session(self) -> requests.Session:
+        """Create an HTTP session pooled for concurrent downloads."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    def get_path(self, url: str) -> Optional[str]:
+        """
+        Get the local path of an already downloaded image.
+        
+        Args:
+            url: Image URL
+        
+        Returns:
+            Path of the stored image, or None if it has not been downloaded
+        """
+        with self._lock:
+            key = self._index.get(url)
+        return self._find_object(key) if key else None
+    
+    def get_thumbnail_path(self, url: str) -> Optional[str]:
+        """
+        Get the local path of the thumbnail of an already downloaded image.
+        
+        Args:
+            url: Image URL
+        
+        Returns:
+            Path of the thumbnail, or None if it does not exist
+        """
+        with self._lock:
+            key = self._index.get(url)
+        if not key:
+            return None
+        
+        path = self._thumbnail_path(key)
+        return path if os.path.exists(path) else None
+    
+    def fetch(self, url: str) -> Optional[str]:
+        """
+        Download an image unless it is already stored.
+        
+        Args:
+            url: Image URL
+        
+        Returns:
+            Path of the stored image, or None if the download failed
+        """
+        path = self.get_path(url)
+        if path:
+            return path
+        
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning(f"Failed to download image {url}: {e}")
+            return None
+        
+        content = response.content
+        key = hashlib.sha256(content).hexdigest()
+        path = self._find_object(key)
+        
+        if path is None:
+            path = self._object_path(key, self._extension(url, response.headers.get("Content-Type")))
+            try:
+                atomic_write(path, content)
+            except OSError as e:
+                logger.error(f"Failed to store image {url}: {e}")
+                return None
+        
+        self._create_thumbnail(key, content)
+        
+        with self._lock:
+            self._index[url] = key
+        
+        return path
+    
+    def prefetch(self, urls: Iterable[str]) -> Dict[str, str]:
+        """
+        Download images concurrently and save the index.
+        
+        Args:
+            urls: Image URLs; duplicates are downloaded once
+        
+        Returns:
+            Dictionary mapping every successfully stored URL to its local path
+        """
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        if not unique_urls:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            paths = dict(zip(unique_urls, executor.map(self.fetch, unique_urls)))
+        
+        self.save_index()
+        
+        stored = {url: path for url, path in paths.items() if path}
+        logger.info(f"Stored {len(stored)} of {len(unique_urls)} images")
+        return stored
+    
+    def save_index(self) -> None:
+        """Atomically write the URL index to disk."""
+        with self._lock:
+            data = json.dumps(self._index).encode("utf-8")
+        
+        try:
+            atomic_write(self._index_path, data)
+        except OSError as e:
+            logger.error(f"Failed to save image index {self._index_path}: {e}")
+    
+    def _load_index(self) -> Dict[str, str]:
+        """Load the URL index, starting empty if it does not exist."""
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable image index {self._index_path}: {e}")
+            return {}
+    
+    def _create_thumbnail(self, key: str, content: bytes) -> None:
+        """
+        Generate the thumbnail of an image once.
+        
+        Args:
+            key: Content hash of the image
+            content: Image bytes
+        """
+        path = self._thumbnail_path(key)
+        if Image is None or os.path.exists(path):
+            return
+        
+        try:
+            with Image.open(io.BytesIO(content)) as image:
+                image.thumbnail(self.thumbnail_size)
+                buffer = io.BytesIO()
+                image.convert("RGB").save(buffer, format="JPEG", quality=85)
+            atomic_write(path, buffer.getvalue())
+        except Exception as e:
+            logger.warning(f"Failed to create thumbnail of image {key}: {e}")
+    
+    def _object_path(self, key: str, extension: str) -> str:
+        """Get the path of a stored image."""
+        return os.path.join(self.root, "objects", key[:2], f"{key}{extension}")
+    
+    def _thumbnail_path(self, key: str) -> str:
+        """Get the path of the thumbnail of an image."""
+        width, height = self.thumbnail_size
+        return os.path.join(self.root, "thumbnails", key[:2], f"{key}_{width}x{height}.jpg")
+    
+    def _find_object(self, key: str) -> Optional[str]:
+        """Find the stored image with the given content hash, whatever its extension."""
+        directory = os.path.join(self.root, "objects", key[:2])
+        try:
+            for filename in os.listdir(directory):
+                if filename.startswith(key):
+                    return os.path.join(directory, filename)
+        except FileNotFoundError:
+            pass
+        return None
+    
+    @staticmethod
+    def _extension(url: str, content_type: Optional[str]) -> str:
+        """Get the file extension of an image from its content type or URL."""
+        content_type = (content_type or "").split(";")[0].strip().lower()
+        if content_type in IMAGE_EXTENSIONS:
+            return IMAGE_EXTENSIONS[content_type]
+        
+        extension = os.path.splitext(urlparse(url).path)[1].lower()
+        return extension if mimetypes.types_map.get(extension, "").startswith("image/") else ".img"
@@ -0,0 +1,206 @@
+"""
+JSON Lines archive module.
+
+This module streams listings to compressed JSON Lines files, one listing per
+line, as pages arrive, and reads them back one listing at a time, so neither
+long crawls nor reprocessing old runs hold a whole run in memory. Files are
+rotated by size. zstd compression and the orjson serializer are used when
+the zstandard and orjson packages are installed.
+"""
+
+import glob
+import gzip
+import io
+import json
+import logging
+import os
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# File extension of each compression
+EXTENSIONS = {
+    None: ".jsonl",
+    "gzip": ".jsonl.gz",
+    "zstd": ".jsonl.zst",
+}
+
+
+def default_compression() -> str:
+    """Return zstd if the zstandard package is installed, gzip otherwise."""
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def _dumps_json(record: Dict[str, Any]) -> bytes:
+    """Serialize a record with the standard library."""
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _dumps_orjson(record: Dict[str, Any]) -> bytes:
+    """Serialize a record with orjson."""
+    return orjson.dumps(record, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+class JsonLinesWriter:
+    """
+    Streaming writer of compressed JSON Lines files rotated by size.
+    
+    Files are named ``<prefix>-<index>.jsonl[.gz|.zst]``; a new file is started
+    once the compressed size of the current one reaches ``max_bytes``.
+    """
+    
+    def __init__(
+        self,
+        prefix: str,
+        compression: Optional[str] = "auto",
+        max_bytes: Optional[int] = 256 * 2 ** 20,
+        serializer: str = "auto",
+    ):
+        """
+        Initialize the writer.
+        
+        Args:
+            prefix: Path of the files without the index and extension
+            compression: "zstd", "gzip", None for plain text, or "auto" for zstd
+                when available and gzip otherwise
+            max_bytes: Size at which files are rotated, or None to never rotate
+            serializer: "orjson", "json", or "auto" for orjson when available
+        """
+        if compression == "auto":
+            compression = default_compression()
+        if compression not in EXTENSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("zstandard is required for zstd compression")
+        
+        if serializer == "auto":
+            serializer = "orjson" if orjson is not None else "json"
+        if serializer not in ["orjson", "json"]:
+            raise ValueError(f"Unknown serializer: {serializer}")
+        if serializer == "orjson" and orjson is None:
+            raise ImportError("orjson is required for the orjson serializer")
+        
+        self.prefix = prefix
+        self.compression = compression
+        self.max_bytes = max_bytes
+        self.rows = 0
+        self.paths: List[str] = []
+        self._dumps: Callable[[Dict[str, Any]], bytes] = _dumps_orjson if serializer == "orjson" else _dumps_json
+        self._raw: Optional[BinaryIO] = None
+        self._stream: Optional[BinaryIO] = None
+    
+    def write(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Append a page of records.
+        
+        Args:
+            records: Records to append
+        
+        Returns:
+            Number of records written
+        """
+        if self._stream is None:
+            self._open()
+        
+        dumps = self._dumps
+        lines = [dumps(record) + b"\n" for record in records]
+        self._stream.write(b"".join(lines))
+        self.rows += len(lines)
+        
+        # Compressed data is buffered, so files may exceed the limit by a little
+        if self.max_bytes is not None and self._raw.tell() >= self.max_bytes:
+            self._close_file()
+        
+        return len(lines)
+    
+    def close(self) -> None:
+        """Finish the current file."""
+        self._close_file()
+        if self.paths:
+            logger.info(f"Archived {self.rows} records to {len(self.paths)} files at {self.prefix}")
+    
+    def __enter__(self) -> "JsonLinesWriter":
+        """Return the writer."""
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close the writer."""
+        self.close()
+    
+    def _open(self) -> None:
+        """Start the next file."""
+        path = f"{self.prefix}-{len(self.paths):04d}{EXTENSIONS[self.compression]}"
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._raw = open(path, "wb")
+        if self.compression == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb")
+        elif self.compression == "zstd":
+            self._stream = zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = self._raw
+        self.paths.append(path)
+    
+    def _close_file(self) -> None:
+        """Flush and close the current file."""
+        if self._stream is None:
+            return
+        
+        try:
+            if self._stream is not self._raw:
+                self._stream.close()
+            self._raw.close()
+        except OSError as e:
+            logger.error(f"Error closing {self.paths[-1]}: {e}")
+        finally:
+            self._stream = None
+            self._raw = None
+
+
+def iter_json_lines(paths: Union[str, Iterable[str]]) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the records of JSON Lines files, one at a time.
+    
+    The compression of each file is detected from its extension.
+    
+    Args:
+        paths: File paths, or a glob pattern matching them in sorted order
+    
+    Yields:
+        The records of the files, in order
+    """
+    if isinstance(paths, str):
+        paths = sorted(glob.glob(paths))
+    
+    loads = orjson.loads if orjson is not None else json.loads
+    for path in paths:
+        with _open_reader(path) as f:
+            for line in f:
+                if line.strip():
+                    yield loads(line)
+
+
+def _open_reader(path: str) -> BinaryIO:
+    """Open a possibly compressed JSON Lines file for reading lines."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise ImportError(f"zstandard is required to read {path}")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True))
+    
+    return open(path, "rb")
@@ -0,0 +1,272 @@
+"""
+Listing sink module.
+
+This module writes listings to a dataset partitioned by source and collection
+date. With pyarrow installed, each partition is a compressed Parquet file with
+one row group per written page and a schema shared by all collectors, so
+analytics can read only the columns they need. Without pyarrow, partitions
+are gzipped JSON Lines files with the same layout.
+"""
+
+import glob
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .records import CATEGORY_FIELDS, FIELD_BITS, NUMERIC_FIELDS, TEXT_FIELDS, ListingBatch
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Numeric fields stored as integers; values with a fraction go to the extra column
+INTEGER_FIELDS = [
+    "year",
+    "mileage",
+    "doors",
+    "seats",
+    "brand_id",
+    "model_id",
+    "version_id",
+    "age",
+    "cluster_id",
+    "cluster_size",
+]
+
+# Column holding the fields without a column of their own, as JSON objects
+EXTRA_COLUMN = "extra"
+
+# Characters allowed in partition values
+UNSAFE_PARTITION_CHARACTERS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def listing_schema() -> "pa.Schema":
+    """
+    Get the Arrow schema shared by the listings of all collectors.
+    
+    Returns:
+        The schema
+    """
+    fields = []
+    for name in NUMERIC_FIELDS:
+        fields.append(pa.field(name, pa.int64() if name in INTEGER_FIELDS else pa.float64()))
+    for name in CATEGORY_FIELDS + TEXT_FIELDS + [EXTRA_COLUMN]:
+        fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+
+class ListingSink:
+    """
+    Partitioned dataset writer for listings.
+    
+    Files are laid out as ``<root>/source=<source>/date=<date>/part-<run>.<ext>``.
+    A writer stays open per partition for the whole run, so every call to
+    ``write`` appends a page; call ``close`` to finish the files.
+    """
+    
+    def __init__(
+        self,
+        root: str,
+        compression: str = "zstd",
+        run_id: Optional[str] = None,
+        date: Optional[str] = None,
+        use_parquet: Optional[bool] = None,
+    ):
+        """
+        Initialize the sink.
+        
+        Args:
+            root: Directory of the dataset
+            compression: Parquet compression codec
+            run_id: Name of the files of this run (default: current timestamp)
+            date: Collection date of the partitions (default: today)
+            use_parquet: Whether to write Parquet (default: if pyarrow is installed)
+        """
+        now = datetime.now()
+        self.root = root
+        self.compression = compression
+        self.run_id = run_id or now.strftime("%Y%m%d_%H%M%S")
+        self.date = date or now.strftime("%Y-%m-%d")
+        self.use_parquet = pa is not None if use_parquet is None else use_parquet
+        self.rows = 0
+        self._writers: Dict[str, Any] = {}
+        
+        if self.use_parquet and pa is None:
+            raise ImportError("pyarrow is required to write Parquet")
+        if not self.use_parquet:
+            logger.warning("pyarrow is not installed, writing listings as gzipped JSON Lines")
+    
+    @property
+    def paths(self) -> List[str]:
+        """Paths of the files written by this run."""
+        return list(self._writers)
+    
+    def write(self, records: Sequence[Dict[str, Any]]) -> int:
+        """
+        Append a page of listings to their partitions.
+        
+        Args:
+            records: Car dictionaries
+        
+        Returns:
+            Number of listings written
+        """
+        partitions: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            partitions.setdefault(self._partition_path(record.get("source")), []).append(record)
+        
+        for path, partition in partitions.items():
+            if self.use_parquet:
+                self._write_parquet(path, partition)
+            else:
+                self._write_json_lines(path, partition)
+        
+        self.rows += len(records)
+        return len(records)
+    
+    def close(self) -> None:
+        """Finish all files of the run."""
+        for path, writer in self._writers.items():
+            try:
+                writer.close()
+            except Exception as e:
+                logger.error(f"Error closing {path}: {e}")
+        
+        if self._writers:
+            logger.info(f"Wrote {self.rows} listings to {len(self._writers)} files under {self.root}")
+    
+    def __enter__(self) -> "ListingSink":
+        """Return the sink."""
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close the sink."""
+        self.close()
+    
+    def _partition_path(self, source: Any) -> str:
+        """Get the path of the file of a source in this run."""
+        source = UNSAFE_PARTITION_CHARACTERS.sub("_", str(source or "unknown"))
+        extension = "parquet" if self.use_parquet else "jsonl.gz"
+        return os.path.join(self.root, f"source={source}", f"date={self.date}", f"part-{self.run_id}.{extension}")
+    
+    def _write_parquet(self, path: str, records: List[Dict[str, Any]]) -> None:
+        """Append records to a Parquet file as a row group."""
+        writer = self._writers.get(path)
+        if writer is None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            writer = self._writers[path] = pq.ParquetWriter(path, listing_schema(), compression=self.compression)
+        
+        writer.write_table(to_table(records))
+    
+    def _write_json_lines(self, path: str, records: List[Dict[str, Any]]) -> None:
+        """Append records to a gzipped JSON Lines file."""
+        writer = self._writers.get(path)
+        if writer is None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            writer = self._writers[path] = gzip.open(path, "wt", encoding="utf-8")
+        
+        for record in records:
+            writer.write(json.dumps(record, separators=(",", ":"), default=str))
+            writer.write("\n")
+
+
+def to_table(records: Sequence[Dict[str, Any]]) -> "pa.Table":
+    """
+    Convert listings to an Arrow table with the shared schema.
+    
+    Args:
+        records: Car dictionaries
+    
+    Returns:
+        The table
+    """
+    batch = ListingBatch.from_records(records)
+    extra: List[Optional[Dict[str, Any]]] = [dict(row_extra) if row_extra else None for row_extra in batch.extra]
+    columns = []
+    
+    for name in NUMERIC_FIELDS:
+        values, missing = _numeric_column(batch, name)
+        if name in INTEGER_FIELDS:
+            # Values with a fraction cannot be stored as integers
+            for row in np.flatnonzero(~missing & (values % 1 != 0)).tolist():
+                extra[row] = {**(extra[row] or {}), name: float(values[row])}
+                missing[row] = True
+            values = np.where(missing, 0, values).astype(np.int64)
+            columns.append(pa.array(values, type=pa.int64(), mask=missing))
+        else:
+            columns.append(pa.array(values, type=pa.float64(), mask=missing))
+    
+    for name in CATEGORY_FIELDS:
+        names = batch.categories[name] + [None]
+        # Missing values have code -1, which picks the trailing None
+        columns.append(pa.array([names[code] for code in batch.codes[name].tolist()], type=pa.string()))
+    
+    for name in TEXT_FIELDS:
+        columns.append(pa.array(batch.texts[name], type=pa.string()))
+    
+    columns.append(pa.array(
+        [json.dumps(row_extra, separators=(",", ":"), default=str) if row_extra else None for row_extra in extra],
+        type=pa.string(),
+    ))
+    return pa.Table.from_arrays(columns, schema=listing_schema())
+
+
+def _numeric_column(batch: ListingBatch, name: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the values of a numeric field and the mask of the rows missing it."""
+    values = batch.numbers[name]
+    missing = ((batch.present & FIELD_BITS[name]) == 0) | np.isnan(values)
+    return values, missing
+
+
+def read_listings(
+    root: str,
+    columns: Optional[List[str]] = None,
+    sources: Optional[Iterable[str]] = None,
+    dates: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """
+    Read listings written by ``ListingSink``.
+    
+    Partitions are selected from their paths, so only the files of the
+    requested sources and dates are opened, and Parquet files only decode the
+    requested columns.
+    
+    Args:
+        root: Directory of the dataset
+        columns: Columns to read (default: all)
+        sources: Sources to read (default: all)
+        dates: Collection dates to read, as YYYY-MM-DD (default: all)
+    
+    Returns:
+        DataFrame with one listing per row
+    """
+    paths = []
+    for source in sources or ["*"]:
+        for date in dates or ["*"]:
+            source_pattern = source if source == "*" else UNSAFE_PARTITION_CHARACTERS.sub("_", source)
+            paths.extend(sorted(glob.glob(os.path.join(root, f"source={source_pattern}", f"date={date}", "part-*"))))
+    
+    frames = []
+    for path in paths:
+        if path.endswith(".parquet"):
+            frames.append(pq.read_table(path, columns=columns).to_pandas())
+        else:
+            frame = pd.read_json(path, lines=True, compression="gzip")
+            frames.append(frame.reindex(columns=columns) if columns else frame)
+    
+    if not frames:
+        return pd.DataFrame(columns=columns or [])
+    return pd.concat(frames, ignore_index=True)
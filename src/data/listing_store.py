@@ -0,0 +1,444 @@
+"""
+Listing store module.
+
+This module keeps the listings of all runs in an embedded SQLite database
+keyed by source and listing ID. The columns dashboards filter on are indexed,
+and upserts skip listings whose content hash is unchanged, so re-collecting
+the same listings is cheap and pages query accumulated history instead of
+rescanning dumps.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Default location of the database, next to the other collected data
+DEFAULT_PATH = os.path.join("data", "listings.db")
+
+# Columns extracted from the listings, with their SQL types
+COLUMNS = {
+    "brand": "TEXT COLLATE NOCASE",
+    "model": "TEXT COLLATE NOCASE",
+    "version": "TEXT COLLATE NOCASE",
+    "year": "INTEGER",
+    "state": "TEXT COLLATE NOCASE",
+    "price": "REAL",
+    "mileage": "REAL",
+    "title": "TEXT",
+    "url": "TEXT",
+}
+
+# Indexes of the columns pages filter and sort on; the first one also serves
+# brand and brand/model lookups
+INDEXES = {
+    "brand_model_year": ["brand", "model", "year"],
+    "model": ["model"],
+    "year": ["year"],
+    "state": ["state"],
+    "price": ["price"],
+    "mileage": ["mileage"],
+}
+
+# Fields left out of the content hash, as they change between runs without
+# the listing changing
+UNHASHED_FIELDS = {"cluster_id", "cluster_size"}
+
+# Filters of the query API: column and comparison operator
+FILTERS = {
+    "source": ("source", "="),
+    "brand": ("brand", "="),
+    "model": ("model", "="),
+    "version": ("version", "="),
+    "year": ("year", "="),
+    "state": ("state", "="),
+    "min_year": ("year", ">="),
+    "max_year": ("year", "<="),
+    "min_price": ("price", ">="),
+    "max_price": ("price", "<="),
+    "min_mileage": ("mileage", ">="),
+    "max_mileage": ("mileage", "<="),
+}
+
+# Keys of the state of a listing, on the listing or its location
+STATE_KEYS = ["state", "uf"]
+
+# Number of keys looked up per statement, below the SQLite variable limit
+LOOKUP_CHUNK_SIZE = 500
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """
+    Compute the content hash of a listing.
+    
+    Args:
+        record: Car dictionary
+    
+    Returns:
+        Hex digest of the listing fields in key order
+    """
+    content = {name: value for name, value in record.items() if name not in UNHASHED_FIELDS}
+    values = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(values.encode("utf-8")).hexdigest()
+
+
+class ListingStore:
+    """
+    Embedded SQLite store of listings keyed by (source, id).
+    
+    Each row keeps the indexed columns, the full listing as JSON, its content
+    hash and when it was first seen and last changed. Listings without an ID
+    are keyed by their URL. A single connection is shared by all threads, so
+    Streamlit sessions can use the same store.
+    """
+    
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Initialize the store, creating the database if needed.
+        
+        Args:
+            path: Path of the database file, or ":memory:"
+        """
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._create_schema()
+    
+    def _create_schema(self) -> None:
+        """Create the listings table and its indexes."""
+        columns = ",\n".join(f"{name} {sql_type}" for name, sql_type in COLUMNS.items())
+        with self._lock, self._connection:
+            # Let the UI read while a collection run writes
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS listings (
+                    source TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    {columns},
+                    data TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    first_seen TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (source, id)
+                )
+                """
+            )
+            for name, index_columns in INDEXES.items():
+                self._connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_listings_{name} ON listings ({', '.join(index_columns)})"
+                )
+    
+    def upsert(self, records: Iterable[Dict[str, Any]], seen_at: Optional[str] = None) -> Dict[str, int]:
+        """
+        Insert new listings and update changed ones.
+        
+        Listings whose content hash matches the stored one are not written.
+        If a key appears several times, its last listing is kept.
+        
+        Args:
+            records: Car dictionaries
+            seen_at: ISO timestamp of the listings (default: now)
+        
+        Returns:
+            Number of listings inserted, updated, unchanged and skipped for
+            lacking a source or key
+        """
+        seen_at = seen_at or datetime.now().isoformat(timespec="seconds")
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+        
+        hashed: Dict[Tuple[str, str], Tuple[str, Dict[str, Any]]] = {}
+        for record in records:
+            key = self._key(record)
+            if key is None:
+                counts["skipped"] += 1
+                continue
+            hashed[key] = (content_hash(record), record)
+        
+        names = ["source", "id", *COLUMNS, "data", "content_hash", "first_seen", "updated_at"]
+        updates = ", ".join(f"{name} = excluded.{name}" for name in names[2:] if name != "first_seen")
+        statement = f"""
+            INSERT INTO listings ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})
+            ON CONFLICT (source, id) DO UPDATE SET {updates}
+            WHERE listings.content_hash != excluded.content_hash
+        """
+        
+        with self._lock, self._connection:
+            stored = self._stored_hashes(list(hashed))
+            changed = []
+            for key, (record_hash, record) in hashed.items():
+                stored_hash = stored.get(key)
+                if stored_hash is None:
+                    counts["inserted"] += 1
+                elif stored_hash != record_hash:
+                    counts["updated"] += 1
+                else:
+                    counts["unchanged"] += 1
+                    continue
+                # Only rows that are written are serialized
+                changed.append(self._row(key, record, record_hash, seen_at))
+            
+            self._connection.executemany(statement, changed)
+        
+        logger.info(
+            f"Stored listings in {self.path}: {counts['inserted']} new, {counts['updated']} updated, "
+            f"{counts['unchanged']} unchanged, {counts['skipped']} without key"
+        )
+        return counts
+    
+    def query(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        order_by: str = "price",
+        descending: bool = False,
+        limit: Optional[int] = None,
+        **filters: Any,
+    ) -> pd.DataFrame:
+        """
+        Get the listings matching filters.
+        
+        Filters are the keys of ``FILTERS``; a list or tuple value matches any
+        of its values, e.g. ``brand=["Toyota", "Honda"]``. Text filters ignore
+        case.
+        
+        Args:
+            columns: Columns to return (default: the key and indexed columns)
+            order_by: Column to sort by
+            descending: Whether to sort in descending order
+            limit: Maximum number of listings
+            **filters: Filter values
+        
+        Returns:
+            DataFrame with one listing per row
+        """
+        columns = list(columns or ["source", "id", *COLUMNS])
+        for name in columns + [order_by]:
+            self._check_column(name)
+        
+        where, parameters = self._where(filters)
+        sql = f"SELECT {', '.join(columns)} FROM listings{where} ORDER BY {order_by}{' DESC' if descending else ''}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(int(limit))
+        
+        return self._read(sql, parameters, columns)
+    
+    def price_summary(self, **filters: Any) -> Dict[str, Optional[float]]:
+        """
+        Get price statistics of the listings matching filters.
+        
+        Args:
+            **filters: Filter values, as in ``query``
+        
+        Returns:
+            Dictionary with the count, minimum, mean and maximum price
+        """
+        where, parameters = self._where(filters)
+        where = f"{where} AND price IS NOT NULL" if where else " WHERE price IS NOT NULL"
+        sql = f"SELECT COUNT(*), MIN(price), AVG(price), MAX(price) FROM listings{where}"
+        
+        with self._lock:
+            count, minimum, mean, maximum = self._connection.execute(sql, parameters).fetchone()
+        return {"count": count, "min": minimum, "mean": mean, "max": maximum}
+    
+    def price_history(self, **filters: Any) -> pd.DataFrame:
+        """
+        Get the mean price of the listings matching filters by month first seen.
+        
+        Args:
+            **filters: Filter values, as in ``query``
+        
+        Returns:
+            DataFrame with month, count and mean_price columns, oldest month first
+        """
+        where, parameters = self._where(filters)
+        where = f"{where} AND price IS NOT NULL" if where else " WHERE price IS NOT NULL"
+        sql = (
+            "SELECT substr(first_seen, 1, 7) AS month, COUNT(*), AVG(price) "
+            f"FROM listings{where} GROUP BY month ORDER BY month"
+        )
+        return self._read(sql, parameters, ["month", "count", "mean_price"])
+    
+    def distinct(self, column: str, **filters: Any) -> List[Any]:
+        """
+        Get the distinct values of a column among the listings matching filters.
+        
+        Args:
+            column: Column name
+            **filters: Filter values, as in ``query``
+        
+        Returns:
+            Sorted list of the non-null values
+        """
+        self._check_column(column)
+        where, parameters = self._where(filters)
+        where = f"{where} AND {column} IS NOT NULL" if where else f" WHERE {column} IS NOT NULL"
+        
+        with self._lock:
+            rows = self._connection.execute(f"SELECT DISTINCT {column} FROM listings{where} ORDER BY {column}", parameters)
+            return [row[0] for row in rows.fetchall()]
+    
+    def get(self, source: str, listing_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Get a stored listing.
+        
+        Args:
+            source: Source of the listing
+            listing_id: ID of the listing, or its URL if it has no ID
+        
+        Returns:
+            The car dictionary, or None if it is not stored
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM listings WHERE source = ? AND id = ?", (source, str(listing_id))
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def count(self, **filters: Any) -> int:
+        """
+        Count the listings matching filters.
+        
+        Args:
+            **filters: Filter values, as in ``query``
+        
+        Returns:
+            Number of listings
+        """
+        where, parameters = self._where(filters)
+        with self._lock:
+            return self._connection.execute(f"SELECT COUNT(*) FROM listings{where}", parameters).fetchone()[0]
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+    
+    def __enter__(self) -> "ListingStore":
+        """Return the store."""
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close the store."""
+        self.close()
+    
+    @staticmethod
+    def _key(record: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """Get the (source, id) key of a listing, falling back to its URL."""
+        source = record.get("source")
+        listing_id = record.get("id")
+        if listing_id is None or listing_id == "":
+            listing_id = record.get("url")
+        if not source or listing_id is None or listing_id == "":
+            return None
+        return str(source), str(listing_id)
+    
+    @staticmethod
+    def _row(key: Tuple[str, str], record: Dict[str, Any], record_hash: str, seen_at: str) -> Tuple[Any, ...]:
+        """Build the row of a listing."""
+        values = []
+        for name, sql_type in COLUMNS.items():
+            value = _state(record) if name == "state" else record.get(name)
+            if sql_type in ["INTEGER", "REAL"]:
+                # Keep malformed numbers in the data column only, so comparisons stay numeric
+                if isinstance(value, bool) or not isinstance(value, (int, float)) or value != value:
+                    value = None
+            elif value is not None and not isinstance(value, str):
+                value = str(value)
+            values.append(value)
+        
+        data = json.dumps(record, separators=(",", ":"), default=str)
+        return (*key, *values, data, record_hash, seen_at, seen_at)
+    
+    def _stored_hashes(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        """Get the stored content hashes of keys."""
+        ids_by_source: Dict[str, List[str]] = {}
+        for source, listing_id in keys:
+            ids_by_source.setdefault(source, []).append(listing_id)
+        
+        hashes = {}
+        for source, ids in ids_by_source.items():
+            for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+                chunk = ids[start:start + LOOKUP_CHUNK_SIZE]
+                rows = self._connection.execute(
+                    f"SELECT id, content_hash FROM listings WHERE source = ? AND id IN ({', '.join('?' * len(chunk))})",
+                    [source, *chunk],
+                )
+                hashes.update(((source, listing_id), stored_hash) for listing_id, stored_hash in rows)
+        return hashes
+    
+    @staticmethod
+    def _where(filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """Build the WHERE clause and parameters of filters; None values are ignored."""
+        clauses = []
+        parameters: List[Any] = []
+        for name, value in filters.items():
+            if name not in FILTERS:
+                raise ValueError(f"Unknown filter: {name}")
+            if value is None:
+                continue
+            
+            column, operator = FILTERS[name]
+            if isinstance(value, (list, tuple, set)):
+                values = list(value)
+                if not values:
+                    # Nothing selected matches nothing
+                    clauses.append("0")
+                    continue
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                parameters.extend(values)
+            else:
+                clauses.append(f"{column} {operator} ?")
+                parameters.append(value)
+        
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), parameters
+    
+    @staticmethod
+    def _check_column(name: str) -> None:
+        """Reject names that are not columns, as they are formatted into SQL."""
+        if name not in ["source", "id", *COLUMNS, "content_hash", "first_seen", "updated_at"]:
+            raise ValueError(f"Unknown column: {name}")
+    
+    def _read(self, sql: str, parameters: List[Any], columns: List[str]) -> pd.DataFrame:
+        """Run a query into a DataFrame."""
+        with self._lock:
+            rows = self._connection.execute(sql, parameters).fetchall()
+        return pd.DataFrame(rows, columns=columns)
+
+
+def _state(record: Dict[str, Any]) -> Optional[str]:
+    """Get the state of a listing from its fields or its location."""
+    location = record.get("location")
+    for source in [record, location if isinstance(location, dict) else {}]:
+        for key in STATE_KEYS:
+            value = source.get(key)
+            if isinstance(value, str) and value:
+                return value
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_listing_store(path: str = DEFAULT_PATH) -> ListingStore:
+    """
+    Get the store of a database file, shared by all callers.
+    
+    Args:
+        path: Path of the database file
+    
+    Returns:
+        The store
+    """
+    return ListingStore(path)
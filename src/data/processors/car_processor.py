@@ -1,16 +1,33 @@
 """
 Car processor module.
 
-This module implements a processor for car data.
+This module implements a processor for car data. Records can be processed one
+at a time with ``process`` or as pandas columns with ``process_frame``, which
+applies the same rules with vectorized operations. Brands and models are
+resolved against the catalog when a ``TitleParser`` is given, and split from
+the title with a regular expression otherwise.
 """
 
 import logging
+import numbers
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .title_parser import CATALOG_FIELDS, TitleParser
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Year the age of the cars is computed against
+CURRENT_YEAR = 2023  # This should be updated dynamically
+
+# Regular expressions for extracting information from titles
+YEAR_PATTERN = r'\b(19|20)\d{2}\b'
+BRAND_MODEL_PATTERN = r'^([A-Za-z]+)\s+(.+)$'
+
 
 class CarProcessor:
     """
@@ -19,16 +36,27 @@ class CarProcessor:
     This class processes car data to clean and transform it.
     """
     
-    def __init__(self):
-        """Initialize the car processor."""
+    def __init__(self, title_parser: Optional[TitleParser] = None):
+        """
+        Initialize the car processor.
+        
+        Args:
+            title_parser: Parser resolving titles to the catalog; titles it cannot
+                resolve fall back to the regular expression
+        """
+        self.title_parser = title_parser
+        
         # Regular expressions for extracting information from titles
-        self.year_pattern = re.compile(r'\b(19|20)\d{2}\b')
-        self.brand_model_pattern = re.compile(r'^([A-Za-z]+)\s+(.+)$')
+        self.year_pattern = re.compile(YEAR_PATTERN)
+        self.brand_model_pattern = re.compile(BRAND_MODEL_PATTERN)
     
     def process(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Process car data.
         
+        Fields set to None are treated as absent, so a listing without a price or
+        year is kept without the values derived from them.
+        
         Args:
             data: List of car dictionaries
             
@@ -47,6 +75,145 @@ class CarProcessor:
         logger.info(f"Processed {len(data)} items")
         return processed_data
     
+    def process_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Process car data held in a DataFrame with vectorized column operations.
+        
+        The rules are the same as ``process`` applied to the records of the frame,
+        where a missing value (NaN/None) stands for an absent key. Rows that the
+        per-record path would reject with an error (no string title, or a
+        non-numeric price, mileage or year used in a calculation) are dropped.
+        
+        Args:
+            frame: DataFrame with one car per row
+            
+        Returns:
+            Processed DataFrame; the input frame is not modified
+        """
+        if "title" not in frame:
+            logger.error(f"Error processing frame: missing title column, dropping {len(frame)} rows")
+            return frame.iloc[0:0].copy()
+        
+        processed = frame.copy()
+        price, invalid_price = self._numeric_column(processed, "price")
+        mileage, invalid_mileage = self._numeric_column(processed, "mileage")
+        year, invalid_year = self._numeric_column(processed, "year")
+        
+        needs_year = year.isna() | (year == 0)
+        if invalid_year.any():
+            # Non-numeric years are only replaced when falsy, e.g. empty strings
+            needs_year &= ~invalid_year | ~processed["year"].astype(bool)
+        
+        valid_title, title_year, title_fields = self._parse_titles(frame["title"], needs_year)
+        
+        # Rows without a string title cannot be parsed
+        invalid = ~valid_title
+        
+        # Extract year from title if not present
+        replaced = needs_year & title_year.notna()
+        year = year.where(~replaced, title_year)
+        invalid_year &= ~replaced
+        
+        # Extract brand and model from title
+        for column, values in title_fields.items():
+            matched = values.notna()
+            if matched.any():
+                current = processed[column] if column in processed else pd.Series(np.nan, index=processed.index)
+                processed[column] = values.where(matched, current)
+        
+        # Calculate price per mile
+        positive_mileage = mileage > 0
+        invalid |= invalid_mileage | (invalid_price & positive_mileage)
+        has_price_per_mile = positive_mileage & price.notna()
+        if has_price_per_mile.any():
+            processed["price_per_mile"] = (price / mileage).where(has_price_per_mile)
+        
+        # Calculate age
+        invalid |= invalid_year
+        if year.notna().any():
+            age = CURRENT_YEAR - year
+            processed["year"] = self._as_integer(year)
+            processed["age"] = self._as_integer(age)
+            
+            # Calculate price per age
+            positive_age = age > 0
+            invalid |= invalid_price & positive_age
+            has_price_per_age = positive_age & price.notna()
+            if has_price_per_age.any():
+                processed["price_per_age"] = (price / age).where(has_price_per_age)
+        
+        if invalid.any():
+            logger.error(f"Error processing {int(invalid.sum())} rows, dropping them")
+            processed = processed[~invalid]
+        
+        logger.info(f"Processed {len(frame)} rows")
+        return processed
+    
+    def _parse_titles(
+        self,
+        titles: pd.Series,
+        needs_year: pd.Series,
+    ) -> Tuple[pd.Series, pd.Series, Dict[str, pd.Series]]:
+        """
+        Parse the year, brand and model of a column of titles.
+        
+        Listings share a small number of distinct titles, so each distinct title
+        is parsed once and the results are broadcast back to the rows. Like the
+        per-record path, titles are only searched for a year where it is needed.
+        
+        Args:
+            titles: Column of titles
+            needs_year: Mask of the rows whose year must be taken from the title
+            
+        Returns:
+            Tuple of the mask of string titles, the year found in each title (NaN
+            if none or not needed), and the brand, model and other catalog fields
+            matched in each title (NaN if none) keyed by column
+        """
+        codes, uniques = pd.factorize(titles)
+        uniques = np.asarray(uniques, dtype=object).tolist()
+        valid = [isinstance(title, str) for title in uniques]
+        
+        # Only search titles of rows missing a year; code -1 marks missing titles
+        searched = np.zeros(len(uniques) + 1, dtype=bool)
+        searched[codes[needs_year.to_numpy()]] = True
+        searched = searched[:-1] & np.array(valid, dtype=bool)
+        
+        search = self.year_pattern.search
+        year_matches = [search(title) if needed else None for title, needed in zip(uniques, searched.tolist())]
+        title_fields = [self._parse_brand_model(title) if is_str else {} for title, is_str in zip(uniques, valid)]
+        fields = CATALOG_FIELDS if self.title_parser else ["brand", "model"]
+        
+        # Missing titles have code -1, which picks the trailing unparsed entry
+        def broadcast(values, dtype):
+            return pd.Series(np.array(values + [np.nan], dtype=dtype)[codes], index=titles.index)
+        
+        return (
+            pd.Series(np.array(valid + [False], dtype=bool)[codes], index=titles.index),
+            broadcast([float(m.group(0)) if m else np.nan for m in year_matches], float),
+            {field: broadcast([parsed.get(field, np.nan) for parsed in title_fields], object) for field in fields},
+        )
+    
+    def _parse_brand_model(self, title: str) -> Dict[str, Any]:
+        """
+        Extract the brand, model and other catalog fields of a title.
+        
+        Args:
+            title: Car title
+            
+        Returns:
+            Dictionary of the fields found in the title
+        """
+        if self.title_parser:
+            catalog = self.title_parser.parse(title)
+            if catalog:
+                return catalog
+        
+        brand_model_match = self.brand_model_pattern.match(title)
+        if brand_model_match:
+            return {"brand": brand_model_match.group(1), "model": brand_model_match.group(2)}
+        return {}
+    
     def _process_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process a single car item.
@@ -67,22 +234,52 @@ class CarProcessor:
                 processed_item["year"] = int(year_match.group(0))
         
         # Extract brand and model from title
-        brand_model_match = self.brand_model_pattern.match(processed_item["title"])
-        if brand_model_match:
-            processed_item["brand"] = brand_model_match.group(1)
-            processed_item["model"] = brand_model_match.group(2)
+        processed_item.update(self._parse_brand_model(processed_item["title"]))
+        
+        # Missing values (None) are treated as absent keys, as in process_frame
+        has_price = processed_item.get("price") is not None
         
         # Calculate price per mile
-        if "price" in processed_item and "mileage" in processed_item and processed_item["mileage"] > 0:
+        if has_price and processed_item.get("mileage") is not None and processed_item["mileage"] > 0:
             processed_item["price_per_mile"] = processed_item["price"] / processed_item["mileage"]
         
         # Calculate age
-        if "year" in processed_item:
-            current_year = 2023  # This should be updated dynamically
-            processed_item["age"] = current_year - processed_item["year"]
+        if processed_item.get("year") is not None:
+            processed_item["age"] = CURRENT_YEAR - processed_item["year"]
             
             # Calculate price per age
-            if "price" in processed_item and processed_item["age"] > 0:
+            if has_price and processed_item["age"] > 0:
                 processed_item["price_per_age"] = processed_item["price"] / processed_item["age"]
         
-        return processed_item 
\ No newline at end of file
+        return processed_item
+    
+    @staticmethod
+    def _numeric_column(frame: pd.DataFrame, name: str) -> Tuple[pd.Series, pd.Series]:
+        """
+        Get a column as floats along with the rows holding non-numeric values.
+        
+        Args:
+            frame: DataFrame holding the column
+            name: Name of the column
+            
+        Returns:
+            Tuple of the float values (NaN where missing) and the mask of rows whose
+            value is present but not a number
+        """
+        if name not in frame:
+            return pd.Series(np.nan, index=frame.index), pd.Series(False, index=frame.index)
+        
+        column = frame[name]
+        if pd.api.types.is_numeric_dtype(column):
+            return column.astype(float), pd.Series(False, index=frame.index)
+        
+        is_number = column.map(lambda value: isinstance(value, numbers.Real)).astype(bool)
+        values = pd.to_numeric(column.where(is_number), errors="coerce").astype(float)
+        return values, column.notna() & ~is_number
+    
+    @staticmethod
+    def _as_integer(values: pd.Series) -> pd.Series:
+        """Convert whole-number floats back to integers when no value is missing."""
+        if values.notna().all() and (values % 1 == 0).all():
+            return values.astype("int64")
+        return values
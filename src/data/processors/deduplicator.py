@@ -0,0 +1,337 @@
+"""
+Listing deduplicator module.
+
+This module clusters near-duplicate listings of a run, e.g. the same car
+listed on cars.com and Webmotors. Candidate pairs are only drawn from blocks
+of listings sharing brand, model, year and a mileage band (a price band for
+listings without mileage), and within a block from MinHash LSH buckets over
+the listing text and from perceptual hash buckets of the first image, so
+clustering runs in near-linear time instead of comparing every pair of
+listings.
+"""
+
+import logging
+import math
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .title_parser import tokenize
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Mersenne prime the MinHash permutations are computed modulo, small enough
+# for the products with 32-bit token hashes to fit in 64 bits
+MERSENNE_PRIME = (1 << 31) - 1
+
+# Fields whose text is compared between listings
+TEXT_FIELDS = ["title", "description", "features"]
+
+
+def average_hash(path: str, size: int = 8) -> Optional[int]:
+    """
+    Compute the average hash of an image.
+    
+    The image is shrunk to ``size`` x ``size`` gray pixels and each bit tells
+    whether a pixel is brighter than the mean, so re-encoded or resized copies
+    of a photo get hashes a few bits apart.
+    
+    Args:
+        path: Path of the image
+        size: Width and height of the hashed image
+    
+    Returns:
+        The hash as an integer of ``size * size`` bits, or None if Pillow is not
+        installed or the image cannot be read
+    """
+    if Image is None:
+        return None
+    
+    try:
+        with Image.open(path) as image:
+            pixels = np.asarray(image.convert("L").resize((size, size)), dtype=float).ravel()
+    except Exception as e:
+        logger.warning(f"Failed to hash image {path}: {e}")
+        return None
+    
+    bits = pixels > pixels.mean()
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+class ListingDeduplicator:
+    """
+    Near-duplicate detector for car listings.
+    
+    Two listings of the same block are duplicates when the Jaccard similarity
+    of their text tokens reaches ``threshold``, or when the average hashes of
+    their first images are at most ``image_distance`` bits apart. Either way
+    their prices must be within ``price_tolerance`` and their mileages within
+    ``mileage_tolerance``, which keeps templated titles and stock photos shared
+    by different cars from merging them, and listings of the same source with
+    different IDs or URLs are never duplicates. Duplicates are grouped
+    transitively into clusters.
+    """
+    
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        threshold: float = 0.7,
+        mileage_tolerance: float = 2000,
+        image_distance: int = 6,
+        price_tolerance: float = 0.05,
+        seed: int = 1,
+    ):
+        """
+        Initialize the deduplicator.
+        
+        Args:
+            num_perm: Number of MinHash permutations
+            bands: Number of LSH bands; must divide ``num_perm``
+            threshold: Minimum Jaccard similarity of the texts of duplicates
+            mileage_tolerance: Maximum mileage difference of duplicates, also the
+                width of the mileage bands used for blocking
+            image_distance: Maximum Hamming distance between image hashes of duplicates
+            price_tolerance: Maximum relative price difference of duplicates; must
+                be between 0 and 1
+            seed: Seed of the MinHash permutations
+        """
+        if num_perm % bands:
+            raise ValueError(f"Number of bands {bands} must divide the number of permutations {num_perm}")
+        if mileage_tolerance <= 0:
+            raise ValueError(f"Mileage tolerance {mileage_tolerance} must be positive")
+        if not 0 < price_tolerance < 1:
+            raise ValueError(f"Price tolerance {price_tolerance} must be between 0 and 1")
+        
+        self.bands = bands
+        self.threshold = threshold
+        self.mileage_tolerance = mileage_tolerance
+        self.image_distance = image_distance
+        self.price_tolerance = price_tolerance
+        
+        # Prices within the tolerance are at most one band of log prices apart
+        self._price_band_width = -math.log1p(-price_tolerance)
+        
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._image_hashes: Dict[str, Optional[int]] = {}
+    
+    def cluster(self, records: List[Dict[str, Any]]) -> List[int]:
+        """
+        Assign a cluster to each listing.
+        
+        Args:
+            records: Car dictionaries
+        
+        Returns:
+            The cluster ID of each listing; clusters are numbered in order of
+            their first listing
+        """
+        parents = list(range(len(records)))
+        
+        def find(index: int) -> int:
+            while parents[index] != index:
+                parents[index] = parents[parents[index]]
+                index = parents[index]
+            return index
+        
+        tokens = [self._tokens(record) for record in records]
+        image_hashes = [self._image_hash(record) for record in records]
+        
+        for first, second in self._candidates(records, tokens, image_hashes):
+            root_first, root_second = find(first), find(second)
+            if root_first != root_second and self._is_duplicate(records, first, second, tokens, image_hashes):
+                parents[max(root_first, root_second)] = min(root_first, root_second)
+        
+        cluster_ids: Dict[int, int] = {}
+        return [cluster_ids.setdefault(find(index), len(cluster_ids)) for index in range(len(records))]
+    
+    def deduplicate(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Keep the first listing of each cluster.
+        
+        Args:
+            records: Car dictionaries
+        
+        Returns:
+            The first listing of each cluster, with ``cluster_id`` and
+            ``cluster_size`` fields added
+        """
+        cluster_ids = self.cluster(records)
+        sizes = np.bincount(cluster_ids, minlength=1).tolist() if records else []
+        
+        unique = []
+        for record, cluster_id in zip(records, cluster_ids):
+            if cluster_id == len(unique):
+                unique.append({**record, "cluster_id": cluster_id, "cluster_size": sizes[cluster_id]})
+        
+        logger.info(f"Deduplicated {len(records)} listings into {len(unique)} clusters")
+        return unique
+    
+    def _candidates(
+        self,
+        records: List[Dict[str, Any]],
+        tokens: List[Set[str]],
+        image_hashes: List[Optional[int]],
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        Generate candidate pairs of listings sharing a block and a bucket.
+        
+        Listings are indexed under their own band and looked up in the
+        neighbouring bands too, so duplicates across a band boundary are found.
+        
+        Args:
+            records: Car dictionaries
+            tokens: Text tokens of each listing
+            image_hashes: Image hash of each listing
+        
+        Yields:
+            Pairs of listing indices, each at most once
+        """
+        buckets: Dict[Hashable, List[int]] = defaultdict(list)
+        seen: Set[Tuple[int, int]] = set()
+        
+        for index, record in enumerate(records):
+            block, band = self._block(record)
+            keys = self._bucket_keys(tokens[index], image_hashes[index])
+            neighbours = [band] if band is None else [(band[0], band[1] + step) for step in (-1, 0, 1)]
+            
+            for key in keys:
+                for neighbour in neighbours:
+                    for other in buckets.get((block, neighbour, key), ()):
+                        if (other, index) not in seen:
+                            seen.add((other, index))
+                            yield other, index
+                
+                buckets[(block, band, key)].append(index)
+    
+    def _bucket_keys(self, tokens: Set[str], image_hash: Optional[int]) -> List[Hashable]:
+        """Get the LSH buckets of the text and image of a listing."""
+        keys: List[Hashable] = []
+        
+        if tokens:
+            signature = self._minhash(tokens)
+            rows = len(signature) // self.bands
+            keys.extend(("text", band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(self.bands))
+        
+        # Hashes at most 7 bits apart share at least one of 8 byte-wide bands
+        if image_hash is not None:
+            keys.extend(("image", band, (image_hash >> (8 * band)) & 0xFF) for band in range(8))
+        
+        return keys
+    
+    def _is_duplicate(
+        self,
+        records: List[Dict[str, Any]],
+        first: int,
+        second: int,
+        tokens: List[Set[str]],
+        image_hashes: List[Optional[int]],
+    ) -> bool:
+        """Check a candidate pair against the listing keys, prices, mileages and the text and image thresholds."""
+        first_record, second_record = records[first], records[second]
+        if self._distinct_listings(first_record, second_record):
+            return False
+        
+        # Values missing from either listing cannot tell the listings apart
+        first_price, second_price = self._number(first_record, "price"), self._number(second_record, "price")
+        if first_price is not None and second_price is not None:
+            if abs(first_price - second_price) > self.price_tolerance * max(abs(first_price), abs(second_price)):
+                return False
+        
+        first_mileage, second_mileage = self._number(first_record, "mileage"), self._number(second_record, "mileage")
+        if first_mileage is not None and second_mileage is not None:
+            if abs(first_mileage - second_mileage) > self.mileage_tolerance:
+                return False
+        
+        first_tokens, second_tokens = tokens[first], tokens[second]
+        if first_tokens and second_tokens:
+            similarity = len(first_tokens & second_tokens) / len(first_tokens | second_tokens)
+            if similarity >= self.threshold:
+                return True
+        
+        first_hash, second_hash = image_hashes[first], image_hashes[second]
+        return (
+            first_hash is not None
+            and second_hash is not None
+            and bin(first_hash ^ second_hash).count("1") <= self.image_distance
+        )
+    
+    @staticmethod
+    def _distinct_listings(first: Dict[str, Any], second: Dict[str, Any]) -> bool:
+        """Check whether two listings of the same source are told apart by their ID or URL."""
+        if not first.get("source") or first.get("source") != second.get("source"):
+            return False
+        
+        for key in ("id", "url"):
+            if first.get(key) is not None and second.get(key) is not None and first[key] != second[key]:
+                return True
+        return False
+    
+    def _minhash(self, tokens: Set[str]) -> np.ndarray:
+        """Compute the MinHash signature of a set of tokens."""
+        hashes = np.fromiter((zlib.crc32(token.encode("utf-8")) for token in tokens), dtype=np.uint64, count=len(tokens))
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % np.uint64(MERSENNE_PRIME)
+        return permuted.min(axis=1)
+    
+    def _block(self, record: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Optional[Tuple[str, int]]]:
+        """
+        Get the blocking key and band of a listing.
+        
+        Listings are banded by mileage, or by log price when the mileage is
+        missing, with bands as wide as the tolerances so duplicates are at most
+        one band apart. Listings without either share the band None.
+        """
+        brand = tokenize(str(record.get("brand") or ""))
+        model = tokenize(str(record.get("model") or ""))
+        mileage, price = self._number(record, "mileage"), self._number(record, "price")
+        if mileage is not None:
+            band = ("mileage", int(mileage // self.mileage_tolerance))
+        elif price is not None and price > 0:
+            band = ("price", int(math.log(price) // self._price_band_width))
+        else:
+            band = None
+        
+        # Only the first model token is used, as sources append trims differently
+        return (brand[0] if brand else None, model[0] if model else None, record.get("year")), band
+    
+    @staticmethod
+    def _number(record: Dict[str, Any], field: str) -> Optional[float]:
+        """Get a numeric field of a listing, or None if it is missing or not a number."""
+        value = record.get(field)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value != value:
+            return None
+        return value
+    
+    def _image_hash(self, record: Dict[str, Any]) -> Optional[int]:
+        """Get the average hash of the first stored image of a listing."""
+        paths = record.get("image_paths") or []
+        if not paths:
+            return None
+        
+        # Stored images are content-addressed, so a path is only hashed once
+        path = paths[0]
+        if path not in self._image_hashes:
+            self._image_hashes[path] = average_hash(path)
+        return self._image_hashes[path]
+    
+    @staticmethod
+    def _tokens(record: Dict[str, Any]) -> Set[str]:
+        """Get the set of text tokens of a listing."""
+        parts = []
+        for field in TEXT_FIELDS:
+            value = record.get(field)
+            if isinstance(value, str):
+                parts.append(value)
+            elif isinstance(value, (list, tuple)):
+                parts.extend(str(item) for item in value)
+        return set(tokenize(" ".join(parts)))
@@ -0,0 +1,195 @@
+"""
+Parallel processing module.
+
+This module runs the vectorized process and validate stages on chunks of a
+large DataFrame in a process pool, so backfills scale with the number of
+cores. Chunks travel between processes as single columnar buffers, Arrow IPC
+streams when pyarrow is installed and pickled DataFrames otherwise, instead
+of lists of dictionaries.
+"""
+
+import logging
+import math
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ..validators.car_validator import CarValidator
+from .car_processor import CarProcessor
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Serialization formats of the chunks
+ARROW_FORMAT = "arrow"
+PICKLE_FORMAT = "pickle"
+
+
+def encode_frame(frame: pd.DataFrame) -> Tuple[str, bytes]:
+    """
+    Serialize a DataFrame into a single buffer.
+    
+    Arrow IPC is used when pyarrow is installed and the columns have Arrow types;
+    columns mixing types, e.g. numbers and strings, fall back to pickle.
+    
+    Args:
+        frame: DataFrame to serialize
+    
+    Returns:
+        Tuple of the format name and the serialized buffer
+    """
+    if pa is not None:
+        try:
+            table = pa.Table.from_pandas(frame, preserve_index=True)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return ARROW_FORMAT, sink.getvalue().to_pybytes()
+        except (pa.ArrowException, TypeError, ValueError):
+            pass
+    
+    return PICKLE_FORMAT, pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode_frame(payload: Tuple[str, bytes]) -> pd.DataFrame:
+    """
+    Deserialize a DataFrame serialized with ``encode_frame``.
+    
+    Nested Arrow columns, e.g. lists of features or images, are rebuilt as
+    Python lists and dictionaries, as pandas would return numpy arrays for them.
+    
+    Args:
+        payload: Tuple of the format name and the serialized buffer
+    
+    Returns:
+        The DataFrame
+    """
+    format_name, buffer = payload
+    if format_name == ARROW_FORMAT:
+        table = pa.ipc.open_stream(pa.py_buffer(buffer)).read_all()
+        frame = table.to_pandas()
+        for field in table.schema:
+            if pa.types.is_nested(field.type) and field.name in frame:
+                frame[field.name] = pd.Series(table.column(field.name).to_pylist(), index=frame.index, dtype=object)
+        return frame
+    return pickle.loads(buffer)
+
+
+def frame_to_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert a DataFrame to car dictionaries, dropping missing values.
+    
+    Args:
+        frame: DataFrame with one car per row
+    
+    Returns:
+        List of car dictionaries without the keys whose value is missing
+    """
+    return [
+        {key: value for key, value in record.items() if not _is_missing(value)}
+        for record in frame.to_dict("records")
+    ]
+
+
+def _is_missing(value: Any) -> bool:
+    """Check whether a scalar value stands for an absent key."""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _process_chunk(
+    processor: CarProcessor,
+    validator: CarValidator,
+    payload: Tuple[str, bytes],
+) -> Tuple[Tuple[str, bytes], Tuple[str, bytes], Dict[str, int]]:
+    """
+    Process and validate one chunk in a worker process.
+    
+    Args:
+        processor: Car processor
+        validator: Car validator
+        payload: Serialized chunk
+    
+    Returns:
+        Tuple of the serialized valid rows, the serialized invalid rows and the
+        rejection counts per rule
+    """
+    processed = processor.process_frame(decode_frame(payload))
+    valid, invalid, counts = validator.validate_frame(processed)
+    return encode_frame(valid), encode_frame(invalid), counts
+
+
+class ParallelFrameExecutor:
+    """
+    Executor running the process and validate stages on chunks in parallel.
+    
+    The frame is split into contiguous chunks that are processed and validated
+    in a process pool; the results are reassembled in the original row order.
+    Frames of a single chunk are handled in the calling process.
+    """
+    
+    def __init__(
+        self,
+        processor: Optional[CarProcessor] = None,
+        validator: Optional[CarValidator] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 50000,
+    ):
+        """
+        Initialize the executor.
+        
+        Args:
+            processor: Car processor; must be picklable
+            validator: Car validator; must be picklable
+            max_workers: Number of worker processes (default: number of CPUs)
+            chunk_size: Maximum number of rows per chunk
+        """
+        self.processor = processor or CarProcessor()
+        self.validator = validator or CarValidator()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+    
+    def run(self, frame: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, int]]:
+        """
+        Process and validate a frame.
+        
+        Args:
+            frame: DataFrame with one car per row
+        
+        Returns:
+            Tuple containing the valid rows, the invalid rows with a ``reason``
+            column, and the number of rows rejected by each rule, as returned by
+            ``CarValidator.validate_frame``
+        """
+        chunks = [frame.iloc[start:start + self.chunk_size] for start in range(0, len(frame), self.chunk_size)]
+        
+        if self.max_workers <= 1 or len(chunks) <= 1:
+            return self.validator.validate_frame(self.processor.process_frame(frame))
+        
+        valid_chunks = []
+        invalid_chunks = []
+        counts: Dict[str, int] = {}
+        
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+            futures = [
+                executor.submit(_process_chunk, self.processor, self.validator, encode_frame(chunk))
+                for chunk in chunks
+            ]
+            
+            # Gather results in chunk order so the rows keep their original order
+            for future in futures:
+                valid, invalid, chunk_counts = future.result()
+                valid_chunks.append(decode_frame(valid))
+                invalid_chunks.append(decode_frame(invalid))
+                for reason, count in chunk_counts.items():
+                    counts[reason] = counts.get(reason, 0) + count
+        
+        logger.info(f"Processed {len(frame)} rows in {len(chunks)} chunks on {self.max_workers} workers")
+        return pd.concat(valid_chunks), pd.concat(invalid_chunks), counts
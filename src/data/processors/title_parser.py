@@ -0,0 +1,243 @@
+"""
+Title parser module.
+
+This module resolves listing titles to catalog brands, models and versions.
+Catalog names are compiled into token tries, so multi-word names such as
+"Land Rover" or "Mercedes-Benz" are matched as a whole and each title is
+resolved in a single pass over its tokens, whatever the size of the catalog.
+"""
+
+import logging
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from services.lru_cache import LRUCache
+except ImportError:
+    from src.services.lru_cache import LRUCache
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Fields set on a car from the catalog
+CATALOG_FIELDS = ["brand", "brand_id", "model", "model_id", "version", "version_id"]
+
+# Tokens of normalized titles and catalog names, keeping decimals like "2.0" whole
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+
+# Key of the catalog entry stored at the node ending a name; never a token
+TERMINAL = ""
+
+# A catalog entry: ID, canonical name and parent ID
+Entry = Tuple[Any, str, Any]
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase tokens without accents or punctuation.
+    
+    Args:
+        text: Title or catalog name
+    
+    Returns:
+        List of tokens
+    """
+    normalized = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return TOKEN_PATTERN.findall(normalized.lower())
+
+
+class TokenTrie:
+    """
+    Trie of catalog names keyed by token.
+    
+    Names are matched by walking the title tokens down the trie, so a lookup
+    costs at most the number of tokens of the longest name.
+    """
+    
+    def __init__(self, entries: Iterable[Entry] = ()):
+        """
+        Initialize the trie.
+        
+        Args:
+            entries: Catalog entries; the first entry of a duplicated name wins
+        """
+        self.root: Dict[str, Any] = {}
+        for entry in entries:
+            self.add(entry)
+    
+    def add(self, entry: Entry) -> None:
+        """
+        Add a catalog entry.
+        
+        Args:
+            entry: Catalog entry
+        """
+        tokens = tokenize(entry[1])
+        if not tokens:
+            return
+        
+        node = self.root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(TERMINAL, entry)
+    
+    def find(self, tokens: List[str], start: int = 0) -> Optional[Tuple[Entry, int]]:
+        """
+        Find the first name in the tokens, preferring the longest at a position.
+        
+        Args:
+            tokens: Title tokens
+            start: Position to search from
+        
+        Returns:
+            Tuple of the matched entry and the position after it, or None
+        """
+        for position in range(start, len(tokens)):
+            match = None
+            node = self.root
+            for end in range(position, len(tokens)):
+                node = node.get(tokens[end])
+                if node is None:
+                    break
+                if TERMINAL in node:
+                    match = (node[TERMINAL], end + 1)
+            
+            if match:
+                return match
+        
+        return None
+
+
+class TitleParser:
+    """
+    Parser resolving titles to catalog brands, models and versions.
+    
+    The brand is searched first, then a model of that brand after it, then a
+    version of that model after the model. Titles without a known brand are
+    matched against the models whose name is unique across brands. Results
+    are kept in an LRU cache since many listings share the same title.
+    """
+    
+    def __init__(
+        self,
+        brands: pd.DataFrame,
+        models: pd.DataFrame,
+        versions: pd.DataFrame,
+        cache_size: int = 4096,
+    ):
+        """
+        Initialize the parser.
+        
+        Args:
+            brands: Brands with ``id`` and ``name`` columns
+            models: Models with ``id``, ``brand_id`` and ``name`` columns
+            versions: Versions with ``id``, ``model_id`` and ``name`` columns
+            cache_size: Maximum number of cached titles
+        """
+        self.cache_size = cache_size
+        self.brands = TokenTrie(self._entries(brands, None))
+        self.brand_names = {entry[0]: entry[1] for entry in self._entries(brands, None)}
+        
+        self.models: Dict[Any, TokenTrie] = {}
+        model_brands: Dict[str, set] = {}
+        for entry in self._entries(models, "brand_id"):
+            self.models.setdefault(entry[2], TokenTrie()).add(entry)
+            model_brands.setdefault(" ".join(tokenize(entry[1])), set()).add(entry[2])
+        
+        # Models sold by a single brand identify the brand on their own
+        self.unique_models = TokenTrie(
+            entry for entry in self._entries(models, "brand_id")
+            if len(model_brands[" ".join(tokenize(entry[1]))]) == 1
+        )
+        
+        self.versions: Dict[Any, TokenTrie] = {}
+        for entry in self._entries(versions, "model_id"):
+            self.versions.setdefault(entry[2], TokenTrie()).add(entry)
+        
+        self._cache = LRUCache(maxsize=cache_size, ttl=None)
+        logger.info(f"Compiled title parser from {len(self.brand_names)} brands")
+    
+    @classmethod
+    def from_db_manager(cls, db_manager: Optional[Any] = None, cache_size: int = 4096) -> "TitleParser":
+        """
+        Create a parser from the DBManager reference tables.
+        
+        Args:
+            db_manager: DBManager providing the catalog; defaults to the shared instance
+            cache_size: Maximum number of cached titles
+        
+        Returns:
+            The parser
+        """
+        if db_manager is None:
+            from ..db_manager import db_manager
+        
+        return cls(db_manager.brands, db_manager.models, db_manager.versions, cache_size)
+    
+    def parse(self, title: str) -> Dict[str, Any]:
+        """
+        Resolve a title to catalog entries.
+        
+        Args:
+            title: Listing title
+        
+        Returns:
+            Dictionary with the matched fields among ``CATALOG_FIELDS``; empty if
+            neither a brand nor a model was found
+        """
+        if not isinstance(title, str):
+            raise TypeError(f"Title must be a string, not {type(title).__name__}")
+        
+        return self._cache.get_or_set(title, lambda: self._parse(title))
+    
+    def _parse(self, title: str) -> Dict[str, Any]:
+        """Resolve a title to catalog entries without the cache."""
+        tokens = tokenize(title)
+        result: Dict[str, Any] = {}
+        
+        brand = self.brands.find(tokens)
+        if brand:
+            (brand_id, brand_name, _), end = brand
+            result.update(brand=brand_name, brand_id=brand_id)
+            model = self.models[brand_id].find(tokens, end) if brand_id in self.models else None
+        else:
+            model = self.unique_models.find(tokens)
+        
+        if model:
+            (model_id, model_name, brand_id), end = model
+            if not result and brand_id in self.brand_names:
+                result.update(brand=self.brand_names[brand_id], brand_id=brand_id)
+            result.update(model=model_name, model_id=model_id)
+            
+            version = self.versions[model_id].find(tokens, end) if model_id in self.versions else None
+            if version:
+                (version_id, version_name, _), _ = version
+                result.update(version=version_name, version_id=version_id)
+        
+        return result
+    
+    @staticmethod
+    def _entries(table: pd.DataFrame, parent: Optional[str]) -> List[Entry]:
+        """Get the catalog entries of a reference table."""
+        if table.empty:
+            return []
+        
+        parents = table[parent].tolist() if parent else [None] * len(table)
+        return [
+            (entry_id, name, parent_id)
+            for entry_id, name, parent_id in zip(table["id"].tolist(), table["name"].astype(str).tolist(), parents)
+        ]
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Drop the cache, which holds a lock, when the parser is pickled."""
+        state = self.__dict__.copy()
+        del state["_cache"]
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the parser with an empty cache."""
+        self.__dict__.update(state)
+        self._cache = LRUCache(maxsize=self.cache_size, ttl=None)
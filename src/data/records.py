@@ -0,0 +1,281 @@
+"""
+Listing records module.
+
+This module provides a compact in-memory representation of car listings.
+``ListingBatch`` keeps many listings as columns: numeric fields in float
+arrays, brand, model, source and other repeated strings as codes into shared
+category lists, and any other field in a per-row dictionary. Batches are used
+where listings cross a process boundary or are written as columns; the rest
+of the pipeline works on dictionaries.
+"""
+
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Numeric fields, kept as float64 with a bit telling whether the value was an int
+NUMERIC_FIELDS = [
+    "price",
+    "year",
+    "mileage",
+    "doors",
+    "seats",
+    "brand_id",
+    "model_id",
+    "version_id",
+    "price_per_mile",
+    "age",
+    "price_per_age",
+    "cluster_id",
+    "cluster_size",
+]
+
+# String fields with few distinct values, kept as codes into a category list
+CATEGORY_FIELDS = ["brand", "model", "version", "source", "color", "transmission", "fuel"]
+
+# Free text string fields
+TEXT_FIELDS = ["id", "title", "url"]
+
+# Fields stored in columns; any other field goes to the extra dictionary of a row
+FIELDS = NUMERIC_FIELDS + CATEGORY_FIELDS + TEXT_FIELDS
+
+# Kind of each column field
+FIELD_KINDS = {
+    **{name: "number" for name in NUMERIC_FIELDS},
+    **{name: "category" for name in CATEGORY_FIELDS},
+    **{name: "text" for name in TEXT_FIELDS},
+}
+
+# Bit of each column field in the presence masks
+FIELD_BITS = {name: 1 << index for index, name in enumerate(FIELDS)}
+
+# Largest integer a float64 represents exactly
+MAX_EXACT_INT = 2 ** 53
+
+
+def _fits_number(value: Any) -> bool:
+    """Check whether a value can be stored in a numeric column."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    return not isinstance(value, int) or abs(value) <= MAX_EXACT_INT
+
+
+class ListingBatch:
+    """
+    Struct-of-arrays batch of car listings.
+    
+    A presence bit per field keeps absent fields distinct from None, and an
+    integer bit per numeric field restores ints, so converting back yields the
+    original dictionaries. Missing and NaN numbers both come back as None.
+    """
+    
+    def __init__(
+        self,
+        numbers: Dict[str, np.ndarray],
+        codes: Dict[str, np.ndarray],
+        categories: Dict[str, List[str]],
+        texts: Dict[str, List[Optional[str]]],
+        present: np.ndarray,
+        integral: np.ndarray,
+        extra: List[Optional[Dict[str, Any]]],
+    ):
+        """
+        Initialize the batch from its columns; use ``from_records`` to build one.
+        
+        Args:
+            numbers: Float64 array of each numeric field, NaN where missing
+            codes: Int32 category codes of each category field, -1 where missing
+            categories: Distinct values of each category field
+            texts: Values of each text field
+            present: Mask of the fields present in each row
+            integral: Mask of the numeric fields holding an int in each row
+            extra: Other fields of each row, or None
+        """
+        self.numbers = numbers
+        self.codes = codes
+        self.categories = categories
+        self.texts = texts
+        self.present = present
+        self.integral = integral
+        self.extra = extra
+    
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]], keep_extra: bool = True) -> "ListingBatch":
+        """
+        Create a batch from car dictionaries.
+        
+        Values that do not fit the column of their field, e.g. a price given as
+        a string, are kept in the extra dictionary of their row.
+        
+        Args:
+            records: Car dictionaries
+            keep_extra: Whether to keep the fields without a column; dropping them
+                saves the memory of nested objects such as images and features
+        
+        Returns:
+            The batch
+        """
+        count = len(records)
+        numbers = {name: np.full(count, np.nan) for name in NUMERIC_FIELDS}
+        codes = {name: np.full(count, -1, dtype=np.int32) for name in CATEGORY_FIELDS}
+        categories: Dict[str, List[str]] = {name: [] for name in CATEGORY_FIELDS}
+        lookups: Dict[str, Dict[str, int]] = {name: {} for name in CATEGORY_FIELDS}
+        texts: Dict[str, List[Optional[str]]] = {name: [None] * count for name in TEXT_FIELDS}
+        present = np.zeros(count, dtype=np.uint32)
+        integral = np.zeros(count, dtype=np.uint32)
+        extra: List[Optional[Dict[str, Any]]] = [None] * count
+        
+        for row, record in enumerate(records):
+            row_present = 0
+            row_integral = 0
+            row_extra = None
+            
+            for name, value in record.items():
+                kind = FIELD_KINDS.get(name)
+                if kind == "number" and (value is None or _fits_number(value)):
+                    if value is not None:
+                        numbers[name][row] = value
+                        if isinstance(value, int):
+                            row_integral |= FIELD_BITS[name]
+                elif kind == "category" and (value is None or isinstance(value, str)):
+                    if value is not None:
+                        code = lookups[name].get(value)
+                        if code is None:
+                            code = lookups[name][value] = len(categories[name])
+                            categories[name].append(value)
+                        codes[name][row] = code
+                elif kind == "text" and (value is None or isinstance(value, str)):
+                    # Titles repeat across listings of the same trim
+                    texts[name][row] = sys.intern(value) if name == "title" and value else value
+                else:
+                    if keep_extra:
+                        if row_extra is None:
+                            row_extra = {}
+                        row_extra[name] = value
+                    continue
+                
+                row_present |= FIELD_BITS[name]
+            
+            present[row] = row_present
+            integral[row] = row_integral
+            extra[row] = row_extra
+        
+        return cls(numbers, codes, categories, texts, present, integral, extra)
+    
+    @classmethod
+    def concat(cls, batches: Sequence["ListingBatch"]) -> "ListingBatch":
+        """
+        Concatenate batches, merging their category lists.
+        
+        Args:
+            batches: Batches to concatenate
+        
+        Returns:
+            The concatenated batch
+        """
+        if not batches:
+            return cls.from_records([])
+        
+        codes = {}
+        categories = {}
+        for name in CATEGORY_FIELDS:
+            lookup: Dict[str, int] = {}
+            merged = []
+            for batch in batches:
+                mapping = np.array(
+                    [lookup.setdefault(value, len(lookup)) for value in batch.categories[name]] + [-1],
+                    dtype=np.int32,
+                )
+                # Missing values have code -1, which picks the trailing -1
+                merged.append(mapping[batch.codes[name]])
+            codes[name] = np.concatenate(merged)
+            categories[name] = list(lookup)
+        
+        return cls(
+            {name: np.concatenate([batch.numbers[name] for batch in batches]) for name in NUMERIC_FIELDS},
+            codes,
+            categories,
+            {name: [value for batch in batches for value in batch.texts[name]] for name in TEXT_FIELDS},
+            np.concatenate([batch.present for batch in batches]),
+            np.concatenate([batch.integral for batch in batches]),
+            [row_extra for batch in batches for row_extra in batch.extra],
+        )
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        Convert the batch to car dictionaries.
+        
+        Returns:
+            List of car dictionaries
+        """
+        return list(self)
+    
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Convert the column fields to a DataFrame for vectorized processing.
+        
+        Only fields present in at least one row become columns; missing values
+        are NaN and category fields are pandas categoricals. Extra fields are
+        left out.
+        
+        Returns:
+            DataFrame with one listing per row
+        """
+        columns = {}
+        for name in FIELDS:
+            bit = FIELD_BITS[name]
+            if not (self.present & bit).any():
+                continue
+            
+            if name in self.numbers:
+                columns[name] = self.numbers[name]
+            elif name in self.codes:
+                columns[name] = pd.Categorical.from_codes(self.codes[name], self.categories[name])
+            else:
+                columns[name] = pd.Series(self.texts[name], dtype=object)
+        
+        return pd.DataFrame(columns, index=pd.RangeIndex(len(self)))
+    
+    def _records(self, start: int, stop: int) -> Iterator[Dict[str, Any]]:
+        """Build the car dictionaries of a range of rows from column-wise lists."""
+        columns = []
+        for name in FIELDS:
+            if name in self.numbers:
+                values = self.numbers[name][start:stop].tolist()
+            elif name in self.codes:
+                names = self.categories[name] + [None]
+                # Missing values have code -1, which picks the trailing None
+                values = [names[code] for code in self.codes[name][start:stop].tolist()]
+            else:
+                values = self.texts[name][start:stop]
+            columns.append((name, FIELD_BITS[name], values, name in self.numbers))
+        
+        present = self.present[start:stop].tolist()
+        integral = self.integral[start:stop].tolist()
+        
+        for offset, row_present in enumerate(present):
+            record = {}
+            for name, bit, values, numeric in columns:
+                if row_present & bit:
+                    value = values[offset]
+                    if numeric:
+                        if value != value:
+                            value = None
+                        elif integral[offset] & bit:
+                            value = int(value)
+                    record[name] = value
+            
+            row_extra = self.extra[start + offset]
+            if row_extra:
+                record.update(row_extra)
+            yield record
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over the car dictionaries of the rows."""
+        return self._records(0, len(self))
+    
+    def __len__(self) -> int:
+        """Return the number of listings."""
+        return len(self.present)
@@ -1,11 +1,17 @@
 """
 Car validator module.
 
-This module implements a validator for car data.
+This module implements a validator for car data. Records can be validated one
+at a time with ``validate`` or as pandas columns with ``validate_frame``, which
+evaluates every rule as a boolean mask and records why each row was rejected.
 """
 
 import logging
-from typing import Any, Dict, List, Tuple
+import numbers
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -63,6 +69,80 @@ class CarValidator:
         logger.info(f"Validated {len(data)} items: {len(valid_data)} valid, {len(invalid_data)} invalid")
         return valid_data, invalid_data
     
+    def validate_frame(self, frame: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, int]]:
+        """
+        Validate car data held in a DataFrame with vectorized column operations.
+        
+        The rules are the same as ``validate`` applied to the records of the frame,
+        where a missing value (NaN/None) stands for an absent key. Rules are
+        evaluated in order and each rejected row is attributed to the first rule
+        it fails, so the counts add up to the number of invalid rows. Reason codes
+        are ``missing_<field>``, ``<field>_not_numeric``, ``<field>_below_min`` and
+        ``<field>_above_max``.
+        
+        Args:
+            frame: DataFrame with one car per row
+            
+        Returns:
+            Tuple containing the valid rows, the invalid rows with a ``reason``
+            column, and the number of rows rejected by each rule
+        """
+        pending = np.ones(len(frame), dtype=bool)
+        reasons = np.full(len(frame), None, dtype=object)
+        counts = {}
+        
+        for reason, failed in self._frame_rules(frame):
+            rejected = pending & failed
+            reasons[rejected] = reason
+            counts[reason] = int(rejected.sum())
+            pending &= ~rejected
+        
+        valid = frame[pending]
+        invalid = frame[~pending].assign(reason=reasons[~pending])
+        
+        rejections = ", ".join(f"{reason}={count}" for reason, count in counts.items() if count)
+        logger.info(
+            f"Validated {len(frame)} rows: {len(valid)} valid, {len(invalid)} invalid"
+            + (f" ({rejections})" if rejections else "")
+        )
+        return valid, invalid, counts
+    
+    def _frame_rules(self, frame: pd.DataFrame) -> Iterator[Tuple[str, np.ndarray]]:
+        """
+        Evaluate the validation rules of a frame in order.
+        
+        Args:
+            frame: DataFrame with one car per row
+            
+        Yields:
+            Tuples of the reason code of a rule and the mask of the rows failing it
+        """
+        # Check for required fields
+        for field in self.required_fields:
+            if field in frame:
+                yield f"missing_{field}", frame[field].isna().to_numpy()
+            else:
+                yield f"missing_{field}", np.ones(len(frame), dtype=bool)
+        
+        # Check field constraints
+        for field, constraints in self.constraints.items():
+            if field not in frame:
+                continue
+            
+            column = frame[field]
+            if not pd.api.types.is_numeric_dtype(column):
+                # Strings are not coerced, as they cannot be compared with the bounds
+                is_number = column.map(lambda value: isinstance(value, numbers.Real)).astype(bool)
+                yield f"{field}_not_numeric", (column.notna() & ~is_number).to_numpy()
+                column = pd.to_numeric(column.where(is_number), errors="coerce")
+            
+            # Missing values compare as False, so they are skipped like absent keys
+            if "min" in constraints:
+                yield f"{field}_below_min", (column < constraints["min"]).to_numpy()
+            
+            if "max" in constraints:
+                yield f"{field}_above_max", (column > constraints["max"]).to_numpy()
+    
     def _validate_item(self, item: Dict[str, Any]) -> bool:
         """
         Validate a single car item.
@@ -73,15 +153,15 @@ class CarValidator:
         Returns:
             True if the item is valid, False otherwise
         """
-        # Check for required fields
+        # Check for required fields; None stands for a missing value, as in validate_frame
         for field in self.required_fields:
-            if field not in item:
+            if item.get(field) is None:
                 logger.warning(f"Missing required field: {field}")
                 return False
         
         # Check field constraints
         for field, constraints in self.constraints.items():
-            if field in item:
+            if item.get(field) is not None:
                 value = item[field]
                 
                 # Check minimum value
@@ -0,0 +1,42 @@
+"""
+File utilities module.
+
+This module provides the atomic file write shared by the on-disk caches and
+state files, so a crash or a concurrent reader never sees a partial file.
+"""
+
+import os
+import tempfile
+from typing import Optional
+
+
+def atomic_write(path: str, data: bytes, mode: Optional[int] = None) -> None:
+    """
+    Write a file atomically.
+
+    The data is written to a temporary file in the same directory, which is then
+    renamed over the target. Missing parent directories are created.
+
+    Args:
+        path: Path of the file
+        data: Content of the file
+        mode: Optional permission bits of the file, e.g. 0o600 for secrets
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
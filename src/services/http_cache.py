@@ -0,0 +1,296 @@
+"""
+HTTP response cache module.
+
+This module provides an on-disk cache for HTTP responses shared by the API
+clients and collectors. Entries expire after a TTL and are revalidated with
+ETag/Last-Modified when the server supports it. The cache is size-bounded and
+evicts the least recently used entries first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .file_utils import atomic_write
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Response headers kept with cached entries
+STORED_HEADERS = ["Content-Type", "ETag", "Last-Modified", "Cache-Control", "Date"]
+
+
+class HTTPCache:
+    """
+    On-disk HTTP response cache with conditional revalidation.
+    
+    Only GET requests with a 200 response are cached. Each entry is stored as a
+    body file plus a small JSON metadata file, keyed by method, URL and params.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: str = "data/cache/http",
+        ttl: float = 3600.0,
+        max_bytes: int = 256 * 1024 * 1024,
+        stale_if_error: bool = False,
+    ):
+        """
+        Initialize the HTTP cache.
+        
+        Args:
+            cache_dir: Directory where cached responses are stored
+            ttl: Seconds during which an entry is served without contacting the server
+            max_bytes: Maximum total size of the cached bodies
+            stale_if_error: Whether to serve a stale entry when revalidation fails
+                with a connection error
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stale_if_error = stale_if_error
+        self._lock = threading.Lock()
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._size = sum(size for _, size, _ in self._scan())
+    
+    def request(
+        self,
+        session: requests.Session,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        before_request: Optional[Callable[[], Any]] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Make a request through the cache.
+        
+        Fresh entries are returned without a network call. Stale entries are
+        revalidated with a conditional request and reused on a 304 response.
+        
+        Args:
+            session: Session used for requests that reach the server
+            method: HTTP method
+            url: Request URL
+            params: Query parameters
+            headers: Request headers
+            before_request: Function called right before a request goes to the
+                server, e.g. to wait for a rate limiter; not called on cache hits
+            kwargs: Extra arguments passed to ``session.request``
+        
+        Returns:
+            The response, served from the cache when possible
+        """
+        if method.upper() != "GET":
+            if before_request:
+                before_request()
+            return session.request(method=method, url=url, params=params, headers=headers, **kwargs)
+        
+        key = self.make_key(method, url, params)
+        entry = self._load(key)
+        
+        if entry and time.time() - entry["stored_at"] < self.ttl:
+            logger.debug(f"Cache hit for {url}")
+            self._touch(key)
+            return self._build_response(entry)
+        
+        request_headers = dict(headers or {})
+        if entry:
+            if entry["headers"].get("ETag"):
+                request_headers["If-None-Match"] = entry["headers"]["ETag"]
+            if entry["headers"].get("Last-Modified"):
+                request_headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        
+        if before_request:
+            before_request()
+        
+        try:
+            response = session.request(method=method, url=url, params=params, headers=request_headers, **kwargs)
+        except requests.RequestException as e:
+            if not (entry and self.stale_if_error):
+                raise
+            logger.warning(f"Serving stale cache entry for {url} after error: {e}")
+            return self._build_response(entry)
+        
+        if response.status_code == 304 and entry:
+            logger.debug(f"Cache revalidated for {url}")
+            entry["stored_at"] = time.time()
+            self._write_meta(key, entry)
+            self._touch(key)
+            return self._build_response(entry)
+        
+        if response.status_code == 200:
+            self._store(key, response)
+        
+        return response
+    
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the cache key of a request.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            params: Query parameters
+        
+        Returns:
+            Hex digest identifying the request
+        """
+        raw = json.dumps([method.upper(), url, params or {}], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            for path, _, _ in self._scan():
+                self._remove(path)
+            self._size = 0
+    
+    @property
+    def size(self) -> int:
+        """Return the total size of the cached bodies in bytes."""
+        return self._size
+    
+    def _paths(self, key: str) -> Tuple[str, str]:
+        """Get the body and metadata paths of an entry."""
+        directory = os.path.join(self.cache_dir, key[:2])
+        return os.path.join(directory, f"{key}.body"), os.path.join(directory, f"{key}.json")
+    
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached entry.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            The entry metadata with its body, or None if it is not cached
+        """
+        body_path, meta_path = self._paths(key)
+        
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            with open(body_path, "rb") as f:
+                entry["body"] = f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring corrupt cache entry {key}: {e}")
+            return None
+        
+        return entry
+    
+    def _store(self, key: str, response: requests.Response) -> None:
+        """
+        Store a response in the cache.
+        
+        Args:
+            key: Cache key
+            response: Response to store
+        """
+        body_path, _ = self._paths(key)
+        body = response.content
+        entry = {
+            "url": response.url,
+            "status_code": response.status_code,
+            "encoding": response.encoding,
+            "headers": {name: response.headers[name] for name in STORED_HEADERS if name in response.headers},
+            "stored_at": time.time(),
+        }
+        
+        try:
+            previous_size = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+            atomic_write(body_path, body)
+            self._write_meta(key, entry)
+        except OSError as e:
+            logger.warning(f"Failed to cache response for {response.url}: {e}")
+            return
+        
+        with self._lock:
+            self._size += len(body) - previous_size
+            if self._size > self.max_bytes:
+                self._evict()
+    
+    def _write_meta(self, key: str, entry: Dict[str, Any]) -> None:
+        """Write the metadata file of an entry."""
+        _, meta_path = self._paths(key)
+        meta = {name: value for name, value in entry.items() if name != "body"}
+        atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+    
+    def _touch(self, key: str) -> None:
+        """Mark an entry as recently used."""
+        body_path, _ = self._paths(key)
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+    
+    def _scan(self) -> List[Tuple[str, int, float]]:
+        """
+        List the cached bodies.
+        
+        Returns:
+            A list of (path, size, last used time) tuples
+        """
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for filename in files:
+                if filename.endswith(".body"):
+                    path = os.path.join(root, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+    
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache is below 90% of its limit."""
+        target = self.max_bytes * 0.9
+        
+        for path, size, _ in sorted(self._scan(), key=lambda entry: entry[2]):
+            if self._size <= target:
+                break
+            self._remove(path)
+            self._size -= size
+            logger.debug(f"Evicted cache entry {path}")
+    
+    @staticmethod
+    def _remove(body_path: str) -> None:
+        """Remove the body and metadata files of an entry."""
+        for path in [body_path, body_path[: -len(".body")] + ".json"]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    @staticmethod
+    def _build_response(entry: Dict[str, Any]) -> requests.Response:
+        """
+        Build a response object from a cached entry.
+        
+        Args:
+            entry: Cached entry with its body
+        
+        Returns:
+            The cached response
+        """
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        response.url = entry["url"]
+        response.encoding = entry["encoding"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["body"]
+        response.from_cache = True
+        return response
@@ -0,0 +1,103 @@
+"""
+In-memory LRU cache module.
+
+This module provides a small thread-safe LRU cache with per-entry expiry, used
+to memoize expensive API calls within a process.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache whose entries expire after a TTL.
+    
+    The least recently used entry is evicted once ``maxsize`` entries are stored.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 3600.0):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries
+            ttl: Seconds an entry stays valid, or None for entries that never expire
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Key -> (expiry time, value), least recently used first
+        self._entries: OrderedDict = OrderedDict()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value.
+        
+        Args:
+            key: Cache key
+            default: Value returned if the key is missing or expired
+        
+        Returns:
+            The cached value, or ``default``
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (self.ttl is not None and time.monotonic() - entry[0] >= self.ttl):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return default
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry if the cache is full.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def get_or_set(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Get a cached value, computing and storing it on a miss.
+        
+        ``None`` results are not cached so failed calls are retried next time.
+        
+        Args:
+            key: Cache key
+            compute: Function computing the value
+        
+        Returns:
+            The cached or computed value
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        
+        value = compute()
+        if value is not None:
+            self.set(key, value)
+        return value
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        """Return the number of stored entries, including expired ones not yet evicted."""
+        return len(self._entries)
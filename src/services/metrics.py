@@ -0,0 +1,265 @@
+"""
+HTTP client metrics module.
+
+This module records per-endpoint request counts, status codes, response sizes
+and latency histograms for the API clients. Snapshots are plain dictionaries so
+they can cross process boundaries, and can be exported as JSON or as a
+Prometheus text file.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+# Percentiles reported in snapshots
+PERCENTILES = [0.5, 0.95, 0.99]
+
+
+def percentile_from_buckets(
+    bounds: List[float],
+    counts: List[int],
+    q: float,
+    max_value: Optional[float] = None,
+) -> Optional[float]:
+    """
+    Estimate a percentile from histogram buckets.
+    
+    The value is interpolated linearly inside the bucket holding the percentile.
+    
+    Args:
+        bounds: Upper bounds of the finite buckets
+        counts: Observations per bucket, with one extra overflow bucket at the end
+        q: Percentile between 0 and 1
+        max_value: Largest observed value, used as the upper bound of the overflow bucket
+    
+    Returns:
+        The estimated percentile, or None if there are no observations
+    """
+    total = sum(counts)
+    if not total:
+        return None
+    
+    rank = q * total
+    cumulative = 0
+    for index, count in enumerate(counts):
+        if not count or cumulative + count < rank:
+            cumulative += count
+            continue
+        
+        lower = bounds[index - 1] if index > 0 else 0.0
+        if index < len(bounds):
+            upper = bounds[index]
+        else:
+            upper = max_value if max_value is not None else lower
+        if max_value is not None:
+            upper = min(upper, max_value)
+        
+        return lower + (upper - lower) * (rank - cumulative) / count
+    
+    return max_value
+
+
+class ClientMetrics:
+    """
+    Thread-safe per-endpoint metrics of an HTTP client.
+    
+    Each request is recorded with its endpoint label, status code, latency and
+    response size. Failures without a response are counted under the ``error``
+    status.
+    """
+    
+    def __init__(self, buckets: Optional[List[float]] = None):
+        """
+        Initialize the metrics.
+        
+        Args:
+            buckets: Upper bounds in seconds of the latency histogram buckets
+        """
+        self.buckets = sorted(buckets or LATENCY_BUCKETS)
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+        self._gauges: Dict[str, float] = {}
+        self._started_at = time.monotonic()
+    
+    def record(
+        self,
+        endpoint: str,
+        status_code: Optional[int],
+        latency: float,
+        size: int = 0,
+        cached: bool = False,
+    ) -> None:
+        """
+        Record a request.
+        
+        Args:
+            endpoint: Endpoint label, e.g. ``catalog/vehicle``
+            status_code: HTTP status code, or None if the request failed without a response
+            latency: Request latency in seconds
+            size: Size of the response body in bytes
+            cached: Whether the response was served from a local cache
+        """
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = {
+                    "requests": 0,
+                    "cache_hits": 0,
+                    "status_codes": {},
+                    "bytes": 0,
+                    "latency_sum": 0.0,
+                    "latency_max": 0.0,
+                    "latency_buckets": [0] * (len(self.buckets) + 1),
+                }
+            
+            status = str(status_code) if status_code is not None else "error"
+            stats["requests"] += 1
+            stats["cache_hits"] += int(cached)
+            stats["status_codes"][status] = stats["status_codes"].get(status, 0) + 1
+            stats["bytes"] += size
+            stats["latency_sum"] += latency
+            stats["latency_max"] = max(stats["latency_max"], latency)
+            stats["latency_buckets"][self._bucket_index(latency)] += 1
+    
+    def set_gauge(self, name: str, value: float) -> None:
+        """
+        Set the current value of a gauge.
+        
+        Args:
+            name: Gauge name, e.g. ``concurrency_window``
+            value: Current value
+        """
+        with self._lock:
+            self._gauges[name] = value
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Take a snapshot of the metrics.
+        
+        Returns:
+            Dictionary with the elapsed time, gauges and per-endpoint statistics,
+            including throughput and latency percentiles
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._started_at
+            endpoints = {}
+            for endpoint, stats in sorted(self._endpoints.items()):
+                endpoints[endpoint] = {
+                    **stats,
+                    "status_codes": dict(stats["status_codes"]),
+                    "latency_buckets": list(stats["latency_buckets"]),
+                    "throughput": stats["requests"] / elapsed if elapsed > 0 else 0.0,
+                    "latency_percentiles": {
+                        f"p{int(q * 100)}": percentile_from_buckets(
+                            self.buckets, stats["latency_buckets"], q, stats["latency_max"]
+                        )
+                        for q in PERCENTILES
+                    },
+                }
+            
+            return {
+                "elapsed": elapsed,
+                "buckets": list(self.buckets),
+                "gauges": dict(self._gauges),
+                "endpoints": endpoints,
+            }
+    
+    def _bucket_index(self, latency: float) -> int:
+        """Get the index of the histogram bucket holding a latency."""
+        for index, bound in enumerate(self.buckets):
+            if latency <= bound:
+                return index
+        return len(self.buckets)
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(snapshots: Dict[str, Dict[str, Any]], prefix: str = "http_client") -> str:
+    """
+    Render metrics snapshots in the Prometheus text exposition format.
+    
+    Args:
+        snapshots: Snapshots keyed by client name, used as the ``client`` label
+        prefix: Prefix of the metric names
+    
+    Returns:
+        The metrics as Prometheus text
+    """
+    families: Dict[str, Tuple[str, str, List[str]]] = {}
+    
+    def add(family: str, kind: str, help_text: str, labels: Dict[str, str], value: float, suffix: str = "") -> None:
+        name = f"{prefix}_{family}"
+        samples = families.setdefault(name, (kind, help_text, []))[2]
+        label_text = ",".join(f'{key}="{_escape_label(str(label))}"' for key, label in labels.items())
+        samples.append(f"{name}{suffix}{{{label_text}}} {value}")
+    
+    for client, snapshot in sorted(snapshots.items()):
+        for gauge, value in sorted(snapshot.get("gauges", {}).items()):
+            add(gauge, "gauge", f"Current {gauge.replace('_', ' ')}", {"client": client}, value)
+        
+        bounds = snapshot.get("buckets", LATENCY_BUCKETS)
+        for endpoint, stats in snapshot.get("endpoints", {}).items():
+            labels = {"client": client, "endpoint": endpoint}
+            
+            for status, count in sorted(stats["status_codes"].items()):
+                add("requests_total", "counter", "Requests by endpoint and status", {**labels, "status": status}, count)
+            add("cache_hits_total", "counter", "Requests served from the local cache", labels, stats["cache_hits"])
+            add("response_bytes_total", "counter", "Response body bytes received", labels, stats["bytes"])
+            
+            help_text = "Request latency in seconds"
+            cumulative = 0
+            for bound, count in zip(bounds + ["+Inf"], stats["latency_buckets"]):
+                cumulative += count
+                add("request_duration_seconds", "histogram", help_text, {**labels, "le": bound}, cumulative, "_bucket")
+            add("request_duration_seconds", "histogram", help_text, labels, stats["latency_sum"], "_sum")
+            add("request_duration_seconds", "histogram", help_text, labels, stats["requests"], "_count")
+    
+    lines = []
+    for name, (kind, help_text, samples) in families.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(samples)
+    
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(
+    snapshots: Dict[str, Dict[str, Any]],
+    output_dir: str,
+    basename: str = "metrics",
+) -> Tuple[str, str]:
+    """
+    Write metrics snapshots as a JSON file and a Prometheus text file.
+    
+    Args:
+        snapshots: Snapshots keyed by client name
+        output_dir: Directory where the files are written
+        basename: Base name of the files
+    
+    Returns:
+        Paths of the JSON and Prometheus files
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    json_path = os.path.join(output_dir, f"{basename}.json")
+    prom_path = os.path.join(output_dir, f"{basename}.prom")
+    
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(snapshots, f, indent=2)
+    
+    with open(prom_path, "w", encoding="utf-8") as f:
+        f.write(to_prometheus(snapshots))
+    
+    logger.info(f"Saved client metrics to {json_path} and {prom_path}")
+    return json_path, prom_path
@@ -0,0 +1,7 @@
+"""
+Offline testing tools package.
+
+This package provides a record/replay HTTP layer and a local stand-in server for
+the Webmotors API and cars.com, used to run and benchmark the collectors without
+credentials or network access.
+"""
@@ -0,0 +1,215 @@
+"""
+HTTP record/replay module.
+
+This module provides a requests transport adapter that records HTTP interactions
+to a JSON cassette file and replays them later without network access.
+"""
+
+import base64
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Recording modes
+MODES = ["record", "replay"]
+
+# Headers that no longer apply once the body has been decoded
+DROPPED_HEADERS = ["Content-Encoding", "Transfer-Encoding", "Content-Length", "Connection"]
+
+
+class CassetteMissError(requests.ConnectionError):
+    """Raised when a replayed request has no recorded interaction."""
+
+
+class CassetteAdapter(HTTPAdapter):
+    """
+    Transport adapter that records or replays HTTP interactions.
+    
+    Requests are matched on method, URL and body. Repeated requests are replayed
+    in the order they were recorded, and the last recording is reused once they
+    are exhausted.
+    """
+    
+    def __init__(self, path: str, mode: str = "replay", **kwargs: Any):
+        """
+        Initialize the cassette adapter.
+        
+        Args:
+            path: JSON file holding the recorded interactions
+            mode: "record" to call the server and store responses, "replay" to serve them
+            kwargs: Extra arguments passed to ``HTTPAdapter``
+        """
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        
+        super().__init__(**kwargs)
+        self.path = path
+        self.mode = mode
+        self.interactions: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._played: Dict[Tuple[str, str, str], int] = {}
+        self._recorded: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+        
+        if mode == "replay":
+            with open(path, "r", encoding="utf-8") as f:
+                self.interactions = json.load(f)["interactions"]
+            
+            for interaction in self.interactions:
+                key = self._match_key(**self._decoded_request(interaction))
+                self._recorded.setdefault(key, []).append(interaction["response"])
+    
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        """
+        Send a request, recording or replaying its response.
+        
+        Args:
+            request: The prepared request
+            kwargs: Extra arguments passed to ``HTTPAdapter.send``
+        
+        Returns:
+            The recorded or live response
+        """
+        key = self._match_key(request.method, request.url, request.body)
+        
+        if self.mode == "replay":
+            return self._replay(request, key)
+        
+        response = super().send(request, **kwargs)
+        interaction = {
+            "request": {
+                "method": request.method,
+                "url": request.url,
+                "body": self._encode_body(request.body),
+            },
+            "response": {
+                "status_code": response.status_code,
+                "reason": response.reason,
+                "headers": {
+                    name: value for name, value in response.headers.items()
+                    if name not in DROPPED_HEADERS
+                },
+                "body": self._encode_body(response.content),
+            },
+        }
+        
+        with self._lock:
+            self.interactions.append(interaction)
+        
+        return response
+    
+    def save(self) -> None:
+        """Write the recorded interactions to the cassette file."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        
+        with self._lock, open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"interactions": self.interactions}, f, indent=2)
+        
+        logger.info(f"Saved {len(self.interactions)} interactions to {self.path}")
+    
+    def _replay(self, request: requests.PreparedRequest, key: Tuple[str, str, str]) -> requests.Response:
+        """
+        Build the response of a recorded interaction.
+        
+        Args:
+            request: The prepared request
+            key: Match key of the request
+        
+        Returns:
+            The recorded response
+        """
+        matches = self._recorded.get(key)
+        if not matches:
+            raise CassetteMissError(f"No recorded interaction for {request.method} {request.url}")
+        
+        with self._lock:
+            index = self._played.get(key, 0)
+            self._played[key] = index + 1
+        
+        recorded = matches[min(index, len(matches) - 1)]
+        
+        response = requests.Response()
+        response.status_code = recorded["status_code"]
+        response.reason = recorded["reason"]
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = self._decode_body(recorded["body"])
+        response.url = request.url
+        response.request = request
+        return response
+    
+    @classmethod
+    def _decoded_request(cls, interaction: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the match arguments of a recorded request."""
+        recorded = interaction["request"]
+        return {
+            "method": recorded["method"],
+            "url": recorded["url"],
+            "body": cls._decode_body(recorded["body"]),
+        }
+    
+    @staticmethod
+    def _match_key(method: str, url: str, body: Any) -> Tuple[str, str, str]:
+        """Build the key used to match requests against recordings."""
+        if isinstance(body, bytes):
+            body = body.decode("utf-8", errors="replace")
+        return method.upper(), url, body or ""
+    
+    @staticmethod
+    def _encode_body(body: Any) -> Optional[Dict[str, str]]:
+        """Encode a body for JSON storage."""
+        if body is None:
+            return None
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        try:
+            return {"text": body.decode("utf-8")}
+        except UnicodeDecodeError:
+            return {"base64": base64.b64encode(body).decode("ascii")}
+    
+    @staticmethod
+    def _decode_body(body: Optional[Dict[str, str]]) -> Optional[bytes]:
+        """Decode a body stored by ``_encode_body``."""
+        if body is None:
+            return None
+        if "text" in body:
+            return body["text"].encode("utf-8")
+        return base64.b64decode(body["base64"])
+
+
+@contextmanager
+def use_cassette(session: requests.Session, path: str, mode: str = "replay") -> Iterator[CassetteAdapter]:
+    """
+    Record or replay the HTTP traffic of a session.
+    
+    Args:
+        session: Session whose traffic is recorded or replayed
+        path: JSON cassette file
+        mode: "record" or "replay"
+    
+    Yields:
+        The cassette adapter mounted on the session
+    """
+    adapter = CassetteAdapter(path, mode=mode)
+    previous = dict(session.adapters)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    
+    try:
+        yield adapter
+    finally:
+        session.adapters.clear()
+        session.adapters.update(previous)
+        if mode == "record":
+            adapter.save()
@@ -0,0 +1,385 @@
+"""
+Local stand-in server module.
+
+This module provides a threaded HTTP server that imitates the Webmotors API
+(``access-token``, ``catalog``, ``catalog/vehicle/{id}`` and
+``financing/simulation``) and the cars.com results pages. Latency, error rate
+and page counts are configurable so collectors can be benchmarked offline.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Vehicles served by the stub, as (brand, model, version) tuples
+CATALOG = [
+    ("Toyota", "Corolla", "2.0 XEi"),
+    ("Toyota", "Hilux", "2.8 SRX"),
+    ("Honda", "Civic", "2.0 EXL"),
+    ("Volkswagen", "Gol", "1.0 MPI"),
+    ("Fiat", "Uno", "1.0 Way"),
+    ("Chevrolet", "Onix", "1.0 LT"),
+    ("Hyundai", "HB20", "1.6 Comfort"),
+    ("Jeep", "Compass", "2.0 Longitude"),
+]
+
+STATES = ["SP", "RJ", "MG", "PR", "RS", "SC", "BA", "GO"]
+
+COLORS = ["Branco", "Preto", "Prata", "Cinza", "Vermelho", "Azul"]
+
+
+class StubServer:
+    """
+    Local stand-in for the Webmotors API and cars.com.
+    
+    Responses are generated deterministically from ``seed`` so runs are
+    reproducible. Use it as a context manager or call ``start``/``stop``.
+    """
+    
+    def __init__(
+        self,
+        pages: int = 3,
+        per_page: int = 10,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        token_expires_in: int = 3600,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize the stub server.
+        
+        Args:
+            pages: Number of catalog and results pages
+            per_page: Number of vehicles per page
+            latency: Seconds each response is delayed
+            error_rate: Probability of answering with a 503 error
+            seed: Seed for the generated data and errors
+            token_expires_in: Lifetime of issued access tokens in seconds
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free port
+        """
+        self.pages = pages
+        self.per_page = per_page
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seed = seed
+        self.token_expires_in = token_expires_in
+        self.requests: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = set()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        """Return the base URL of the server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    @property
+    def auth_url(self) -> str:
+        """Return the base URL of the OAuth endpoints."""
+        return f"{self.url}/oauth/v1"
+    
+    def start(self) -> "StubServer":
+        """Start serving requests in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Stub server listening on {self.url}")
+        return self
+    
+    def stop(self) -> None:
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+    
+    def __enter__(self) -> "StubServer":
+        """Start the server when entering the context."""
+        return self.start()
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        """Stop the server when leaving the context."""
+        self.stop()
+    
+    def vehicle(self, vehicle_id: int) -> Dict[str, Any]:
+        """
+        Generate the catalog entry of a vehicle.
+        
+        Args:
+            vehicle_id: ID of the vehicle
+        
+        Returns:
+            Catalog data of the vehicle
+        """
+        rng = random.Random(f"{self.seed}-{vehicle_id}")
+        brand, model, version = rng.choice(CATALOG)
+        year = rng.randint(2012, 2023)
+        return {
+            "id": str(vehicle_id),
+            "title": f"{brand} {model} {version} {year}",
+            "brand": brand,
+            "model": model,
+            "year": year,
+            "price": float(rng.randint(30, 250) * 1000),
+            "mileage": rng.randint(0, 180) * 1000,
+            "url": f"https://www.webmotors.com.br/comprar/{vehicle_id}",
+        }
+    
+    def vehicle_details(self, vehicle_id: int) -> Dict[str, Any]:
+        """
+        Generate the details of a vehicle.
+        
+        Args:
+            vehicle_id: ID of the vehicle
+        
+        Returns:
+            Vehicle details
+        """
+        rng = random.Random(f"{self.seed}-details-{vehicle_id}")
+        vehicle = self.vehicle(vehicle_id)
+        return {
+            "id": vehicle["id"],
+            "color": rng.choice(COLORS),
+            "transmission": rng.choice(["Manual", "Automática"]),
+            "fuel": rng.choice(["Flex", "Gasolina", "Diesel"]),
+            "doors": rng.choice([2, 4]),
+            "seats": 5,
+            "description": f"{vehicle['title']} em ótimo estado.",
+            "features": rng.sample(["Ar condicionado", "Direção elétrica", "Airbag", "ABS", "Multimídia"], 3),
+            "images": [f"https://image.webmotors.com.br/{vehicle_id}/{index}.jpg" for index in range(3)],
+            "seller": {"name": f"Loja {vehicle_id % 50}", "type": "Dealer"},
+            "location": {"city": "São Paulo", "state": rng.choice(STATES)},
+        }
+    
+    def catalog_page(self, page: int) -> Dict[str, Any]:
+        """
+        Generate a catalog page.
+        
+        Args:
+            page: Page number
+        
+        Returns:
+            Catalog page with its vehicles and pagination
+        """
+        vehicles = []
+        if 1 <= page <= self.pages:
+            first_id = (page - 1) * self.per_page + 1
+            vehicles = [self.vehicle(vehicle_id) for vehicle_id in range(first_id, first_id + self.per_page)]
+        
+        return {
+            "vehicles": vehicles,
+            "pagination": {"page": page, "totalPages": self.pages},
+        }
+    
+    def results_page(self, page: int) -> str:
+        """
+        Generate a cars.com results page.
+        
+        Args:
+            page: Page number
+        
+        Returns:
+            HTML of the results page
+        """
+        cards = []
+        for vehicle in self.catalog_page(page)["vehicles"]:
+            cards.append(
+                f'<div class="vehicle-card">'
+                f'<a href="/vehicledetail/{vehicle["id"]}/"><h2 class="title">{vehicle["year"]} {vehicle["brand"]} {vehicle["model"]}</h2></a>'
+                f'<span class="price">${vehicle["price"]:,.0f}</span>'
+                f'<span class="year">{vehicle["year"]}</span>'
+                f'<span class="mileage">{vehicle["mileage"]:,} mi.</span>'
+                f"</div>"
+            )
+        return f"<html><body><main>{''.join(cards)}</main></body></html>"
+    
+    def financing(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compute a financing simulation with a fixed monthly rate.
+        
+        Args:
+            data: Simulation request body
+        
+        Returns:
+            Simulation result
+        """
+        vehicle = self.vehicle(int(data["vehicleId"]))
+        principal = max(vehicle["price"] - float(data["downPayment"]), 0.0)
+        term = int(data["termMonths"])
+        rate = 0.0149
+        installment = principal * rate / (1 - (1 + rate) ** -term) if term else principal
+        return {
+            "vehicleId": vehicle["id"],
+            "vehiclePrice": vehicle["price"],
+            "downPayment": float(data["downPayment"]),
+            "termMonths": term,
+            "monthlyRate": rate,
+            "installmentValue": round(installment, 2),
+        }
+    
+    def _should_fail(self) -> bool:
+        """Decide whether the current request should fail."""
+        with self._lock:
+            return self._random.random() < self.error_rate
+    
+    def _issue_token(self) -> str:
+        """Issue a new access token."""
+        with self._lock:
+            token = f"stub-token-{len(self._tokens) + 1}"
+            self._tokens.add(token)
+            return token
+    
+    def _make_handler(self):
+        """Build the request handler class bound to this server."""
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            """Request handler dispatching to the stub endpoints."""
+            
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(format % args)
+            
+            def do_GET(self) -> None:
+                self._handle("GET")
+            
+            def do_POST(self) -> None:
+                self._handle("POST")
+            
+            def _handle(self, method: str) -> None:
+                parsed = urlparse(self.path)
+                path = parsed.path.rstrip("/")
+                query = parse_qs(parsed.query)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                
+                endpoint = "catalog/vehicle" if path.startswith("/catalog/vehicle/") else path.lstrip("/")
+                with stub._lock:
+                    stub.requests[endpoint] += 1
+                
+                if stub.latency:
+                    time.sleep(stub.latency)
+                
+                if stub._should_fail():
+                    self._send_json(503, {"error": "Service Unavailable"}, {"Retry-After": "0"})
+                    return
+                
+                if method == "POST" and path == "/oauth/v1/access-token":
+                    self._send_json(200, {
+                        "access_token": stub._issue_token(),
+                        "token_type": "Bearer",
+                        "expires_in": stub.token_expires_in,
+                    })
+                    return
+                
+                if method == "GET" and path == "/shopping/results":
+                    page = int(query.get("page", ["1"])[0])
+                    self._send(200, stub.results_page(page).encode("utf-8"), "text/html; charset=utf-8")
+                    return
+                
+                token = self.headers.get("Authorization", "").replace("Bearer ", "", 1)
+                if token not in stub._tokens:
+                    self._send_json(401, {"error": "Unauthorized"})
+                    return
+                
+                if method == "GET" and path == "/catalog":
+                    page = int(query.get("page", ["1"])[0])
+                    self._send_json(200, stub.catalog_page(page))
+                elif method == "GET" and path.startswith("/catalog/vehicle/"):
+                    vehicle_id = path.rsplit("/", 1)[1]
+                    if vehicle_id.isdigit():
+                        self._send_json(200, stub.vehicle_details(int(vehicle_id)))
+                    else:
+                        self._send_json(404, {"error": "Not Found"})
+                elif method == "POST" and path == "/financing/simulation":
+                    self._send_json(200, stub.financing(json.loads(body or b"{}")))
+                else:
+                    self._send_json(404, {"error": "Not Found"})
+            
+            def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+                self._send(status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+            
+            def _send(
+                self,
+                status: int,
+                body: bytes,
+                content_type: str,
+                headers: Optional[Dict[str, str]] = None,
+            ) -> None:
+                etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                
+                # Support conditional requests like a real CDN would
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if status == 200:
+                    self.send_header("ETag", etag)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+        
+        return Handler
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the stub server from the command line."""
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Webmotors API and cars.com")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080)")
+    parser.add_argument("--pages", type=int, default=3, help="Number of pages (default: 3)")
+    parser.add_argument("--per-page", type=int, default=10, help="Vehicles per page (default: 10)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Response delay in seconds (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 503 error (default: 0)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated data (default: 0)")
+    
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.INFO)
+    server = StubServer(
+        pages=args.pages,
+        per_page=args.per_page,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        host=args.host,
+        port=args.port,
+    )
+    
+    with server:
+        print(f"Webmotors API: WEBMOTORS_API_BASE_URL={server.url} WEBMOTORS_AUTH_BASE_URL={server.auth_url}")
+        print(f"cars.com: CarsComCollector(base_url=\"{server.url}\")")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
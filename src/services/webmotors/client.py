@@ -8,10 +8,18 @@ import base64
 import json
 import logging
 import os
+import time
 from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urlparse
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from src.services.http_cache import HTTPCache
+from src.services.metrics import ClientMetrics
+from .concurrency import THROTTLE_STATUS_CODES, AdaptiveLimiter, parse_retry_after
+from .token_cache import TokenCache, credentials_key, get_shared_token_cache
 
 # Load environment variables
 load_dotenv()
@@ -20,12 +28,17 @@ load_dotenv()
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Labels of the API endpoints recorded in the client metrics, most specific first
+ENDPOINT_LABELS = ["catalog/vehicle", "catalog", "financing/simulation", "access-token"]
+
 
 class WebmotorsClient:
     """
     Client for interacting with the Webmotors API.
     
     This class handles authentication and provides methods for making API requests.
+    All requests share a pooled, keep-alive HTTP session, and access tokens are
+    kept in an expiry-aware cache shared by clients using the same credentials.
     """
     
     def __init__(
@@ -36,6 +49,14 @@ class WebmotorsClient:
         api_password: Optional[str] = None,
         base_url: Optional[str] = None,
         api_version: Optional[str] = None,
+        auth_base_url: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        compress: bool = True,
+        token_cache: Optional[TokenCache] = None,
+        cache: Optional[HTTPCache] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        max_retries: int = 3,
+        metrics: Optional[ClientMetrics] = None,
     ):
         """
         Initialize the Webmotors API client.
@@ -47,15 +68,44 @@ class WebmotorsClient:
             api_password: Webmotors API password
             base_url: Base URL for the Webmotors API
             api_version: API version to use
+            auth_base_url: Base URL for the OAuth endpoints
+            pool_size: Maximum number of pooled connections kept alive
+            compress: Whether to request gzip-compressed responses
+            token_cache: Optional token cache; defaults to the process-wide cache
+                for these credentials, persisted to WEBMOTORS_TOKEN_CACHE_FILE if set
+            cache: Optional on-disk response cache for GET requests; created from
+                WEBMOTORS_CACHE_DIR and WEBMOTORS_CACHE_TTL if not provided
+            limiter: Optional adaptive limiter for in-flight requests; defaults to
+                one bounded by the connection pool size
+            max_retries: Number of retries for throttled (429/503) requests
+            metrics: Optional per-endpoint request metrics; a new instance is
+                created if not provided
         """
         self.client_id = client_id or os.getenv("WEBMOTORS_CLIENT_ID")
         self.client_secret = client_secret or os.getenv("WEBMOTORS_CLIENT_SECRET")
         self.api_username = api_username or os.getenv("WEBMOTORS_API_USERNAME")
         self.api_password = api_password or os.getenv("WEBMOTORS_API_PASSWORD")
-        self.auth_base_url = "https://api-webmotors.sensedia.com/oauth/v1"
+        self.auth_base_url = auth_base_url or os.getenv(
+            "WEBMOTORS_AUTH_BASE_URL", "https://api-webmotors.sensedia.com/oauth/v1"
+        )
         self.base_url = base_url or os.getenv("WEBMOTORS_API_BASE_URL", "https://api-webmotors.sensedia.com")
         self.api_version = api_version or os.getenv("WEBMOTORS_API_VERSION", "v1")
         self.access_token = None
+        self.pool_size = pool_size or int(os.getenv("WEBMOTORS_POOL_SIZE", "10"))
+        self.session = self._create_session(compress)
+        self.token_cache = token_cache or get_shared_token_cache(
+            credentials_key(self.auth_base_url, self.client_id, self.api_username),
+            os.getenv("WEBMOTORS_TOKEN_CACHE_FILE"),
+        )
+        self.cache = cache
+        if self.cache is None and os.getenv("WEBMOTORS_CACHE_DIR"):
+            self.cache = HTTPCache(
+                cache_dir=os.getenv("WEBMOTORS_CACHE_DIR"),
+                ttl=float(os.getenv("WEBMOTORS_CACHE_TTL", "3600")),
+            )
+        self.limiter = limiter or AdaptiveLimiter(max_limit=self.pool_size)
+        self.max_retries = max_retries
+        self.metrics = metrics or ClientMetrics()
         
         # Log credentials (masked)
         logger.debug(f"Client ID: {self.client_id[:4]}...{self.client_id[-4:] if self.client_id else None}")
@@ -70,6 +120,38 @@ class WebmotorsClient:
                 "environment variables."
             )
     
+    def _create_session(self, compress: bool) -> requests.Session:
+        """
+        Create the pooled HTTP session shared by all API requests.
+        
+        Args:
+            compress: Whether to request gzip-compressed responses
+            
+        Returns:
+            Configured requests session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "Connection": "keep-alive",
+            "Accept-Encoding": "gzip, deflate" if compress else "identity",
+        })
+        return session
+    
+    def close(self) -> None:
+        """Close the HTTP session and release pooled connections."""
+        self.session.close()
+    
+    def __enter__(self) -> "WebmotorsClient":
+        """Enter the client context."""
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close the client when leaving the context."""
+        self.close()
+    
     def authenticate(self) -> bool:
         """
         Authenticate with the Webmotors API.
@@ -108,10 +190,22 @@ class WebmotorsClient:
             logger.debug(f"Data: {data}")
             logger.debug(f"Base64 encoded auth: {auth_b64}")
             
-            response = requests.post(
-                url,
-                headers=headers,
-                data=data,
+            start = time.perf_counter()
+            try:
+                response = self.session.post(
+                    url,
+                    headers=headers,
+                    data=data,
+                )
+            except Exception:
+                self.metrics.record("access-token", None, time.perf_counter() - start)
+                raise
+            
+            self.metrics.record(
+                "access-token",
+                response.status_code,
+                time.perf_counter() - start,
+                len(response.content or b""),
             )
             
             # Log response details
@@ -123,6 +217,7 @@ class WebmotorsClient:
             if response.status_code == 200:
                 response_data = response.json()
                 self.access_token = response_data.get("access_token")
+                self.token_cache.set(self.access_token, response_data.get("expires_in"))
                 logger.info("Successfully authenticated with Webmotors API")
                 return True
             else:
@@ -134,6 +229,65 @@ class WebmotorsClient:
             logger.error(f"Error during authentication: {e}")
             return False
     
+    @property
+    def concurrency_window(self) -> int:
+        """Return the number of API requests currently allowed in flight."""
+        return self.limiter.limit
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get a snapshot of the per-endpoint request metrics.
+        
+        Returns:
+            Metrics snapshot including the current concurrency window
+        """
+        self.metrics.set_gauge("concurrency_window", self.concurrency_window)
+        return self.metrics.snapshot()
+    
+    @staticmethod
+    def endpoint_label(url: str) -> str:
+        """
+        Get the metrics label of a request URL.
+        
+        Path parameters such as vehicle IDs are dropped so requests to the same
+        endpoint share a label.
+        
+        Args:
+            url: Request URL
+            
+        Returns:
+            The endpoint label, e.g. ``catalog/vehicle``
+        """
+        path = urlparse(url).path.strip("/")
+        for label in ENDPOINT_LABELS:
+            if f"/{label}/" in f"/{path}/":
+                return label
+        return path or "/"
+    
+    def get_access_token(self) -> Optional[str]:
+        """
+        Get a valid access token, authenticating only when needed.
+        
+        Cached tokens are reused until shortly before they expire. Concurrent
+        callers wait for a single refresh instead of each authenticating.
+        
+        Returns:
+            The access token, or None if authentication failed
+        """
+        token = self.token_cache.get()
+        
+        if not token:
+            with self.token_cache.lock:
+                # Another caller may have refreshed the token while we waited
+                token = self.token_cache.get()
+                if not token and self.authenticate():
+                    token = self.access_token
+        
+        if token:
+            self.access_token = token
+        
+        return token
+    
     def _get_headers(self) -> Dict[str, str]:
         """
         Get headers for API requests.
@@ -141,8 +295,7 @@ class WebmotorsClient:
         Returns:
             Dictionary of headers
         """
-        if not self.access_token:
-            self.authenticate()
+        self.get_access_token()
         
         return {
             "Authorization": f"Bearer {self.access_token}",
@@ -169,35 +322,25 @@ class WebmotorsClient:
             Response data as a dictionary, or None if the request failed
         """
         url = f"{self.base_url}/{endpoint}"
+        headers = self._get_headers()
         logger.debug(f"Making {method} request to {url}")
-        logger.debug(f"Headers: {self._get_headers()}")
+        logger.debug(f"Headers: {headers}")
         if params:
             logger.debug(f"Params: {params}")
         if data:
             logger.debug(f"Data: {data}")
         
         try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=self._get_headers(),
-                params=params,
-                json=data,
-            )
+            response = self._send(method, url, headers, params, data)
             
             # Check if authentication failed
             if response.status_code == 401:
                 logger.warning("Authentication token expired, attempting to re-authenticate")
-                self.authenticate()
+                self.token_cache.invalidate(headers["Authorization"].split(" ", 1)[1])
+                headers = self._get_headers()
                 
                 # Retry the request
-                response = requests.request(
-                    method=method,
-                    url=url,
-                    headers=self._get_headers(),
-                    params=params,
-                    json=data,
-                )
+                response = self._send(method, url, headers, params, data)
             
             # Check response
             if response.status_code == 200:
@@ -211,6 +354,80 @@ class WebmotorsClient:
             logger.error(f"Error making API request: {e}")
             return None
     
+    def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> requests.Response:
+        """
+        Send a request through the response cache, if enabled, or the session.
+        
+        Requests wait for a slot of the adaptive limiter. Throttled responses
+        (429/503) shrink its window and are retried after ``Retry-After`` or an
+        exponential backoff. Every attempt is recorded in the client metrics.
+        
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            url: Request URL
+            headers: Request headers
+            params: Query parameters
+            data: Request body data
+            
+        Returns:
+            The HTTP response
+        """
+        endpoint = self.endpoint_label(url)
+        
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            start = time.perf_counter()
+            latency = None
+            status_code = None
+            retry_after = None
+            size = 0
+            cached = False
+            
+            try:
+                if self.cache:
+                    response = self.cache.request(self.session, method, url, params=params, headers=headers, json=data)
+                else:
+                    response = self.session.request(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        params=params,
+                        json=data,
+                    )
+                
+                status_code = response.status_code
+                size = len(response.content or b"")
+                cached = getattr(response, "from_cache", False) is True
+                
+                # Cached responses say nothing about the API's capacity
+                if not cached:
+                    latency = time.perf_counter() - start
+                
+                if status_code in THROTTLE_STATUS_CODES:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    if retry_after is None:
+                        retry_after = 0.5 * 2 ** attempt
+            finally:
+                self.limiter.release(latency, status_code, retry_after)
+                self.metrics.record(endpoint, status_code, time.perf_counter() - start, size, cached)
+            
+            if status_code not in THROTTLE_STATUS_CODES or attempt == self.max_retries:
+                return response
+            
+            logger.warning(
+                f"Request to {url} throttled with status code {status_code}, "
+                f"retrying in {retry_after:.1f}s (concurrency window {self.limiter.limit})"
+            )
+        
+        return response
+    
     def get_catalog(self, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """
         Get catalog data from the Webmotors API.
@@ -0,0 +1,141 @@
+"""
+Adaptive concurrency control module.
+
+This module implements an AIMD (additive increase, multiplicative decrease)
+limiter for in-flight API requests. The window grows while responses are fast
+and shrinks when the API throttles us with 429/503, honoring ``Retry-After``.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Status codes signalling that the API wants us to slow down
+THROTTLE_STATUS_CODES = [429, 503]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header.
+    
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+    
+    Returns:
+        The delay in seconds, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveLimiter:
+    """
+    AIMD limiter for concurrent requests.
+    
+    Callers take a slot with ``acquire`` before a request and report its outcome
+    with ``release``. Each healthy response grows the window by ``1 / window``
+    (about one slot per window of requests); a throttled response halves it and
+    pauses new requests until ``Retry-After`` has passed. Slow responses shrink
+    the window gently.
+    """
+    
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        latency_target: float = 2.0,
+        backoff: float = 0.5,
+    ):
+        """
+        Initialize the limiter.
+        
+        Args:
+            initial_limit: Number of requests allowed in flight at first
+            min_limit: Lower bound of the window
+            max_limit: Upper bound of the window
+            latency_target: Latency in seconds above which the window shrinks
+            backoff: Factor applied to the window on a throttled response
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._blocked_until = 0.0
+        self._condition = threading.Condition()
+    
+    @property
+    def limit(self) -> int:
+        """Return the current window of requests allowed in flight."""
+        return int(self._limit)
+    
+    @property
+    def in_flight(self) -> int:
+        """Return the number of requests currently in flight."""
+        return self._in_flight
+    
+    def acquire(self) -> None:
+        """Wait for a free slot and any ``Retry-After`` pause, then take the slot."""
+        with self._condition:
+            while True:
+                wait = self._blocked_until - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return
+                
+                self._condition.wait()
+    
+    def release(
+        self,
+        latency: Optional[float] = None,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """
+        Free a slot and adapt the window to the outcome of the request.
+        
+        Args:
+            latency: Request latency in seconds, or None to leave the window unchanged
+            status_code: HTTP status code of the response, if any
+            retry_after: Seconds the server asked us to wait before retrying
+        """
+        with self._condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            
+            if status_code in THROTTLE_STATUS_CODES:
+                self._limit = max(self.min_limit, self._limit * self.backoff)
+                if retry_after:
+                    self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+                logger.debug(f"Throttled with {status_code}, concurrency window now {self.limit}")
+            elif latency is not None and latency > self.latency_target:
+                self._limit = max(self.min_limit, self._limit * 0.9)
+            elif latency is not None and status_code is not None and status_code < 500:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            
+            self._condition.notify_all()
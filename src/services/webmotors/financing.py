@@ -0,0 +1,275 @@
+"""
+Financing simulation module.
+
+This module provides a local, vectorized amortization engine that estimates
+financing installments for whole grids of down payments, terms and rates at
+once, calibrated from real API simulations. For numbers that must be
+authoritative, ``CachedFinancingClient`` memoizes the API endpoint.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from src.services.lru_cache import LRUCache
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Monthly interest rate used until the simulator is calibrated
+DEFAULT_MONTHLY_RATE = 0.0149
+
+# Upper bound of the implied monthly rate search
+MAX_MONTHLY_RATE = 1.0
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+def amortize(principal: ArrayLike, monthly_rate: ArrayLike, term_months: ArrayLike) -> np.ndarray:
+    """
+    Compute fixed installments (Price table) for broadcastable arrays of loans.
+    
+    Args:
+        principal: Financed amounts
+        monthly_rate: Monthly interest rates as fractions, e.g. 0.0149
+        term_months: Loan terms in months
+    
+    Returns:
+        The installment of every loan, with the broadcast shape of the inputs
+    """
+    principal = np.maximum(np.asarray(principal, dtype=float), 0.0)
+    rate = np.asarray(monthly_rate, dtype=float)
+    term = np.asarray(term_months, dtype=float)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = rate / -np.expm1(-term * np.log1p(rate))
+        # Without interest the principal is simply split over the term
+        factor = np.where(rate > 0, factor, 1.0 / term)
+    
+    return principal * np.where(term > 0, factor, 1.0)
+
+
+def implied_monthly_rate(
+    principal: ArrayLike,
+    term_months: ArrayLike,
+    installment: ArrayLike,
+    iterations: int = 60,
+) -> np.ndarray:
+    """
+    Solve the monthly rate producing the given installments.
+    
+    Bisection is run on all loans at once, so thousands of samples are solved
+    in a handful of array operations.
+    
+    Args:
+        principal: Financed amounts
+        term_months: Loan terms in months
+        installment: Observed installments
+        iterations: Number of bisection steps
+    
+    Returns:
+        The implied monthly rate of every loan; NaN where no rate fits
+    """
+    principal, term, installment = np.broadcast_arrays(
+        np.asarray(principal, dtype=float),
+        np.asarray(term_months, dtype=float),
+        np.asarray(installment, dtype=float),
+    )
+    low = np.zeros(principal.shape)
+    high = np.full(principal.shape, MAX_MONTHLY_RATE)
+    
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        too_high = amortize(principal, mid, term) > installment
+        high = np.where(too_high, mid, high)
+        low = np.where(too_high, low, mid)
+    
+    rate = (low + high) / 2
+    valid = (principal > 0) & (term > 0) & (installment * term >= principal) & (rate < MAX_MONTHLY_RATE * 0.999)
+    return np.where(valid, rate, np.nan)
+
+
+class FinancingSimulator:
+    """
+    Local financing simulator.
+    
+    Installments are computed with the Price table from a monthly rate. The rate
+    can be calibrated from real API simulations, either globally or per term,
+    since lenders usually charge more for longer terms.
+    """
+    
+    def __init__(
+        self,
+        monthly_rate: float = DEFAULT_MONTHLY_RATE,
+        term_rates: Optional[Dict[int, float]] = None,
+    ):
+        """
+        Initialize the simulator.
+        
+        Args:
+            monthly_rate: Monthly rate used for terms without a calibrated rate
+            term_rates: Calibrated monthly rates keyed by term in months
+        """
+        self.monthly_rate = monthly_rate
+        self.term_rates = dict(term_rates or {})
+    
+    def calibrate(self, simulations: Iterable[Dict[str, Any]]) -> int:
+        """
+        Calibrate the rates from real API simulations.
+        
+        Each simulation needs ``vehiclePrice``, ``downPayment``, ``termMonths`` and
+        ``installmentValue``. The implied rate of every sample is solved and the
+        median is used overall and per term, which keeps outliers from skewing
+        the estimate.
+        
+        Args:
+            simulations: Financing simulation responses of the API
+        
+        Returns:
+            Number of samples used for calibration
+        """
+        samples = []
+        for simulation in simulations:
+            try:
+                samples.append((
+                    float(simulation["vehiclePrice"]) - float(simulation["downPayment"]),
+                    int(simulation["termMonths"]),
+                    float(simulation["installmentValue"]),
+                ))
+            except (KeyError, TypeError, ValueError):
+                logger.warning(f"Ignoring malformed financing simulation: {simulation}")
+        
+        if not samples:
+            logger.warning("No financing simulations to calibrate from")
+            return 0
+        
+        principal, term, installment = (np.array(column, dtype=float) for column in zip(*samples))
+        rates = implied_monthly_rate(principal, term, installment)
+        valid = ~np.isnan(rates)
+        if not valid.any():
+            logger.warning("No financing simulation produced a valid rate")
+            return 0
+        
+        self.monthly_rate = float(np.median(rates[valid]))
+        self.term_rates = {
+            int(value): float(np.median(rates[valid & (term == value)]))
+            for value in np.unique(term[valid])
+        }
+        
+        logger.info(
+            f"Calibrated financing simulator from {int(valid.sum())} samples: "
+            f"monthly rate {self.monthly_rate:.4%}"
+        )
+        return int(valid.sum())
+    
+    def rates_for_terms(self, term_months: ArrayLike) -> np.ndarray:
+        """
+        Get the monthly rate applied to each term.
+        
+        Args:
+            term_months: Loan terms in months
+        
+        Returns:
+            The calibrated rate of each term, or the overall rate for unknown terms
+        """
+        terms = np.asarray(term_months)
+        return np.vectorize(lambda term: self.term_rates.get(int(term), self.monthly_rate), otypes=[float])(terms)
+    
+    def installments(
+        self,
+        vehicle_price: float,
+        down_payments: ArrayLike,
+        term_months: ArrayLike,
+        monthly_rates: Optional[ArrayLike] = None,
+    ) -> np.ndarray:
+        """
+        Compute installments for a grid of financing options of one vehicle.
+        
+        Args:
+            vehicle_price: Price of the vehicle
+            down_payments: Down payment amounts
+            term_months: Loan terms in months
+            monthly_rates: Monthly rates to evaluate; defaults to the calibrated rate of each term
+        
+        Returns:
+            Installments of shape (down payments, terms), or (down payments, terms, rates)
+            when ``monthly_rates`` is given
+        """
+        down = np.atleast_1d(np.asarray(down_payments, dtype=float))
+        terms = np.atleast_1d(np.asarray(term_months, dtype=float))
+        principal = vehicle_price - down
+        
+        if monthly_rates is None:
+            return amortize(principal[:, None], self.rates_for_terms(terms)[None, :], terms[None, :])
+        
+        rates = np.atleast_1d(np.asarray(monthly_rates, dtype=float))
+        return amortize(principal[:, None, None], rates[None, None, :], terms[None, :, None])
+    
+    def simulate(self, vehicle_price: float, down_payment: float, term_months: int) -> Dict[str, Any]:
+        """
+        Simulate a single financing option in the format of the API.
+        
+        Args:
+            vehicle_price: Price of the vehicle
+            down_payment: Down payment amount
+            term_months: Term in months
+        
+        Returns:
+            Financing simulation data as a dictionary
+        """
+        rate = float(self.rates_for_terms(term_months))
+        installment = float(amortize(vehicle_price - down_payment, rate, term_months))
+        
+        return {
+            "vehiclePrice": vehicle_price,
+            "downPayment": down_payment,
+            "termMonths": term_months,
+            "monthlyRate": rate,
+            "installmentValue": round(installment, 2),
+            "estimated": True,
+        }
+
+
+class CachedFinancingClient:
+    """
+    Memoizing wrapper around the financing endpoint of a Webmotors client.
+    
+    Successful simulations are kept in an LRU cache with a TTL, so repeated
+    (vehicle, down payment, term) combinations do not hit the API again.
+    """
+    
+    def __init__(self, client: Any, maxsize: int = 4096, ttl: float = 3600.0):
+        """
+        Initialize the cached client.
+        
+        Args:
+            client: WebmotorsClient used for cache misses
+            maxsize: Maximum number of cached simulations
+            ttl: Seconds a simulation stays valid
+        """
+        self.client = client
+        self.cache = LRUCache(maxsize=maxsize, ttl=ttl)
+    
+    def get_financing_simulation(
+        self,
+        vehicle_id: str,
+        down_payment: float,
+        term_months: int,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a financing simulation, from the cache when possible.
+        
+        Args:
+            vehicle_id: ID of the vehicle
+            down_payment: Down payment amount
+            term_months: Term in months
+        
+        Returns:
+            Financing simulation data as a dictionary, or None if the request failed
+        """
+        key = (str(vehicle_id), round(float(down_payment), 2), int(term_months))
+        return self.cache.get_or_set(
+            key,
+            lambda: self.client.get_financing_simulation(vehicle_id, down_payment, term_months),
+        )
@@ -0,0 +1,187 @@
+"""
+Webmotors OAuth token cache module.
+
+This module provides an expiry-aware access token cache that can be shared by
+several client instances and, optionally, persisted to a local file so other
+worker processes can reuse the same token.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from ..file_utils import atomic_write
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Lifetime assumed when the token response does not include expires_in
+DEFAULT_EXPIRES_IN = 3600
+
+# Caches shared by every client using the same credentials in this process
+_shared_caches: Dict[Tuple[str, Optional[str]], "TokenCache"] = {}
+_shared_caches_lock = threading.Lock()
+
+
+class TokenCache:
+    """
+    Expiry-aware cache for an OAuth access token.
+    
+    Tokens are considered stale ``refresh_margin`` seconds before they expire so
+    callers refresh proactively instead of waiting for a 401. The ``lock``
+    attribute is used by clients to make refreshes single-flight.
+    """
+    
+    def __init__(
+        self,
+        key: str = "",
+        path: Optional[str] = None,
+        refresh_margin: float = 60.0,
+    ):
+        """
+        Initialize the token cache.
+        
+        Args:
+            key: Identifier of the credentials the token belongs to
+            path: Optional file used to share the token across processes
+            refresh_margin: Seconds before expiry at which the token is refreshed
+        """
+        self.key = key
+        self.path = path
+        self.refresh_margin = refresh_margin
+        self.lock = threading.RLock()
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+    
+    def get(self) -> Optional[str]:
+        """
+        Get the cached token if it is still fresh.
+        
+        Falls back to the cache file when the in-memory token is missing or stale,
+        picking up tokens refreshed by other processes.
+        
+        Returns:
+            The access token, or None if no fresh token is available
+        """
+        with self.lock:
+            if self._is_fresh():
+                return self._token
+            
+            if self.path and self._load():
+                if self._is_fresh():
+                    return self._token
+            
+            return None
+    
+    def set(self, token: str, expires_in: Optional[float] = None) -> None:
+        """
+        Store a new token.
+        
+        Args:
+            token: The access token
+            expires_in: Token lifetime in seconds as returned by the API
+        """
+        with self.lock:
+            self._token = token
+            self._expires_at = time.time() + float(expires_in or DEFAULT_EXPIRES_IN)
+            
+            if self.path:
+                self._save()
+    
+    def invalidate(self, token: Optional[str] = None) -> None:
+        """
+        Drop the cached token.
+        
+        Args:
+            token: Only invalidate if the cached token is this one, so a token
+                already refreshed by another caller is kept
+        """
+        with self.lock:
+            if token is not None and token != self._token:
+                return
+            
+            self._token = None
+            self._expires_at = 0.0
+            
+            if self.path:
+                self._save()
+    
+    @property
+    def expires_at(self) -> float:
+        """Return the expiry time of the cached token as a Unix timestamp."""
+        return self._expires_at
+    
+    def _is_fresh(self) -> bool:
+        """Check whether the in-memory token is usable."""
+        return bool(self._token) and time.time() < self._expires_at - self.refresh_margin
+    
+    def _load(self) -> bool:
+        """
+        Load the token from the cache file.
+        
+        Returns:
+            True if a token for this key was loaded, False otherwise
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable token cache {self.path}: {e}")
+            return False
+        
+        if data.get("key") != self.key or not data.get("access_token"):
+            return False
+        
+        self._token = data["access_token"]
+        self._expires_at = float(data.get("expires_at", 0.0))
+        return True
+    
+    def _save(self) -> None:
+        """Atomically write the token to the cache file."""
+        data = {
+            "key": self.key,
+            "access_token": self._token,
+            "expires_at": self._expires_at,
+        }
+        
+        try:
+            atomic_write(self.path, json.dumps(data).encode("utf-8"), mode=0o600)
+        except OSError as e:
+            logger.warning(f"Failed to write token cache {self.path}: {e}")
+
+
+def credentials_key(*parts: Optional[str]) -> str:
+    """
+    Build a cache key from credential parts without storing them in clear text.
+    
+    Args:
+        parts: Values identifying the credentials
+    
+    Returns:
+        Hex digest identifying the credentials
+    """
+    return hashlib.sha256(":".join(part or "" for part in parts).encode("utf-8")).hexdigest()
+
+
+def get_shared_token_cache(key: str, path: Optional[str] = None) -> TokenCache:
+    """
+    Get the process-wide token cache for a set of credentials.
+    
+    Args:
+        key: Identifier of the credentials
+        path: Optional file used to share the token across processes
+    
+    Returns:
+        The shared token cache
+    """
+    with _shared_caches_lock:
+        cache = _shared_caches.get((key, path))
+        if cache is None:
+            cache = TokenCache(key=key, path=path)
+            _shared_caches[(key, path)] = cache
+        return cache
@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+from data.listing_store import get_listing_store
 
 def render():
     st.header("Opportunities")
@@ -24,11 +25,26 @@ def render():
     
     # Apply filters button
     if st.sidebar.button("Apply Filters"):
-        st.info("Filter functionality will be implemented here.")
+        st.session_state.opportunity_filters = {
+            "brand": brands,
+            "min_price": min_price,
+            "max_price": max_price,
+            "min_year": min_year,
+            "max_year": max_year,
+            "max_mileage": max_mileage,
+        }
     
     # Opportunities table
     st.subheader("Potential Deals")
-    st.info("Opportunities table will be displayed here.")
+    if "opportunity_filters" in st.session_state:
+        # Indexed query over the listings accumulated by collection runs
+        listings = get_listing_store().query(limit=500, **st.session_state.opportunity_filters)
+        if listings.empty:
+            st.info("No collected listings match the filters.")
+        else:
+            st.dataframe(listings)
+    else:
+        st.info("Apply the filters to search the collected listings.")
     
     # Example table (placeholder)
     if st.checkbox("Show Example Data"):
@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 import random
 import base64
 from data import db_manager
+from data.listing_store import get_listing_store
 
 def render():
     st.title("Tabela Realidade")
@@ -76,12 +77,12 @@ def render_step1():
         brands = db_manager.get_brands()
         selected_brand = st.selectbox("Marca", brands, key="brand_select")
         
-        # Display brand logo if available
+        # Display brand logo if available, from the local logo cache
         if selected_brand:
-            logo_url = db_manager.get_brand_logo_url(selected_brand)
-            if logo_url:
+            logo = db_manager.get_brand_logo(selected_brand)
+            if logo:
                 try:
-                    st.image(logo_url, width=100)
+                    st.image(logo, width=100)
                 except Exception as e:
                     st.error(f"Erro ao carregar logo: {e}")
     
@@ -155,10 +156,26 @@ def render_step3():
     st.write(f"**Estado:** {st.session_state.selected_state}")
     st.write(f"**Versão:** {st.session_state.selected_version}")
     
-    # Create a sample price range
-    base_price = 50000 + (2024 - st.session_state.selected_year) * 5000
-    min_price = base_price - random.randint(5000, 10000)
-    max_price = base_price + random.randint(5000, 10000)
+    # Price range of the collected listings of the selection, or a sample range without any
+    store = get_listing_store()
+    selection = {
+        "brand": st.session_state.selected_brand,
+        "model": st.session_state.selected_model,
+        "year": st.session_state.selected_year,
+        # Listings hold the state abbreviation, while the selector shows names
+        "state": db_manager.get_state_abbreviation(st.session_state.selected_state) or st.session_state.selected_state,
+    }
+    summary = store.price_summary(**selection)
+    
+    if summary["count"]:
+        base_price = summary["mean"]
+        min_price = summary["min"]
+        max_price = summary["max"]
+        st.caption(f"Baseado em {summary['count']} anúncios coletados")
+    else:
+        base_price = 50000 + (2024 - st.session_state.selected_year) * 5000
+        min_price = base_price - random.randint(5000, 10000)
+        max_price = base_price + random.randint(5000, 10000)
     
     # Calculate purchase and sale values
     purchase_value = base_price - random.randint(5000, 15000)
@@ -189,10 +206,15 @@ def render_step3():
     # Add a chart showing price trend
     st.subheader("Tendência de Preços")
     
-    # Sample data for price trend
-    months = [datetime.now() - timedelta(days=30*i) for i in range(12)]
-    months.reverse()
-    prices = [base_price - random.randint(1000, 5000) + i*random.randint(500, 2000) for i in range(12)]
+    # Monthly mean price of the collected listings, or sample data without any
+    history = store.price_history(**selection) if summary["count"] else pd.DataFrame()
+    if not history.empty:
+        months = pd.to_datetime(history["month"]).tolist()
+        prices = history["mean_price"].tolist()
+    else:
+        months = [datetime.now() - timedelta(days=30*i) for i in range(12)]
+        months.reverse()
+        prices = [base_price - random.randint(1000, 5000) + i*random.randint(500, 2000) for i in range(12)]
     
     fig = px.line(
         x=months, 
@@ -1,4 +1,10 @@
+import math
 import os, sys
+import random
+from unittest.mock import MagicMock
+
+import pytest
+import requests
 
 # Get the current directory (tests/)
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -11,4 +17,66 @@ sys.path.insert(0, parent_dir)
 
 # Add the 'src' directory to sys.path
 src_dir = os.path.join(parent_dir, "src")
-sys.path.insert(0, src_dir) 
\ No newline at end of file
+sys.path.insert(0, src_dir)
+
+
+@pytest.fixture
+def car_records():
+    """
+    Build random car records from per-field choices.
+    
+    Fields are given as ``{name: (choices, presence)}``; each record gets the
+    field with probability ``presence`` and a value drawn from ``choices``.
+    Callable choices are called with the record index.
+    """
+    def build(count, fields, seed=0):
+        rng = random.Random(seed)
+        records = []
+        for index in range(count):
+            record = {}
+            for name, (choices, presence) in fields.items():
+                if rng.random() < presence:
+                    value = rng.choice(choices)
+                    record[name] = value(index) if callable(value) else value
+            records.append(record)
+        return records
+    return build
+
+
+@pytest.fixture
+def without_missing():
+    """Drop missing values (None/NaN) from a record, as they stand for absent keys."""
+    def drop(record):
+        return {
+            key: value for key, value in record.items()
+            if value is not None and not (isinstance(value, float) and math.isnan(value))
+        }
+    return drop
+
+
+@pytest.fixture
+def mock_response():
+    """Build mocked HTTP responses with a JSON payload."""
+    def build(status_code=200, payload=None, headers=None):
+        response = MagicMock()
+        response.status_code = status_code
+        response.json.return_value = payload or {}
+        response.text = ""
+        response.headers = headers or {}
+        response.from_cache = False
+        return response
+    return build
+
+
+@pytest.fixture
+def http_response():
+    """Build real requests responses, e.g. for the HTTP cache to store."""
+    def build(status_code=200, body=b"", headers=None, url="https://example.test/page"):
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = body
+        response.headers.update(headers or {})
+        response.url = url
+        response.encoding = "utf-8"
+        return response
+    return build
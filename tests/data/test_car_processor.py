@@ -0,0 +1,105 @@
+"""
+Tests for the car processor, comparing the per-record and vectorized paths.
+"""
+
+import math
+
+import pandas as pd
+import pytest
+
+from src.data.db_manager import DBManager
+from src.data.processors.car_processor import CarProcessor
+from src.data.processors.title_parser import TitleParser
+
+
+# Choices and presence of the fields of random records, covering the edge cases of the processing rules
+FIELDS = {
+    "title": (["Toyota Corolla XEi", "2019 Honda Civic", "Ford", "Chevrolet Onix 2021 LT", "1999", "vw Gol 1.0"], 1.0),
+    "source": (["test"], 1.0),
+    "price": ([0, 15000, 89990.5, -10, None], 0.9),
+    "mileage": ([0, 1, 45000, -5, None], 0.8),
+    "year": ([0, 2015, 2023, 2024, None], 0.7),
+    "brand": (["Unknown"], 0.3),
+}
+
+# Rows the per-record path rejects with an error
+INVALID_RECORDS = [
+    {"price": 1000, "year": 2020},
+    {"title": 42, "price": 1000},
+    {"title": "Toyota Yaris", "price": "cheap", "mileage": 10},
+    {"title": "Toyota Yaris", "price": "cheap"},
+    {"title": "Toyota Yaris 2020", "year": "", "price": 1000},
+    {"title": "Toyota Yaris", "year": "soon"},
+]
+
+
+def assert_same_records(expected, actual):
+    """Compare records allowing for float rounding and int/float differences."""
+    assert len(expected) == len(actual)
+    for expected_record, actual_record in zip(expected, actual):
+        assert expected_record.keys() == actual_record.keys()
+        for key, value in expected_record.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                assert actual_record[key] == pytest.approx(value)
+            else:
+                assert actual_record[key] == value
+
+
+@pytest.mark.parametrize("with_catalog", [False, True])
+def test_process_frame_matches_process(with_catalog, tmp_path, car_records, without_missing):
+    """Test that the vectorized path produces the same records as the per-record path."""
+    db_manager = DBManager(db_dir="tests/data/test_db", logo_cache_dir=str(tmp_path / "logos"))
+    title_parser = TitleParser.from_db_manager(db_manager) if with_catalog else None
+    processor = CarProcessor(title_parser=title_parser)
+    records = car_records(500, FIELDS) + INVALID_RECORDS
+    
+    expected = [without_missing(record) for record in processor.process(records)]
+    frame = processor.process_frame(pd.DataFrame(records))
+    actual = [without_missing(record) for record in frame.to_dict("records")]
+    
+    assert_same_records(expected, actual)
+
+
+def test_missing_values_are_absent_keys(without_missing):
+    """Test that both paths keep records whose year or price is None, as if the key were absent."""
+    records = [
+        {"title": "Toyota Corolla", "year": None, "price": 90000, "mileage": 1000},
+        {"title": "Toyota Corolla", "year": 2020, "price": None, "mileage": 1000},
+        {"title": "Honda Civic 2019", "year": None, "price": None},
+        {"title": "Honda Civic", "year": 2019, "price": 80000, "mileage": None},
+    ]
+    processor = CarProcessor()
+    
+    expected = [without_missing(record) for record in processor.process(records)]
+    actual = [without_missing(record) for record in processor.process_frame(pd.DataFrame(records)).to_dict("records")]
+    
+    assert len(expected) == 4
+    assert_same_records(expected, actual)
+    assert expected[0] == {"title": "Toyota Corolla", "price": 90000, "mileage": 1000, "price_per_mile": 90.0,
+                           "brand": "Toyota", "model": "Corolla"}
+    assert expected[2]["year"] == 2019
+
+
+def test_process_frame_extracts_fields():
+    """Test year, brand, model and derived columns on a simple frame."""
+    frame = pd.DataFrame([
+        {"title": "2018 Toyota Corolla", "price": 50000.0, "mileage": 25000},
+        {"title": "Honda Civic", "price": 60000.0, "mileage": 0, "year": 2020},
+    ])
+    
+    processed = CarProcessor().process_frame(frame)
+    
+    assert processed["year"].tolist() == [2018, 2020]
+    assert processed["age"].tolist() == [5, 3]
+    assert processed["model"].iloc[1] == "Civic"
+    # Titles starting with the year do not match the brand/model pattern
+    assert pd.isna(processed["brand"].iloc[0])
+    assert processed["price_per_mile"].iloc[0] == pytest.approx(2.0)
+    assert math.isnan(processed["price_per_mile"].iloc[1])
+    assert processed["price_per_age"].tolist() == pytest.approx([10000.0, 20000.0])
+    assert "price_per_mile" not in frame
+
+
+def test_process_frame_without_titles():
+    """Test that frames without titles produce no rows."""
+    assert CarProcessor().process_frame(pd.DataFrame([{"price": 1000}])).empty
@@ -0,0 +1,86 @@
+"""
+Tests for the car validator, comparing the per-record and vectorized paths.
+"""
+
+import pandas as pd
+
+from src.data.processors.car_processor import CarProcessor
+from src.data.validators.car_validator import CarValidator
+
+
+# Choices and presence of the fields of random records, covering every validation rule
+FIELDS = {
+    "title": ([lambda index: f"Car {index}"], 0.98),
+    "price": ([-1, 0, 50000, 1000001, None], 0.98),
+    "year": ([1899, 2015, 2024, None], 0.98),
+    "mileage": ([-5, 0, 45000, 600000], 0.98),
+    "source": (["test"], 0.98),
+    "url": ([lambda index: f"https://example.test/{index}"], 0.98),
+}
+
+
+def test_validate_frame_matches_validate(car_records, without_missing):
+    """Test that the vectorized path partitions rows like the per-record path."""
+    records = car_records(500, FIELDS)
+    validator = CarValidator()
+    
+    expected_valid, expected_invalid = validator.validate(records)
+    valid, invalid, counts = validator.validate_frame(pd.DataFrame(records))
+    
+    assert [without_missing(record) for record in valid.to_dict("records")] == expected_valid
+    assert [without_missing(record) for record in invalid.drop(columns="reason").to_dict("records")] == [
+        without_missing(record) for record in expected_invalid
+    ]
+    assert sum(counts.values()) == len(invalid)
+
+
+def test_processed_missing_year_is_invalid():
+    """Test that a processed listing without a year is rejected rather than raising."""
+    record = {"title": "Toyota Corolla", "price": 90000, "year": None, "mileage": 1000, "source": "cars.com",
+              "url": "https://example.test/1"}
+    
+    valid, invalid = CarValidator().validate(CarProcessor().process([record, {**record, "year": 2020}]))
+    
+    assert [item["year"] for item in valid] == [2020]
+    assert [item["year"] for item in invalid] == [None]
+
+
+def test_validate_frame_reasons():
+    """Test that each rejected row is attributed to the first rule it fails."""
+    frame = pd.DataFrame([
+        {"title": "Valid", "price": 100, "year": 2020, "mileage": 10},
+        {"title": None, "price": -1, "year": 2020, "mileage": 10},
+        {"title": "Cheap", "price": -1, "year": 1800, "mileage": 10},
+        {"title": "Old", "price": 100, "year": 1800, "mileage": 10},
+        {"title": "Text", "price": "cheap", "year": 2020, "mileage": 10},
+        {"title": "No mileage", "price": 100, "year": 2020, "mileage": None},
+    ])
+    validator = CarValidator(
+        required_fields=["title"],
+        constraints={"price": {"min": 0}, "year": {"min": 1900, "max": 2023}, "mileage": {"max": 500000}},
+    )
+    
+    valid, invalid, counts = validator.validate_frame(frame)
+    
+    assert valid["title"].tolist() == ["Valid", "No mileage"]
+    assert invalid["reason"].tolist() == ["missing_title", "price_below_min", "year_below_min", "price_not_numeric"]
+    assert counts == {
+        "missing_title": 1,
+        "price_not_numeric": 1,
+        "price_below_min": 1,
+        "year_below_min": 1,
+        "year_above_max": 0,
+        "mileage_above_max": 0,
+    }
+
+
+def test_validate_frame_missing_column():
+    """Test that a missing required column rejects every row."""
+    frame = pd.DataFrame([{"title": "Car", "price": 100}])
+    validator = CarValidator(required_fields=["title", "url"])
+    
+    valid, invalid, counts = validator.validate_frame(frame)
+    
+    assert valid.empty
+    assert invalid["reason"].tolist() == ["missing_url"]
+    assert counts["missing_url"] == 1
@@ -0,0 +1,147 @@
+"""
+Tests for the cars.com collector and its rate limiter.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.data.collectors.cars_com_collector import PARSERS, CarsComCollector
+from src.data.collectors.rate_limiter import TokenBucket
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "cars_com_results.html")
+
+PAGE_HTML = """
+<div class="vehicle-card">
+  <a href="/vehicledetail/{page}/">
+    <h2 class="title">2020 Toyota Corolla LE</h2>
+  </a>
+  <span class="price">$18,500</span>
+  <span class="year">2020</span>
+  <span class="mileage">35,120 mi.</span>
+</div>
+"""
+
+
+def make_response(url):
+    """Build a mocked results page response for the requested URL."""
+    page = int(url.rsplit("=", 1)[1])
+    response = MagicMock()
+    response.text = PAGE_HTML.format(page=page)
+    return response
+
+
+@pytest.fixture
+def collector():
+    """Create a cars.com collector with a mocked session."""
+    collector = CarsComCollector(config={"max_pages": 6, "delay": 0, "max_workers": 3})
+    collector.session = MagicMock()
+    collector.session.get.side_effect = make_response
+    return collector
+
+
+def test_token_bucket_limits_rate():
+    """Test that the bucket spaces requests beyond the burst."""
+    bucket = TokenBucket(rate=50, burst=2)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    
+    # Two tokens are available immediately, the other four take 1/50s each
+    assert time.monotonic() - start >= 4 / 50 * 0.9
+
+
+def test_token_bucket_unlimited():
+    """Test that a non-positive rate never waits."""
+    bucket = TokenBucket(rate=0)
+    assert all(bucket.acquire() == 0.0 for _ in range(100))
+
+
+def test_concurrent_pages_keep_order(collector):
+    """Test that pages fetched concurrently are yielded in page order."""
+    pages = list(collector.iter_pages())
+    
+    urls = [page[0]["url"] for page in pages]
+    assert urls == [f"https://www.cars.com/vehicledetail/{page}/" for page in range(1, 7)]
+    assert pages[0][0]["price"] == 18500.0
+    assert pages[0][0]["mileage"] == 35120
+
+
+def test_pool_shutdown_without_cancel_futures(collector, monkeypatch):
+    """Test that the crawl does not need the Python 3.9 shutdown arguments."""
+    shutdown = ThreadPoolExecutor.shutdown
+    monkeypatch.setattr(ThreadPoolExecutor, "shutdown", lambda self, wait=True: shutdown(self, wait))
+    
+    assert len(list(collector.iter_pages())) == 6
+    
+    # Stopping early cancels the pages not started yet
+    pages = collector.iter_pages()
+    next(pages)
+    pages.close()
+
+
+def test_failed_page_is_skipped(collector):
+    """Test that a failing page does not stop the crawl."""
+    def get(url):
+        if url.endswith("page=2"):
+            raise ValueError("boom")
+        return make_response(url)
+    
+    collector.session.get.side_effect = get
+    
+    assert len(list(collector.iter_pages())) == 5
+
+
+def test_cached_pages_are_not_throttled(tmp_path, http_response):
+    """Test that only pages fetched from the server wait for the rate limiter."""
+    collector = CarsComCollector(config={"max_pages": 1, "cache": {"cache_dir": str(tmp_path), "ttl": 60}})
+    collector.session = MagicMock()
+    collector.session.request.side_effect = lambda **kwargs: http_response(
+        body=make_response(kwargs["url"]).text.encode("utf-8"),
+        url=kwargs["url"],
+    )
+    rate_limiter = MagicMock()
+    
+    first = collector._fetch_page(1, 1, rate_limiter)
+    second = collector._fetch_page(1, 1, rate_limiter)
+    
+    assert first == second
+    assert collector.session.request.call_count == 1
+    assert rate_limiter.acquire.call_count == 1
+
+
+def test_delay_is_used_as_rate():
+    """Test that the delay option becomes the token bucket rate."""
+    collector = CarsComCollector(config={"max_pages": 1, "delay": 0.5})
+    assert collector._create_rate_limiter().rate == 2.0
+    
+    collector = CarsComCollector(config={"max_pages": 1, "delay": 0.5, "rate": 5.0, "burst": 3})
+    bucket = collector._create_rate_limiter()
+    assert (bucket.rate, bucket.burst) == (5.0, 3)
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+def test_parser_backends_extract_identical_listings(parser):
+    """Test that every parser backend extracts the same listings from a saved page."""
+    with open(FIXTURE_PATH, encoding="utf-8") as f:
+        html = f.read()
+    
+    baseline = CarsComCollector(config={"max_pages": 1, "delay": 0})
+    collector = CarsComCollector(config={"max_pages": 1, "delay": 0, "parser": parser})
+    
+    expected = baseline._extract_listings(baseline._parse_html(html))
+    listings = collector._extract_listings(collector._parse_html(html))
+    
+    assert len(listings) == 24
+    assert listings == expected
+    assert listings[0]["url"] == "https://www.cars.com/vehicledetail/100000/"
+    assert listings[7]["year"] is None
+
+
+def test_invalid_parser_is_rejected():
+    """Test that an unknown parser backend fails validation."""
+    collector = CarsComCollector(config={"max_pages": 1, "delay": 0, "parser": "regex"})
+    assert collector.validate_config() is False
@@ -0,0 +1,148 @@
+"""
+Tests for the collect_data orchestrator using fake collectors.
+"""
+
+import json
+import time
+
+import pytest
+
+from data.collect_data import collect_data, get_collector_specs, run_collector
+from data.records import ListingBatch
+from src.data.jsonl_archive import iter_json_lines
+from src.data.listing_store import ListingStore
+from src.data.collectors.base_collector import BaseCollector
+from src.services.metrics import ClientMetrics
+
+
+class SlowCollector(BaseCollector):
+    """Collector that waits before returning a single page."""
+    
+    def __init__(self, config=None):
+        super().__init__(config["name"], config)
+    
+    def validate_config(self):
+        return True
+    
+    def iter_pages(self):
+        time.sleep(self.config.get("sleep", 0))
+        yield [
+            {
+                "title": f"Toyota Corolla {self.name}",
+                "price": 20000.0,
+                "year": 2020,
+                "mileage": 10000,
+                "source": self.name,
+                "url": f"https://example.test/{self.name}",
+            }
+        ]
+
+
+class BrokenCollector(SlowCollector):
+    """Collector whose crawl fails."""
+    
+    def iter_pages(self):
+        raise RuntimeError("source unavailable")
+        yield []
+
+
+def test_collectors_run_concurrently(tmp_path):
+    """Test that total time approaches the slowest collector rather than the sum."""
+    specs = [(SlowCollector, {"name": f"source_{i}", "sleep": 0.3}) for i in range(3)]
+    
+    start = time.perf_counter()
+    data = collect_data(output_dir=str(tmp_path), config={"collectors": specs})
+    elapsed = time.perf_counter() - start
+    
+    assert [item["source"] for item in data] == ["source_0", "source_1", "source_2"]
+    assert elapsed < 0.8
+
+
+def test_failing_collector_is_isolated(tmp_path):
+    """Test that one failing collector does not affect the others."""
+    specs = [
+        (BrokenCollector, {"name": "broken"}),
+        (SlowCollector, {"name": "healthy"}),
+    ]
+    
+    data = collect_data(output_dir=str(tmp_path), config={"collectors": specs})
+    
+    assert [item["source"] for item in data] == ["healthy"]
+
+
+def test_unknown_executor_is_rejected(tmp_path):
+    """Test that only thread and process pools are accepted."""
+    with pytest.raises(ValueError):
+        collect_data(output_dir=str(tmp_path), config={"collectors": [], "executor": "fiber"})
+
+
+class MeteredCollector(SlowCollector):
+    """Collector reporting request metrics."""
+    
+    def get_metrics(self):
+        metrics = ClientMetrics()
+        metrics.record("catalog", 200, 0.2, size=10)
+        return metrics.snapshot()
+
+
+def test_client_metrics_are_written(tmp_path):
+    """Test that collector request metrics are exported at the end of a run."""
+    specs = [(MeteredCollector, {"name": "metered"}), (SlowCollector, {"name": "plain"})]
+    
+    collect_data(output_dir=str(tmp_path), config={"collectors": specs})
+    
+    json_files = list(tmp_path.glob("metrics_*.json"))
+    prom_files = list(tmp_path.glob("metrics_*.prom"))
+    assert len(json_files) == 1 and len(prom_files) == 1
+    assert list(json.loads(json_files[0].read_text())) == ["metered"]
+    assert 'client="metered"' in prom_files[0].read_text()
+
+
+def test_process_workers_match_page_processing(tmp_path):
+    """Test that processing the whole crawl in worker processes gives the same data."""
+    specs = [(SlowCollector, {"name": f"source_{i}"}) for i in range(2)]
+    
+    expected = collect_data(output_dir=str(tmp_path / "pages"), config={"collectors": specs})
+    data = collect_data(output_dir=str(tmp_path / "workers"), config={"collectors": specs, "process_workers": 2})
+    
+    assert data == expected
+
+
+def test_results_are_only_packed_for_processes(tmp_path):
+    """Test that listings are packed into columns only when they cross a process boundary."""
+    specs = [(SlowCollector, {"name": f"source_{i}"}) for i in range(2)]
+    
+    result = run_collector(SlowCollector, {"name": "source_0"}, str(tmp_path / "run"))
+    packed = run_collector(SlowCollector, {"name": "source_0"}, str(tmp_path / "run"), pack_results=True)
+    assert isinstance(result["valid_data"], list)
+    assert isinstance(packed["valid_data"], ListingBatch)
+    assert packed["valid_data"].to_records() == result["valid_data"]
+    
+    expected = collect_data(output_dir=str(tmp_path / "threads"), config={"collectors": specs})
+    data = collect_data(output_dir=str(tmp_path / "processes"), config={"collectors": specs, "executor": "process"})
+    assert data == expected
+
+
+def test_listings_are_written_to_datasets(tmp_path):
+    """Test that listings go to the partitioned datasets and raw listings are only archived on demand."""
+    specs = [(SlowCollector, {"name": "source_0"})]
+    
+    collect_data(output_dir=str(tmp_path / "default"), config={"collectors": specs})
+    collect_data(output_dir=str(tmp_path / "archive"), config={"collectors": specs, "archive_raw": True})
+    
+    for dataset in ["listings", "all_listings"]:
+        assert len(list((tmp_path / "default" / dataset / "source=source_0").glob("date=*/part-*"))) == 1
+    assert not (tmp_path / "default" / "raw").exists()
+    
+    archived = list(iter_json_lines(str(tmp_path / "archive" / "raw" / "source_0_*-*.jsonl*")))
+    assert [record["title"] for record in archived] == ["Toyota Corolla source_0"]
+    
+    # Both runs upsert the same listing into the store shared by the output directories
+    with ListingStore(str(tmp_path / "listings.db")) as store:
+        assert store.query(columns=["source", "id"]).values.tolist() == [["source_0", "https://example.test/source_0"]]
+
+
+def test_default_collectors_fetch_concurrently(tmp_path):
+    """Test that every default collector is configured to fetch pages or details concurrently."""
+    for collector_class, config in get_collector_specs(str(tmp_path / "raw")):
+        assert config.get("max_workers", 1) > 1, collector_class.__name__
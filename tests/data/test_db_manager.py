@@ -1,12 +1,12 @@
 import pytest
-import pandas as pd
-import os
+import requests
+from unittest.mock import MagicMock
 from src.data.db_manager import DBManager
 
 @pytest.fixture
-def db_manager():
+def db_manager(tmp_path):
     """Create a DBManager instance for testing."""
-    return DBManager(db_dir="tests/data/test_db")
+    return DBManager(db_dir="tests/data/test_db", logo_cache_dir=str(tmp_path / "logos"))
 
 def test_get_brands(db_manager):
     """Test getting all brands."""
@@ -61,4 +61,87 @@ def test_get_brand_logo(db_manager):
     logo = db_manager.get_brand_logo("Toyota")
     assert logo is not None
     assert isinstance(logo, bytes)
-    assert len(logo) > 0 
\ No newline at end of file
+    assert len(logo) > 0
+
+
+@pytest.fixture
+def logo_response(http_response):
+    """Create the logo response returned by the mocked session."""
+    return http_response(body=b"logo", url="https://example.test/logo.png")
+
+
+@pytest.fixture
+def logo_managers(tmp_path, logo_response):
+    """Create DBManagers sharing a logo cache whose requests go to a mocked session."""
+    def create():
+        manager = DBManager(db_dir="tests/data/test_db", logo_cache_dir=str(tmp_path / "logos"))
+        manager._get_logo_cache()
+        manager._logo_session = MagicMock()
+        manager._logo_session.request.return_value = logo_response
+        return manager
+    return create
+
+
+@pytest.fixture
+def logo_manager(logo_managers):
+    """Create a DBManager whose logo requests go to a mocked session."""
+    return logo_managers()
+
+
+def test_brand_logo_is_cached_in_memory(logo_manager):
+    """Test that a logo is only requested once with a timeout."""
+    assert logo_manager.get_brand_logo("Toyota") == b"logo"
+    assert logo_manager.get_brand_logo("Toyota") == b"logo"
+    assert logo_manager._logo_session.request.call_count == 1
+    assert logo_manager._logo_session.request.call_args.kwargs["timeout"] == logo_manager.logo_timeout
+
+
+def test_brand_logo_is_cached_on_disk(logo_managers, logo_response):
+    """Test that a new DBManager reads cached logos without network requests."""
+    logo_managers().get_brand_logo("Toyota")
+    logo_response._content = b"other"
+    manager = logo_managers()
+    assert manager.get_brand_logo("Toyota") == b"logo"
+    manager._logo_session.request.assert_not_called()
+
+
+def test_stale_logo_is_served_when_offline(logo_managers):
+    """Test that a stale cached logo is used if revalidation fails."""
+    logo_managers().get_brand_logo("Toyota")
+    manager = logo_managers()
+    manager._logo_cache.ttl = 0
+    manager._logo_session.request.side_effect = requests.ConnectionError("offline")
+    assert manager.get_brand_logo("Toyota") == b"logo"
+
+
+def test_failed_logo_is_not_requested_again(logo_manager, logo_response):
+    """Test that missing logos are remembered instead of refetched on every rerun."""
+    logo_response.status_code = 404
+    assert logo_manager.get_brand_logo("Toyota") is None
+    logo_manager._logo_session.request.side_effect = requests.ConnectionError("offline")
+    assert logo_manager.prefetch_logos() == 0
+    calls = logo_manager._logo_session.request.call_count
+    assert logo_manager.get_brand_logo("Toyota") is None
+    assert logo_manager.prefetch_logos() == 0
+    assert logo_manager._logo_session.request.call_count == calls
+
+
+def test_prefetch_logos(logo_manager):
+    """Test that logos of all brands are loaded by the prefetch."""
+    assert logo_manager.prefetch_logos() == len(logo_manager.get_brands())
+    calls = logo_manager._logo_session.request.call_count
+    logo_manager.prefetch_logos()
+    assert logo_manager._logo_session.request.call_count == calls
+
+
+def test_logo_failing_with_network_error_is_retried(logo_manager):
+    """Test that logos failing with a network error are requested again after the retry delay."""
+    logo_manager._logo_session.request.side_effect = requests.ConnectionError("offline")
+    assert logo_manager.get_brand_logo("Toyota") is None
+    calls = logo_manager._logo_session.request.call_count
+    assert logo_manager.get_brand_logo("Toyota") is None
+    assert logo_manager._logo_session.request.call_count == calls
+    
+    logo_manager._missing_logos["Toyota"] = 0
+    logo_manager._logo_session.request.side_effect = None
+    assert logo_manager.get_brand_logo("Toyota") == b"logo"
@@ -0,0 +1,123 @@
+"""
+Tests for the near-duplicate listing detector.
+"""
+
+import pytest
+
+from src.data.processors.deduplicator import ListingDeduplicator, average_hash
+
+
+def make_listing(title, mileage=50000, year=2020, price=100000.0, **fields):
+    """Build a processed listing of a Toyota Corolla."""
+    return {
+        "title": title,
+        "brand": "Toyota",
+        "model": "Corolla",
+        "year": year,
+        "mileage": mileage,
+        "price": price,
+        **fields,
+    }
+
+
+def test_cross_source_duplicates_are_clustered():
+    """Test that the same car listed with reordered titles and close mileages is one cluster."""
+    records = [
+        make_listing("Toyota Corolla XEi 2.0 Flex 2020", mileage=49900, source="cars.com"),
+        make_listing("Honda Civic EXL", source="cars.com"),
+        make_listing("2020 Toyota Corolla XEi 2.0 Flex", mileage=50100, source="webmotors"),
+        make_listing("Toyota Corolla XEi 2.0 Flex 2020", year=2019, source="webmotors"),
+    ]
+    
+    assert ListingDeduplicator().cluster(records) == [0, 1, 0, 2]
+
+
+def test_description_and_features_are_compared():
+    """Test that listings with the same title but different descriptions are kept apart."""
+    features = ["Airbag", "ABS", "Multimedia"]
+    records = [
+        make_listing("Toyota Corolla", description="Único dono, revisado na concessionária", features=features),
+        make_listing("Toyota Corolla", description="Unico dono revisado na concessionaria", features=features),
+        make_listing("Toyota Corolla", description="Batido, motor retificado, vendo no estado", features=["Som"]),
+    ]
+    
+    assert ListingDeduplicator().cluster(records) == [0, 0, 1]
+
+
+def test_same_source_listings_are_kept_apart():
+    """Test that templated titles of one source only merge for the same listing."""
+    records = [
+        make_listing("2020 Toyota Corolla LE", price=18000.0, source="cars.com", id="a", url="https://example.test/a"),
+        make_listing("2020 Toyota Corolla LE", price=24000.0, source="cars.com", id="b", url="https://example.test/b"),
+        make_listing("2020 Toyota Corolla LE", price=24000.0, source="cars.com", id="c", url="https://example.test/c"),
+        make_listing("2020 Toyota Corolla LE", price=9000.0, source="cars.com", id="d", url="https://example.test/d"),
+        make_listing("2020 Toyota Corolla LE", price=24000.0, source="cars.com", id="b", url="https://example.test/b"),
+    ]
+    
+    assert ListingDeduplicator().cluster(records) == [0, 1, 2, 3, 1]
+
+
+@pytest.mark.parametrize("changes", [
+    {"price": 90000.0},
+    {"mileage": 53000},
+    {"mileage": None, "price": 80000.0},
+])
+def test_text_matches_need_close_price_and_mileage(changes):
+    """Test that listings with the same text but different prices or mileages are not merged."""
+    records = [
+        make_listing("Toyota Corolla XEi 2.0 Flex", source="cars.com"),
+        make_listing("Toyota Corolla XEi 2.0 Flex", source="webmotors", **changes),
+    ]
+    
+    assert ListingDeduplicator().cluster(records) == [0, 1]
+
+
+def test_listings_without_mileage_are_blocked_by_price():
+    """Test that listings without mileage are only merged with listings of a close price."""
+    records = [
+        make_listing("Toyota Corolla XEi", mileage=None, price=100000.0, source="cars.com"),
+        make_listing("Toyota Corolla XEi", mileage=None, price=98000.0, source="webmotors"),
+        make_listing("Toyota Corolla XEi", mileage=None, price=60000.0, source="webmotors"),
+        make_listing("Toyota Corolla XEi", mileage=None, price=None, source="webmotors"),
+    ]
+    deduplicator = ListingDeduplicator()
+    
+    assert deduplicator._block(records[0])[1] != deduplicator._block(records[2])[1]
+    assert deduplicator.cluster(records) == [0, 0, 1, 2]
+
+
+def test_deduplicate_keeps_first_listing():
+    """Test that the first listing of each cluster is kept with its cluster size."""
+    records = [
+        make_listing("Toyota Corolla XEi", url="first"),
+        make_listing("Toyota Corolla XEi", url="second"),
+        make_listing("Toyota Corolla GLi", mileage=120000, url="third"),
+    ]
+    
+    unique = ListingDeduplicator().deduplicate(records)
+    
+    assert [(record["url"], record["cluster_id"], record["cluster_size"]) for record in unique] == [
+        ("first", 0, 2),
+        ("third", 1, 1),
+    ]
+    assert "cluster_id" not in records[0]
+
+
+def test_image_hashes_match_listings(tmp_path):
+    """Test that listings sharing a photo are duplicates only when their prices agree."""
+    Image = pytest.importorskip("PIL.Image")
+    
+    photo = Image.new("L", (64, 64))
+    photo.paste(255, (0, 0, 32, 64))
+    original, resized = str(tmp_path / "original.png"), str(tmp_path / "resized.jpg")
+    photo.save(original)
+    photo.resize((48, 48)).save(resized)
+    
+    records = [
+        make_listing("Corolla seminovo", price=100000.0, image_paths=[original]),
+        make_listing("Toyota sedan automático", price=101000.0, image_paths=[resized]),
+        make_listing("Carro de garagem", price=150000.0, image_paths=[original]),
+    ]
+    
+    assert average_hash(original) == average_hash(resized)
+    assert ListingDeduplicator().cluster(records) == [0, 0, 1]
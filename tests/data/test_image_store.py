@@ -0,0 +1,90 @@
+"""
+Tests for the content-addressed listing image store.
+"""
+
+import io
+import os
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from src.data import image_store as image_store_module
+from src.data.image_store import ImageStore
+
+
+def make_png(color="red", size=(640, 480)):
+    """Build PNG bytes, or fake bytes if Pillow is not installed."""
+    if image_store_module.Image is None:
+        return f"png-{color}".encode()
+    buffer = io.BytesIO()
+    image_store_module.Image.new("RGB", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def make_session(contents):
+    """Build a mocked session serving the given bytes per URL."""
+    def get(url, timeout=None):
+        response = MagicMock()
+        if url not in contents:
+            response.raise_for_status.side_effect = requests.HTTPError("404")
+        response.content = contents.get(url, b"")
+        response.headers = {"Content-Type": "image/png"}
+        return response
+    
+    session = MagicMock()
+    session.get.side_effect = get
+    return session
+
+
+def test_identical_images_are_stored_once(tmp_path):
+    """Test that images with the same content share one file."""
+    red = make_png("red")
+    session = make_session({"https://a.test/1.png": red, "https://b.test/stock.png": red})
+    store = ImageStore(root=str(tmp_path), session=session)
+    
+    paths = store.prefetch(["https://a.test/1.png", "https://b.test/stock.png", "https://a.test/1.png"])
+    
+    assert paths["https://a.test/1.png"] == paths["https://b.test/stock.png"]
+    assert paths["https://a.test/1.png"].endswith(".png")
+    assert session.get.call_count == 2
+    assert len(os.listdir(os.path.dirname(paths["https://a.test/1.png"]))) == 1
+
+
+def test_index_avoids_downloads_across_runs(tmp_path):
+    """Test that stored URLs are served from disk by a new store."""
+    session = make_session({"https://a.test/1.png": make_png()})
+    ImageStore(root=str(tmp_path), session=session).prefetch(["https://a.test/1.png"])
+    
+    other_session = make_session({})
+    store = ImageStore(root=str(tmp_path), session=other_session)
+    
+    assert store.prefetch(["https://a.test/1.png"])
+    other_session.get.assert_not_called()
+
+
+def test_failed_downloads_are_skipped(tmp_path):
+    """Test that failing URLs are left out of the result."""
+    store = ImageStore(root=str(tmp_path), session=make_session({"https://a.test/1.png": make_png()}))
+    
+    paths = store.prefetch(["https://a.test/1.png", "https://a.test/missing.png"])
+    
+    assert list(paths) == ["https://a.test/1.png"]
+    assert store.get_path("https://a.test/missing.png") is None
+
+
+def test_thumbnails_are_generated(tmp_path):
+    """Test that a bounded JPEG thumbnail is created for every image."""
+    Image = pytest.importorskip("PIL.Image")
+    store = ImageStore(
+        root=str(tmp_path),
+        thumbnail_size=(160, 120),
+        session=make_session({"https://a.test/1.png": make_png(size=(640, 480))}),
+    )
+    
+    store.prefetch(["https://a.test/1.png"])
+    thumbnail = store.get_thumbnail_path("https://a.test/1.png")
+    
+    with Image.open(thumbnail) as image:
+        assert image.format == "JPEG"
+        assert image.size == (160, 120)
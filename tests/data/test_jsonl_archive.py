@@ -0,0 +1,71 @@
+"""
+Tests for the streaming JSON Lines archive.
+"""
+
+import gzip
+import json
+
+import pytest
+
+from src.data import jsonl_archive
+from src.data.jsonl_archive import JsonLinesWriter, iter_json_lines
+
+RECORDS = [
+    {"title": "Toyota Corolla", "price": 98000.5, "year": 2020, "features": ["ABS", "Airbag"]},
+    {"title": "Citroën C3", "price": None, "images": [{"url": "https://example.test/1.jpg"}]},
+]
+
+
+@pytest.mark.parametrize("serializer", ["json", "orjson"])
+@pytest.mark.parametrize("compression", ["gzip", "zstd", None])
+def test_round_trip(tmp_path, compression, serializer):
+    """Test that pages written with each compression and serializer read back unchanged."""
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    if serializer == "orjson":
+        pytest.importorskip("orjson")
+    
+    with JsonLinesWriter(str(tmp_path / "raw" / "run"), compression=compression, serializer=serializer) as writer:
+        writer.write(RECORDS)
+        writer.write(RECORDS[:1])
+    
+    assert writer.rows == 3
+    assert len(writer.paths) == 1
+    assert list(iter_json_lines(writer.paths)) == RECORDS + RECORDS[:1]
+
+
+def test_gzip_lines(tmp_path):
+    """Test that gzip archives hold one compact JSON object per line."""
+    with JsonLinesWriter(str(tmp_path / "run"), compression="gzip", serializer="json") as writer:
+        writer.write(RECORDS)
+    
+    assert writer.paths == [str(tmp_path / "run-0000.jsonl.gz")]
+    with gzip.open(writer.paths[0], "rt", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line) for line in lines] == RECORDS
+    assert ", " not in lines[0]
+
+
+def test_rotation_by_size(tmp_path):
+    """Test that a new file is started once the current one reaches the size limit."""
+    with JsonLinesWriter(str(tmp_path / "run"), compression=None, max_bytes=100) as writer:
+        for record in RECORDS * 3:
+            writer.write([record])
+    
+    assert len(writer.paths) > 1
+    assert writer.paths[1] == str(tmp_path / "run-0001.jsonl")
+    assert list(iter_json_lines(str(tmp_path / "run-*.jsonl"))) == RECORDS * 3
+
+
+def test_auto_options_without_optional_packages(tmp_path, monkeypatch):
+    """Test that gzip and the standard library are used without zstandard and orjson."""
+    monkeypatch.setattr(jsonl_archive, "zstandard", None)
+    monkeypatch.setattr(jsonl_archive, "orjson", None)
+    
+    with JsonLinesWriter(str(tmp_path / "run")) as writer:
+        writer.write(RECORDS)
+    
+    assert writer.paths == [str(tmp_path / "run-0000.jsonl.gz")]
+    assert list(iter_json_lines(writer.paths)) == RECORDS
+    with pytest.raises(ImportError):
+        JsonLinesWriter(str(tmp_path / "run"), compression="zstd")
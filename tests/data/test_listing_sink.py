@@ -0,0 +1,52 @@
+"""
+Tests for the partitioned listing sink.
+"""
+
+import gzip
+import json
+
+import pytest
+
+from src.data.listing_sink import ListingSink, read_listings
+
+RECORDS = [
+    {"title": "Toyota Corolla", "price": 98000.5, "year": 2020, "mileage": 15000, "source": "webmotors"},
+    {"title": "Honda Civic", "price": 70000, "mileage": 1200.5, "source": "cars.com", "features": ["ABS"]},
+]
+
+
+def test_parquet_partitions_and_columns(tmp_path):
+    """Test that pages are appended to Parquet partitions sharing one schema."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    
+    with ListingSink(str(tmp_path), run_id="run", date="2024-01-31") as sink:
+        sink.write(RECORDS)
+        sink.write(RECORDS[:1])
+    
+    webmotors = tmp_path / "source=webmotors" / "date=2024-01-31" / "part-run.parquet"
+    cars_com = tmp_path / "source=cars.com" / "date=2024-01-31" / "part-run.parquet"
+    assert sorted(sink.paths) == sorted([str(webmotors), str(cars_com)])
+    assert pq.ParquetFile(str(webmotors)).num_row_groups == 2
+    assert pq.read_schema(str(webmotors)) == pq.read_schema(str(cars_com))
+    
+    frame = read_listings(str(tmp_path), columns=["title", "year", "mileage", "extra"], sources=["cars.com"])
+    
+    assert list(frame.columns) == ["title", "year", "mileage", "extra"]
+    assert frame["title"].tolist() == ["Honda Civic"]
+    # Fractional values of integer columns are kept in the extra column
+    assert json.loads(frame["extra"].iloc[0]) == {"features": ["ABS"], "mileage": 1200.5}
+
+
+def test_json_lines_fallback(tmp_path):
+    """Test that gzipped JSON Lines keep the same layout without Parquet."""
+    with ListingSink(str(tmp_path), run_id="run", date="2024-01-31", use_parquet=False) as sink:
+        sink.write(RECORDS)
+    
+    path = tmp_path / "source=webmotors" / "date=2024-01-31" / "part-run.jsonl.gz"
+    with gzip.open(path, "rt") as f:
+        assert [json.loads(line) for line in f] == RECORDS[:1]
+    
+    frame = read_listings(str(tmp_path), columns=["title", "price"], dates=["2024-01-31"])
+    
+    assert sorted(frame["title"]) == ["Honda Civic", "Toyota Corolla"]
+    assert read_listings(str(tmp_path), dates=["2024-02-01"]).empty
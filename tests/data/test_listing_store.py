@@ -0,0 +1,88 @@
+"""
+Tests for the SQLite listing store.
+"""
+
+import pytest
+
+from src.data.listing_store import ListingStore
+
+RECORDS = [
+    {"id": 1, "source": "webmotors", "brand": "Toyota", "model": "Corolla", "year": 2020, "price": 98000.0,
+     "mileage": 15000, "location": {"state": "SP"}, "features": ["ABS"]},
+    {"id": 2, "source": "webmotors", "brand": "Toyota", "model": "Corolla", "year": 2019, "price": 85000.0,
+     "mileage": 40000, "location": {"state": "RJ"}},
+    {"source": "cars.com", "brand": "Honda", "model": "Civic", "year": 2020, "price": 20000.0,
+     "mileage": "n/a", "url": "https://example.test/civic"},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a store in a temporary database."""
+    with ListingStore(str(tmp_path / "listings.db")) as listing_store:
+        yield listing_store
+
+
+def test_upsert_skips_unchanged_listings(store):
+    """Test that only new and changed listings are written, keyed by source and ID."""
+    assert store.upsert(RECORDS, seen_at="2024-01-01T00:00:00") == {
+        "inserted": 3, "updated": 0, "unchanged": 0, "skipped": 0,
+    }
+    
+    # Cluster fields change between runs without the listing changing
+    changed = [{**RECORDS[0], "price": 95000.0}, {**RECORDS[1], "cluster_id": 7}, RECORDS[2], {"title": "No key"}]
+    assert store.upsert(changed, seen_at="2024-02-01T00:00:00") == {
+        "inserted": 0, "updated": 1, "unchanged": 2, "skipped": 1,
+    }
+    
+    assert store.count() == 3
+    assert store.get("webmotors", 1)["price"] == 95000.0
+    assert store.get("cars.com", "https://example.test/civic")["model"] == "Civic"
+    assert store.get("webmotors", 3) is None
+    
+    rows = store.query(columns=["id", "first_seen", "updated_at"], order_by="id", source="webmotors")
+    assert rows.values.tolist() == [
+        ["1", "2024-01-01T00:00:00", "2024-02-01T00:00:00"],
+        ["2", "2024-01-01T00:00:00", "2024-01-01T00:00:00"],
+    ]
+
+
+def test_query_filters(store):
+    """Test the filters, ordering and aggregates of the query API."""
+    store.upsert(RECORDS, seen_at="2024-01-15T00:00:00")
+    store.upsert([{**RECORDS[0], "id": 3, "price": 90000.0}], seen_at="2024-02-15T00:00:00")
+    
+    # Text filters ignore case, and the state is taken from the location
+    rows = store.query(brand="toyota", state="SP", order_by="price", descending=True)
+    assert rows["id"].tolist() == ["1", "3"]
+    assert store.query(brand=["Honda", "Ford"], max_price=30000)["model"].tolist() == ["Civic"]
+    assert store.query(min_year=2020, max_mileage=20000, limit=1)["price"].tolist() == [90000.0]
+    assert store.query(brand=[]).empty
+    
+    # Malformed numbers stay in the listing data only
+    assert store.query(columns=["mileage"], source="cars.com")["mileage"].isna().all()
+    
+    assert store.price_summary(brand="Toyota", model="Corolla", year=2020) == {
+        "count": 2, "min": 90000.0, "mean": 94000.0, "max": 98000.0,
+    }
+    assert store.price_summary(brand="Fiat")["count"] == 0
+    assert store.price_history(brand="Toyota").values.tolist() == [["2024-01", 2, 91500.0], ["2024-02", 1, 90000.0]]
+    assert store.distinct("brand") == ["Honda", "Toyota"]
+    assert store.distinct("state", brand="Toyota") == ["RJ", "SP"]
+
+
+def test_query_rejects_unknown_names(store):
+    """Test that only known filters and columns reach the SQL."""
+    with pytest.raises(ValueError):
+        store.query(color="red")
+    with pytest.raises(ValueError):
+        store.query(order_by="price; DROP TABLE listings")
+
+
+def test_indexes_are_used(store):
+    """Test that filters on the indexed columns do not scan the table."""
+    plan = store._connection.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM listings WHERE brand = ? AND model = ? AND year = ?",
+        ("Toyota", "Corolla", 2020),
+    ).fetchall()
+    assert "idx_listings_brand_model_year" in str(plan)
@@ -0,0 +1,70 @@
+"""
+Tests for the parallel process and validate executor.
+"""
+
+import pandas as pd
+
+from src.data.processors.car_processor import CarProcessor
+from src.data.processors.parallel import ParallelFrameExecutor, decode_frame, encode_frame, frame_to_records
+from src.data.validators.car_validator import CarValidator
+
+
+def make_frame(count):
+    """Build a frame of cars, every fifth of which has a negative price."""
+    return pd.DataFrame([
+        {
+            "title": f"Toyota Corolla {2010 + index % 10}",
+            "price": -1.0 if index % 5 == 0 else 20000.0 + index,
+            "mileage": index * 10,
+            "source": "test",
+            "url": f"https://example.test/{index}",
+        }
+        for index in range(count)
+    ])
+
+
+def test_parallel_run_matches_single_process():
+    """Test that chunked results are reassembled in order and match a single pass."""
+    frame = make_frame(1000)
+    expected_valid, expected_invalid, expected_counts = CarValidator().validate_frame(
+        CarProcessor().process_frame(frame)
+    )
+    
+    executor = ParallelFrameExecutor(max_workers=2, chunk_size=150)
+    valid, invalid, counts = executor.run(frame)
+    
+    pd.testing.assert_frame_equal(valid, expected_valid, check_dtype=False)
+    pd.testing.assert_frame_equal(invalid, expected_invalid, check_dtype=False)
+    assert counts == expected_counts
+
+
+def test_parallel_run_keeps_list_fields():
+    """Test that list and nested fields come back as Python objects from the worker chunks."""
+    frame = make_frame(10)
+    frame["features"] = [["ABS", "Airbag"][:index % 3] for index in range(10)]
+    frame["images"] = [[{"url": f"https://example.test/{index}.jpg", "tags": ["front"]}] for index in range(10)]
+    frame["location"] = [{"state": "SP", "city": "Campinas"}] * 10
+    
+    valid, _, _ = ParallelFrameExecutor(max_workers=2, chunk_size=3).run(frame)
+    records = frame_to_records(valid)
+    
+    assert records
+    for record in records:
+        index = int(record["url"].rsplit("/", 1)[1])
+        assert record["features"] == ["ABS", "Airbag"][:index % 3]
+        assert record["images"] == [{"url": f"https://example.test/{index}.jpg", "tags": ["front"]}]
+        assert record["location"] == {"state": "SP", "city": "Campinas"}
+
+
+def test_encode_frame_round_trip():
+    """Test that a frame with mixed-type columns survives serialization."""
+    frame = pd.DataFrame({"title": ["A", None], "price": [1.5, "cheap"]}, index=[3, 7])
+    
+    pd.testing.assert_frame_equal(decode_frame(encode_frame(frame)), frame)
+
+
+def test_frame_to_records_drops_missing_values():
+    """Test that missing values are converted back to absent keys."""
+    frame = pd.DataFrame([{"title": "A", "year": 2020.0}, {"title": "B", "year": None}])
+    
+    assert frame_to_records(frame) == [{"title": "A", "year": 2020.0}, {"title": "B"}]
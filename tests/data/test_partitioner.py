@@ -0,0 +1,147 @@
+"""
+Tests for search-space partitioning of catalog crawls.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from src.data.collectors.partitioner import SearchPartitioner, VehicleDeduplicator, crawl_shards
+from src.data.db_manager import DBManager
+
+
+def test_partition_expands_free_dimensions():
+    """Test that shards cover every combination of the dimensions not fixed by the filters."""
+    partitioner = SearchPartitioner({"brand": ["Toyota", "Honda"], "year": [2020, 2021], "state": ["SP"]})
+    
+    shards = partitioner.partition({"brand": "Toyota", "model": "Corolla"})
+    
+    assert shards == [
+        {"brand": "Toyota", "model": "Corolla", "year": 2020, "state": "SP"},
+        {"brand": "Toyota", "model": "Corolla", "year": 2021, "state": "SP"},
+    ]
+
+
+def test_partitioner_from_db_manager():
+    """Test that reference values come from DBManager unless overridden."""
+    db_manager = MagicMock()
+    db_manager.get_brands.return_value = ["Toyota", "Honda"]
+    db_manager.get_years.return_value = [2019, 2020]
+    
+    partitioner = SearchPartitioner.from_db_manager(
+        ["brand", "year"],
+        db_manager=db_manager,
+        values={"year": [2023]},
+    )
+    
+    assert partitioner.values == {"brand": ["Toyota", "Honda"], "year": [2023]}
+    db_manager.get_years.assert_not_called()
+
+
+def test_deduplicator_claims_once():
+    """Test that each vehicle can only be claimed once."""
+    seen = VehicleDeduplicator()
+    
+    assert seen.claim("1")
+    assert seen.claim(2)
+    assert not seen.claim(1)
+    assert len(seen) == 2
+    assert seen.duplicates == 1
+
+
+def test_deduplicator_release():
+    """Test that a released vehicle can be claimed again."""
+    seen = VehicleDeduplicator()
+    
+    assert seen.claim("1")
+    seen.release(1)
+    assert seen.claim("1")
+    assert len(seen) == 1
+
+
+def test_partitioner_shards_states_by_abbreviation(tmp_path):
+    """Test that state shards use the abbreviations found in listings and API filters."""
+    db_manager = DBManager(db_dir="tests/data/test_db", logo_cache_dir=str(tmp_path / "logos"))
+    
+    partitioner = SearchPartitioner.from_db_manager(["state"], db_manager=db_manager)
+    
+    assert "SP" in partitioner.values["state"]
+    assert "São Paulo" not in partitioner.values["state"]
+
+
+def test_crawl_shards_runs_in_parallel():
+    """Test that shards are crawled concurrently and all pages are merged."""
+    def crawl(shard):
+        for page in range(2):
+            time.sleep(0.1)
+            yield [f"{shard['year']}-{page}"]
+    
+    shards = [{"year": year} for year in range(4)]
+    start = time.perf_counter()
+    pages = list(crawl_shards(shards, crawl, max_workers=4))
+    elapsed = time.perf_counter() - start
+    
+    assert sorted(item for page in pages for item in page) == sorted(
+        f"{year}-{page}" for year in range(4) for page in range(2)
+    )
+    assert elapsed < 0.6
+
+
+def test_crawl_shards_isolates_failing_shard():
+    """Test that a failing shard does not stop the others."""
+    def crawl(shard):
+        if shard["year"] == 1:
+            raise RuntimeError("boom")
+        yield [shard["year"]]
+    
+    pages = list(crawl_shards([{"year": year} for year in range(3)], crawl, max_workers=2))
+    
+    assert sorted(pages) == [[0], [2]]
+
+
+def test_shard_resumes_after_page_is_handled():
+    """Test that a shard crawl only moves past a page once the consumer asks for the next one."""
+    checkpoints = []
+    
+    def crawl(shard):
+        for page in range(2):
+            yield [page]
+            checkpoints.append(page)
+    
+    pages = crawl_shards([{"year": 2020}], crawl, max_workers=1)
+    assert next(pages) == [0]
+    time.sleep(0.3)
+    assert checkpoints == []
+    
+    assert next(pages) == [1]
+    assert checkpoints == [0]
+    pages.close()
+    assert checkpoints == [0]
+
+
+def test_closing_crawl_stops_workers():
+    """Test that closing the merged generator stops the shard workers."""
+    def crawl(shard):
+        for page in range(1000):
+            yield [page]
+    
+    pages = crawl_shards([{"year": year} for year in range(3)], crawl, max_workers=3)
+    next(pages)
+    pages.close()
+    
+    assert threading.active_count() < 10
+
+
+def test_crawl_shards_closes_without_cancel_futures(monkeypatch):
+    """Test that stopping a crawl early does not need the Python 3.9 shutdown arguments."""
+    shutdown = ThreadPoolExecutor.shutdown
+    monkeypatch.setattr(ThreadPoolExecutor, "shutdown", lambda self, wait=True: shutdown(self, wait))
+    
+    def crawl(shard):
+        while True:
+            yield [shard["year"]]
+    
+    pages = crawl_shards([{"year": year} for year in range(4)], crawl, max_workers=2)
+    next(pages)
+    pages.close()
@@ -0,0 +1,78 @@
+"""
+Tests for the compact listing representations.
+"""
+
+import pickle
+
+import pandas as pd
+
+from src.data.processors.car_processor import CarProcessor
+from src.data.records import ListingBatch
+
+
+def make_records():
+    """Build listings covering absent, None, int, float and non-column values."""
+    return [
+        {
+            "id": "wm-1",
+            "title": "Toyota Corolla XEi",
+            "brand": "Toyota",
+            "model": "Corolla",
+            "year": 2020,
+            "price": 98000.5,
+            "mileage": 15000,
+            "source": "webmotors",
+            "url": "https://example.test/1",
+            "features": ["ABS", "Airbag"],
+            "seller": {"name": "Loja"},
+        },
+        {"title": "Honda Civic", "price": 70000, "year": None, "source": "cars.com"},
+        {"title": "Fiat Uno", "price": "cheap", "mileage": 2 ** 60, "brand": None, "id": 42},
+        {},
+    ]
+
+
+def test_batch_round_trip():
+    """Test that a batch converts back to the original dictionaries."""
+    records = make_records()
+    
+    batch = ListingBatch.from_records(records)
+    
+    assert len(batch) == 4
+    assert batch.to_records() == records
+    assert [type(record.get("price")) for record in batch] == [float, int, str, type(None)]
+    assert pickle.loads(pickle.dumps(batch)).to_records() == records
+
+
+def test_batch_drops_extra_fields():
+    """Test that fields without a column can be dropped to save memory."""
+    batch = ListingBatch.from_records(make_records(), keep_extra=False)
+    
+    first = batch.to_records()[0]
+    
+    assert "features" not in first and "seller" not in first
+    assert first["brand"] == "Toyota"
+
+
+def test_concat_merges_categories():
+    """Test that category codes are remapped when batches are concatenated."""
+    first = ListingBatch.from_records([{"brand": "Toyota"}, {"brand": "Honda"}])
+    second = ListingBatch.from_records([{"brand": "Fiat"}, {"brand": "Toyota"}, {"title": "Unknown"}])
+    
+    batch = ListingBatch.concat([first, second])
+    
+    assert batch.categories["brand"] == ["Toyota", "Honda", "Fiat"]
+    assert batch.to_records() == first.to_records() + second.to_records()
+
+
+def test_to_frame_feeds_processor():
+    """Test that the column fields can be processed as a frame."""
+    batch = ListingBatch.from_records(make_records()[:2])
+    
+    frame = batch.to_frame()
+    processed = CarProcessor().process_frame(frame)
+    
+    assert list(frame.columns) == ["price", "year", "mileage", "brand", "model", "source", "id", "title", "url"]
+    assert isinstance(frame["brand"].dtype, pd.CategoricalDtype)
+    assert processed["model"].tolist() == ["Corolla XEi", "Civic"]
+
@@ -0,0 +1,103 @@
+"""
+Tests for the catalog-driven title parser.
+"""
+
+import pickle
+
+import pandas as pd
+import pytest
+
+from src.data.processors.car_processor import CarProcessor
+from src.data.processors.title_parser import TitleParser, tokenize
+
+
+@pytest.fixture
+def title_parser():
+    """Create a parser from a small catalog."""
+    brands = pd.DataFrame([
+        {"id": 1, "name": "Toyota"},
+        {"id": 2, "name": "Land Rover"},
+        {"id": 3, "name": "Mercedes-Benz"},
+        {"id": 4, "name": "Citroën"},
+        {"id": 5, "name": "Land"},
+    ])
+    models = pd.DataFrame([
+        {"id": 10, "brand_id": 1, "name": "Corolla"},
+        {"id": 11, "brand_id": 1, "name": "Corolla Cross"},
+        {"id": 20, "brand_id": 2, "name": "Range Rover Evoque"},
+        {"id": 21, "brand_id": 2, "name": "Defender"},
+        {"id": 30, "brand_id": 3, "name": "C180"},
+        {"id": 40, "brand_id": 4, "name": "C3"},
+        {"id": 50, "brand_id": 5, "name": "Defender"},
+    ])
+    versions = pd.DataFrame([
+        {"id": 100, "model_id": 10, "name": "2.0"},
+        {"id": 101, "model_id": 10, "name": "2.0 Hybrid"},
+    ])
+    return TitleParser(brands, models, versions)
+
+
+def test_tokenize():
+    """Test that accents, case and punctuation are normalized."""
+    assert tokenize("Citroën C3 1.6 Flex - Único dono") == ["citroen", "c3", "1.6", "flex", "unico", "dono"]
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("Land Rover Defender 110", {"brand": "Land Rover", "brand_id": 2, "model": "Defender", "model_id": 21}),
+    ("MERCEDES BENZ C180 Avantgarde", {"brand": "Mercedes-Benz", "brand_id": 3, "model": "C180", "model_id": 30}),
+    ("Citroen C3 Tendance", {"brand": "Citroën", "brand_id": 4, "model": "C3", "model_id": 40}),
+    ("2021 Toyota Corolla Cross XRE", {"brand": "Toyota", "brand_id": 1, "model": "Corolla Cross", "model_id": 11}),
+    (
+        "Toyota Corolla 2.0 Hybrid Altis",
+        {
+            "brand": "Toyota",
+            "brand_id": 1,
+            "model": "Corolla",
+            "model_id": 10,
+            "version": "2.0 Hybrid",
+            "version_id": 101,
+        },
+    ),
+    ("Range Rover Evoque Dynamic", {"brand": "Land Rover", "brand_id": 2, "model": "Range Rover Evoque", "model_id": 20}),
+    ("Defender 90", {}),
+    ("Ford Ka", {}),
+])
+def test_parse(title_parser, title, expected):
+    """Test resolving titles to catalog entries."""
+    assert title_parser.parse(title) == expected
+
+
+def test_parse_caches_titles(title_parser):
+    """Test that repeated titles are served from the cache."""
+    title_parser.parse("Toyota Corolla")
+    title_parser.parse("Toyota Corolla")
+    
+    assert title_parser._cache.hits == 1
+
+
+def test_parser_is_picklable(title_parser):
+    """Test that the parser can be sent to worker processes."""
+    title_parser.parse("Toyota Corolla")
+    
+    restored = pickle.loads(pickle.dumps(title_parser))
+    
+    assert restored.parse("Land Rover Defender")["brand_id"] == 2
+    assert len(restored._cache) == 1
+
+
+def test_processor_uses_catalog(title_parser):
+    """Test that the processor prefers the catalog and falls back to the regex."""
+    processor = CarProcessor(title_parser=title_parser)
+    records = [
+        {"title": "Land Rover Defender 2020", "price": 100000},
+        {"title": "Ford Ka 2015", "price": 30000},
+    ]
+    
+    processed = processor.process(records)
+    processed_frame = processor.process_frame(pd.DataFrame(records))
+    
+    assert processed[0]["brand"] == "Land Rover" and processed[0]["model_id"] == 21
+    assert processed[1]["brand"] == "Ford" and processed[1]["model"] == "Ka 2015"
+    assert processed_frame["brand"].tolist() == ["Land Rover", "Ford"]
+    assert processed_frame["model_id"].iloc[0] == 21
+    assert pd.isna(processed_frame["model_id"].iloc[1])
@@ -0,0 +1,35 @@
+"""
+Tests for the shared file utilities.
+"""
+
+import os
+import stat
+
+import pytest
+
+from src.services.file_utils import atomic_write
+
+
+def test_atomic_write_replaces_file(tmp_path):
+    """Test that the file is created with its directories and replaced as a whole."""
+    path = str(tmp_path / "nested" / "state.json")
+    
+    atomic_write(path, b"first")
+    atomic_write(path, b"second", mode=0o600)
+    
+    with open(path, "rb") as f:
+        assert f.read() == b"second"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert os.listdir(tmp_path / "nested") == ["state.json"]
+
+
+def test_atomic_write_removes_temporary_file_on_error(tmp_path, monkeypatch):
+    """Test that a failed write leaves neither a partial target nor a temporary file."""
+    def fail(source, target):
+        raise OSError("disk full")
+    
+    monkeypatch.setattr(os, "replace", fail)
+    
+    with pytest.raises(OSError):
+        atomic_write(str(tmp_path / "state.json"), b"data")
+    assert os.listdir(tmp_path) == []
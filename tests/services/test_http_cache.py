@@ -0,0 +1,92 @@
+"""
+Tests for the on-disk HTTP response cache.
+"""
+
+import os
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.http_cache import HTTPCache
+
+
+@pytest.fixture
+def session():
+    """Create a mocked session."""
+    return MagicMock()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create an HTTP cache in a temporary directory."""
+    return HTTPCache(cache_dir=str(tmp_path), ttl=60)
+
+
+def test_fresh_entry_is_served_locally(cache, session, http_response):
+    """Test that a cached response is reused without a network call."""
+    session.request.return_value = http_response(body=b'{"vehicles": [1]}')
+    
+    first = cache.request(session, "GET", "https://example.test/catalog", params={"page": 1})
+    second = cache.request(session, "GET", "https://example.test/catalog", params={"page": 1})
+    
+    assert session.request.call_count == 1
+    assert second.json() == first.json() == {"vehicles": [1]}
+    assert second.from_cache is True
+
+
+def test_params_are_part_of_the_key(cache, session, http_response):
+    """Test that different params are cached separately."""
+    session.request.side_effect = lambda **kwargs: http_response(body=str(kwargs["params"]).encode())
+    
+    cache.request(session, "GET", "https://example.test/catalog", params={"page": 1})
+    cache.request(session, "GET", "https://example.test/catalog", params={"page": 2})
+    
+    assert session.request.call_count == 2
+
+
+def test_stale_entry_is_revalidated(cache, session, http_response):
+    """Test that a stale entry sends validators and is reused on 304."""
+    session.request.return_value = http_response(body=b"original", headers={"ETag": '"v1"'})
+    cache.request(session, "GET", "https://example.test/page")
+    
+    cache.ttl = 0
+    session.request.return_value = http_response(status_code=304)
+    response = cache.request(session, "GET", "https://example.test/page")
+    
+    assert session.request.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert response.status_code == 200
+    assert response.content == b"original"
+
+
+def test_non_get_requests_bypass_cache(cache, session, http_response):
+    """Test that POST requests are never cached."""
+    session.request.return_value = http_response(body=b"{}")
+    
+    cache.request(session, "POST", "https://example.test/simulation", json={})
+    cache.request(session, "POST", "https://example.test/simulation", json={})
+    
+    assert session.request.call_count == 2
+    assert cache.size == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, session, http_response):
+    """Test that the cache stays under its size limit by evicting old entries."""
+    cache = HTTPCache(cache_dir=str(tmp_path), ttl=60, max_bytes=250)
+    session.request.side_effect = lambda **kwargs: http_response(body=b"x" * 100, url=kwargs["url"])
+    
+    cache.request(session, "GET", "https://example.test/a")
+    time.sleep(0.01)
+    cache.request(session, "GET", "https://example.test/b")
+    time.sleep(0.01)
+    cache.request(session, "GET", "https://example.test/a")
+    time.sleep(0.01)
+    cache.request(session, "GET", "https://example.test/c")
+    
+    assert cache.size <= 250
+    body_path, _ = cache._paths(cache.make_key("GET", "https://example.test/b"))
+    assert not os.path.exists(body_path)
+    
+    calls = session.request.call_count
+    cache.request(session, "GET", "https://example.test/a")
+    assert session.request.call_count == calls
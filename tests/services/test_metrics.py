@@ -0,0 +1,105 @@
+"""
+Tests for the HTTP client metrics.
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.metrics import ClientMetrics, percentile_from_buckets, to_prometheus, write_metrics
+from src.services.webmotors.client import WebmotorsClient
+from src.services.webmotors.token_cache import TokenCache
+
+
+@pytest.fixture
+def metrics():
+    """Create metrics with a few recorded requests."""
+    metrics = ClientMetrics(buckets=[0.1, 0.5, 1.0])
+    for latency in [0.05, 0.05, 0.2, 0.3, 0.8]:
+        metrics.record("catalog", 200, latency, size=100)
+    metrics.record("catalog/vehicle", 503, 2.0, size=10)
+    metrics.record("catalog/vehicle", None, 0.01)
+    return metrics
+
+
+def test_snapshot_counts_requests(metrics):
+    """Test that requests, status codes and bytes are counted per endpoint."""
+    snapshot = metrics.snapshot()
+    
+    catalog = snapshot["endpoints"]["catalog"]
+    assert catalog["requests"] == 5
+    assert catalog["status_codes"] == {"200": 5}
+    assert catalog["bytes"] == 500
+    assert catalog["latency_buckets"] == [2, 2, 1, 0]
+    assert snapshot["endpoints"]["catalog/vehicle"]["status_codes"] == {"503": 1, "error": 1}
+
+
+def test_snapshot_is_json_serializable(metrics):
+    """Test that snapshots can be written as JSON."""
+    metrics.set_gauge("concurrency_window", 4)
+    snapshot = json.loads(json.dumps(metrics.snapshot()))
+    
+    assert snapshot["gauges"] == {"concurrency_window": 4}
+
+
+def test_percentiles_are_estimated_from_buckets():
+    """Test that percentiles interpolate inside the bucket holding them."""
+    bounds = [1.0, 2.0]
+    
+    assert percentile_from_buckets(bounds, [0, 0, 0], 0.5) is None
+    assert percentile_from_buckets(bounds, [0, 10, 0], 0.5) == pytest.approx(1.5)
+    assert percentile_from_buckets(bounds, [5, 5, 0], 0.99) == pytest.approx(1.98)
+    # The overflow bucket is bounded by the largest observation
+    assert percentile_from_buckets(bounds, [0, 0, 2], 1.0, max_value=4.0) == pytest.approx(4.0)
+
+
+def test_prometheus_export(metrics):
+    """Test that the Prometheus export has one header per family and cumulative buckets."""
+    text = to_prometheus({"webmotors": metrics.snapshot()})
+    
+    assert text.count("# TYPE http_client_request_duration_seconds histogram") == 1
+    assert 'http_client_requests_total{client="webmotors",endpoint="catalog",status="200"} 5' in text
+    assert 'http_client_request_duration_seconds_bucket{client="webmotors",endpoint="catalog",le="0.5"} 4' in text
+    assert 'http_client_request_duration_seconds_bucket{client="webmotors",endpoint="catalog",le="+Inf"} 5' in text
+    assert 'http_client_request_duration_seconds_count{client="webmotors",endpoint="catalog"} 5' in text
+
+
+def test_write_metrics(metrics, tmp_path):
+    """Test that metrics are written as JSON and Prometheus files."""
+    json_path, prom_path = write_metrics({"webmotors": metrics.snapshot()}, str(tmp_path))
+    
+    with open(json_path, encoding="utf-8") as f:
+        assert json.load(f)["webmotors"]["endpoints"]["catalog"]["requests"] == 5
+    with open(prom_path, encoding="utf-8") as f:
+        assert "http_client_requests_total" in f.read()
+
+
+def test_webmotors_client_records_endpoints():
+    """Test that the client labels requests by endpoint without path parameters."""
+    client = WebmotorsClient(
+        client_id="id",
+        client_secret="secret",
+        api_username="user",
+        api_password="password",
+        token_cache=TokenCache(),
+    )
+    client.token_cache.set("token", 3600)
+    response = MagicMock(status_code=200, content=b'{"id": "1"}', headers={}, from_cache=False)
+    response.json.return_value = {"id": "1"}
+    client.session.request = MagicMock(return_value=response)
+    
+    client.get_catalog()
+    client.get_vehicle_details("123")
+    client.get_vehicle_details("456")
+    client.get_financing_simulation("123", 1000.0, 12)
+    
+    snapshot = client.get_metrics()
+    assert {name: stats["requests"] for name, stats in snapshot["endpoints"].items()} == {
+        "catalog": 1,
+        "catalog/vehicle": 2,
+        "financing/simulation": 1,
+    }
+    assert snapshot["endpoints"]["catalog/vehicle"]["bytes"] == 2 * len(response.content)
+    assert snapshot["gauges"]["concurrency_window"] == client.concurrency_window
+    assert WebmotorsClient.endpoint_label("https://auth.test/oauth/v1/access-token") == "access-token"
@@ -0,0 +1,129 @@
+"""
+Tests for the offline harness: the local stub server and record/replay cassettes.
+"""
+
+import pytest
+import requests
+
+from src.data.collectors.cars_com_collector import CarsComCollector
+from src.data.collectors.webmotors_collector import WebmotorsCollector
+from src.data.db_manager import DBManager
+from src.data.listing_store import ListingStore
+from src.services.testing.cassette import CassetteMissError, use_cassette
+from src.services.testing.stub_server import StubServer
+from src.services.webmotors.client import WebmotorsClient
+from src.services.webmotors.token_cache import TokenCache
+
+
+@pytest.fixture
+def server():
+    """Run a stub server for the duration of a test."""
+    with StubServer(pages=2, per_page=5) as server:
+        yield server
+
+
+@pytest.fixture
+def stub_env(server, monkeypatch):
+    """Point the Webmotors client configuration at the stub server."""
+    monkeypatch.setenv("WEBMOTORS_CLIENT_ID", "stub_client_id")
+    monkeypatch.setenv("WEBMOTORS_CLIENT_SECRET", "stub_client_secret")
+    monkeypatch.setenv("WEBMOTORS_API_USERNAME", "stub_username")
+    monkeypatch.setenv("WEBMOTORS_API_PASSWORD", "stub_password")
+    monkeypatch.setenv("WEBMOTORS_API_BASE_URL", server.url)
+    monkeypatch.setenv("WEBMOTORS_AUTH_BASE_URL", server.auth_url)
+
+
+def make_client(server):
+    """Create a client talking to the stub server."""
+    return WebmotorsClient(
+        client_id="stub_client_id",
+        client_secret="stub_client_secret",
+        api_username="stub_username",
+        api_password="stub_password",
+        base_url=server.url,
+        auth_base_url=server.auth_url,
+        token_cache=TokenCache(),
+    )
+
+
+def test_client_against_stub(server):
+    """Test the client endpoints against the stub server."""
+    client = make_client(server)
+    
+    assert client.authenticate() is True
+    catalog = client.get_catalog(params={"page": 2})
+    assert [vehicle["id"] for vehicle in catalog["vehicles"]] == ["6", "7", "8", "9", "10"]
+    assert client.get_vehicle_details("6")["location"]["state"]
+    assert client.get_financing_simulation("6", 10000.0, 36)["installmentValue"] > 0
+
+
+def test_stub_requires_token(server):
+    """Test that API endpoints reject requests without a valid token."""
+    response = requests.get(f"{server.url}/catalog")
+    assert response.status_code == 401
+
+
+def test_stub_error_rate():
+    """Test that the error rate makes the stub answer with 503."""
+    with StubServer(error_rate=1.0) as server:
+        response = requests.post(f"{server.auth_url}/access-token")
+        assert response.status_code == 503
+
+
+def test_webmotors_collector_against_stub(server, stub_env):
+    """Test a full Webmotors crawl against the stub server."""
+    collector = WebmotorsCollector(config={"max_pages": 5, "filters": {}, "max_workers": 4})
+    
+    listings = collector.collect()
+    
+    assert len(listings) == 10
+    assert server.requests["catalog"] == 2
+    assert server.requests["catalog/vehicle"] == 10
+
+
+def test_stub_crawl_into_store(server, stub_env, tmp_path):
+    """Test that a state picked by name in the UI finds the crawled listings in the store."""
+    listings = WebmotorsCollector(config={"max_pages": 5, "filters": {}}).collect()
+    db_manager = DBManager(db_dir="tests/data/test_db", logo_cache_dir=str(tmp_path / "logos"))
+    states = dict(zip(db_manager.states["abbreviation"], db_manager.states["name"]))
+    
+    with ListingStore(str(tmp_path / "listings.db")) as store:
+        store.upsert(listings)
+        
+        abbreviation = listings[0]["location"]["state"]
+        prices = [listing["price"] for listing in listings if listing["location"]["state"] == abbreviation]
+        summary = store.price_summary(state=db_manager.get_state_abbreviation(states[abbreviation]))
+    
+    assert states[abbreviation] in db_manager.get_states()
+    assert summary["count"] == len(prices)
+    assert summary["min"] == min(prices) and summary["max"] == max(prices)
+
+
+def test_cars_com_collector_against_stub(server):
+    """Test a cars.com crawl against the stub server."""
+    collector = CarsComCollector(base_url=server.url, config={"max_pages": 2, "delay": 0, "max_workers": 2})
+    
+    listings = collector.collect()
+    
+    assert len(listings) == 10
+    assert listings[0]["url"] == f"{server.url}/vehicledetail/1/"
+
+
+def test_record_and_replay(tmp_path):
+    """Test that recorded traffic can be replayed without the server."""
+    path = str(tmp_path / "cassette.json")
+    
+    with StubServer(pages=1, per_page=3) as server:
+        client = make_client(server)
+        with use_cassette(client.session, path, mode="record"):
+            recorded = [client.get_catalog(params={"page": 1}), client.get_vehicle_details("2")]
+    
+    # The server is gone, so every response must come from the cassette
+    client = make_client(server)
+    with use_cassette(client.session, path, mode="replay"):
+        replayed = [client.get_catalog(params={"page": 1}), client.get_vehicle_details("2")]
+        
+        with pytest.raises(CassetteMissError):
+            client.session.get(f"{server.url}/catalog/vehicle/99")
+    
+    assert replayed == recorded
@@ -0,0 +1,128 @@
+"""
+Tests for the Webmotors API client using a mocked HTTP session.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.services.webmotors.client import WebmotorsClient
+from src.services.webmotors.token_cache import TokenCache
+
+pytestmark = pytest.mark.client
+
+
+@pytest.fixture
+def client():
+    """Create a WebmotorsClient with dummy credentials."""
+    client = WebmotorsClient(
+        client_id="test_client_id",
+        client_secret="test_client_secret",
+        api_username="test_username",
+        api_password="test_password",
+        base_url="https://api.test",
+        pool_size=4,
+        token_cache=TokenCache(),
+    )
+    yield client
+    client.close()
+
+
+def test_session_is_pooled(client):
+    """Test that the session mounts a pool of the configured size."""
+    adapter = client.session.get_adapter("https://api.test")
+    assert adapter._pool_maxsize == 4
+    assert client.session.headers["Accept-Encoding"] == "gzip, deflate"
+
+
+def test_requests_share_session(client, mock_response):
+    """Test that authentication and all endpoints go through the shared session."""
+    auth_response = mock_response(payload={"access_token": "token"})
+    api_response = mock_response(payload={"vehicles": []})
+    
+    with patch.object(client.session, "post", return_value=auth_response) as post, \
+            patch.object(client.session, "request", return_value=api_response) as request:
+        assert client.get_catalog() == {"vehicles": []}
+        assert client.get_vehicle_details("1") == {"vehicles": []}
+        assert client.get_financing_simulation("1", 1000.0, 12) == {"vehicles": []}
+    
+    assert post.call_count == 1
+    assert request.call_count == 3
+    assert request.call_args.kwargs["headers"]["Authorization"] == "Bearer token"
+
+
+def test_compression_can_be_disabled():
+    """Test that gzip can be turned off."""
+    client = WebmotorsClient(
+        client_id="test_client_id",
+        client_secret="test_client_secret",
+        api_username="test_username",
+        api_password="test_password",
+        compress=False,
+        token_cache=TokenCache(),
+    )
+    assert client.session.headers["Accept-Encoding"] == "identity"
+
+
+def test_token_is_reused_until_expiry(client, mock_response):
+    """Test that a cached token avoids re-authenticating."""
+    auth_response = mock_response(payload={"access_token": "token", "expires_in": 3600})
+    
+    with patch.object(client.session, "post", return_value=auth_response) as post, \
+            patch.object(client.session, "request", return_value=mock_response()):
+        client.get_catalog()
+        client.get_catalog()
+    
+    assert post.call_count == 1
+
+
+def test_token_is_refreshed_before_expiry(client, mock_response):
+    """Test that a token inside the refresh margin is renewed proactively."""
+    client.token_cache.set("old", expires_in=30)
+    auth_response = mock_response(payload={"access_token": "new", "expires_in": 3600})
+    
+    with patch.object(client.session, "post", return_value=auth_response) as post, \
+            patch.object(client.session, "request", return_value=mock_response()) as request:
+        client.get_catalog()
+    
+    assert post.call_count == 1
+    assert request.call_args.kwargs["headers"]["Authorization"] == "Bearer new"
+
+
+def test_token_is_shared_between_clients():
+    """Test that clients with the same credentials share one token."""
+    credentials = {
+        "client_id": "shared_client_id",
+        "client_secret": "shared_client_secret",
+        "api_username": "shared_username",
+        "api_password": "shared_password",
+    }
+    first = WebmotorsClient(**credentials)
+    second = WebmotorsClient(**credentials)
+    first.token_cache.set("token", expires_in=3600)
+    
+    assert second.token_cache is first.token_cache
+    assert second.get_access_token() == "token"
+
+
+def test_token_cache_file_is_shared(tmp_path):
+    """Test that a persisted token is picked up by another cache instance."""
+    path = str(tmp_path / "token.json")
+    TokenCache(key="key", path=path).set("token", expires_in=3600)
+    
+    assert TokenCache(key="key", path=path).get() == "token"
+    assert TokenCache(key="other", path=path).get() is None
+
+
+def test_unauthorized_invalidates_token(client, mock_response):
+    """Test that a 401 refreshes the token once and retries the request."""
+    client.token_cache.set("stale", expires_in=3600)
+    auth_response = mock_response(payload={"access_token": "fresh", "expires_in": 3600})
+    responses = [mock_response(status_code=401), mock_response(payload={"ok": True})]
+    
+    with patch.object(client.session, "post", return_value=auth_response) as post, \
+            patch.object(client.session, "request", side_effect=responses) as request:
+        assert client.get_catalog() == {"ok": True}
+    
+    assert post.call_count == 1
+    assert request.call_args.kwargs["headers"]["Authorization"] == "Bearer fresh"
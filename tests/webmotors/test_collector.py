@@ -0,0 +1,245 @@
+"""
+Tests for the Webmotors collector using a mocked API client.
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.data.collectors.webmotors_collector import WebmotorsCollector
+
+pytestmark = pytest.mark.collector
+
+
+def make_catalog(ids, total_pages=1):
+    """Build a catalog response containing the given vehicle IDs."""
+    return {
+        "vehicles": [{"id": vehicle_id, "title": f"Toyota Corolla {vehicle_id}"} for vehicle_id in ids],
+        "pagination": {"totalPages": total_pages},
+    }
+
+
+@pytest.fixture
+def client():
+    """Create a mocked WebmotorsClient."""
+    client = MagicMock()
+    client.get_access_token.return_value = "token"
+    return client
+
+
+def make_collector(client, **config):
+    """Create a WebmotorsCollector wired to the mocked client."""
+    config.setdefault("max_pages", 1)
+    config.setdefault("filters", {})
+    with patch("src.data.collectors.webmotors_collector.WebmotorsClient", return_value=client):
+        return WebmotorsCollector(config=config)
+
+
+def test_collect_serial(client):
+    """Test collecting listings with the default serial detail fetching."""
+    client.get_catalog.return_value = make_catalog(["1", "2"])
+    client.get_vehicle_details.side_effect = lambda vehicle_id: {"color": f"color-{vehicle_id}"}
+    
+    listings = make_collector(client).collect()
+    
+    assert [listing["id"] for listing in listings] == ["1", "2"]
+    assert listings[1]["color"] == "color-2"
+
+
+def test_collect_concurrent_preserves_order(client):
+    """Test that concurrent detail fetching keeps the catalog order."""
+    ids = [str(i) for i in range(10)]
+    client.get_catalog.return_value = make_catalog(ids)
+    
+    def get_vehicle_details(vehicle_id):
+        # Make earlier vehicles slower so they finish last
+        time.sleep(0.002 * (10 - int(vehicle_id)))
+        return {"color": "white"}
+    
+    client.get_vehicle_details.side_effect = get_vehicle_details
+    
+    listings = make_collector(client, max_workers=4).collect()
+    
+    assert [listing["id"] for listing in listings] == ids
+
+
+def test_collect_concurrent_isolates_errors(client):
+    """Test that a failing vehicle does not affect the rest of the page."""
+    client.get_catalog.return_value = make_catalog(["1", "2", "3", "4"])
+    
+    def get_vehicle_details(vehicle_id):
+        if vehicle_id == "2":
+            raise RuntimeError("boom")
+        if vehicle_id == "3":
+            return None
+        return {"color": "white"}
+    
+    client.get_vehicle_details.side_effect = get_vehicle_details
+    
+    listings = make_collector(client, max_workers=3).collect()
+    
+    assert [listing["id"] for listing in listings] == ["1", "4"]
+
+
+def test_validate_config_rejects_invalid_max_workers(client):
+    """Test that max_workers must be a positive integer."""
+    assert make_collector(client, max_workers=0).validate_config() is False
+    assert make_collector(client, max_workers=2).validate_config() is True
+
+
+def test_iter_pages_streams_each_page(client):
+    """Test that listings are yielded page by page until the last page."""
+    catalogs = {
+        1: make_catalog(["1", "2"], total_pages=2),
+        2: make_catalog(["3"], total_pages=2),
+    }
+    client.get_catalog.side_effect = lambda params: catalogs[params["page"]]
+    client.get_vehicle_details.return_value = {"color": "white"}
+    
+    collector = make_collector(client, max_pages=5)
+    pages = collector.iter_pages()
+    
+    assert [listing["id"] for listing in next(pages)] == ["1", "2"]
+    assert client.get_catalog.call_count == 1
+    assert [listing["id"] for listing in next(pages)] == ["3"]
+    assert list(pages) == []
+    assert [listing["id"] for listing in collector.iter_listings()] == ["1", "2", "3"]
+
+
+def test_incremental_collection_skips_unchanged_vehicles(client, tmp_path):
+    """Test that a second run only fetches new or changed vehicles."""
+    state_file = str(tmp_path / "state.json")
+    client.get_vehicle_details.return_value = {"color": "white"}
+    
+    catalog = make_catalog(["1", "2"])
+    client.get_catalog.return_value = catalog
+    assert len(make_collector(client, state_file=state_file).collect()) == 2
+    
+    client.get_vehicle_details.reset_mock()
+    catalog = make_catalog(["1", "2", "3"])
+    catalog["vehicles"][1]["price"] = 99000
+    client.get_catalog.return_value = catalog
+    
+    listings = make_collector(client, state_file=state_file).collect()
+    
+    assert [listing["id"] for listing in listings] == ["2", "3"]
+    assert client.get_vehicle_details.call_count == 2
+
+
+def test_interrupted_collection_resumes_after_last_page(client, tmp_path):
+    """Test that a crawl stopped mid-run resumes from the next page."""
+    state_file = str(tmp_path / "state.json")
+    client.get_catalog.side_effect = lambda params: make_catalog([str(params["page"])], total_pages=3)
+    client.get_vehicle_details.return_value = {"color": "white"}
+    
+    pages = make_collector(client, max_pages=3, state_file=state_file).iter_pages()
+    next(pages)
+    next(pages)
+    pages.close()
+    
+    client.get_catalog.reset_mock()
+    listings = make_collector(client, max_pages=3, state_file=state_file).collect()
+    
+    # Page 1 was handled, page 2 was yielded but never acknowledged
+    assert [call.kwargs["params"]["page"] for call in client.get_catalog.call_args_list] == [2, 3]
+    assert [listing["id"] for listing in listings] == ["2", "3"]
+    
+    # A finished crawl starts from the first page again
+    client.get_catalog.reset_mock()
+    make_collector(client, max_pages=3, state_file=state_file).collect()
+    assert client.get_catalog.call_args_list[0].kwargs["params"]["page"] == 1
+
+
+def test_resume_retries_failed_page(client, tmp_path):
+    """Test that the cursor does not move past a failed page when a later page succeeds."""
+    state_file = str(tmp_path / "state.json")
+    
+    def get_catalog(params):
+        if params["page"] == 2:
+            raise ConnectionError("timeout")
+        return make_catalog([str(params["page"])], total_pages=4)
+    
+    client.get_catalog.side_effect = get_catalog
+    client.get_vehicle_details.return_value = {"color": "white"}
+    
+    pages = make_collector(client, max_pages=4, state_file=state_file).iter_pages()
+    assert [listing["id"] for listing in next(pages)] == ["1"]
+    assert [listing["id"] for listing in next(pages)] == ["3"]
+    next(pages)
+    pages.close()
+    
+    client.get_catalog.reset_mock()
+    client.get_catalog.side_effect = lambda params: make_catalog([str(params["page"])], total_pages=4)
+    listings = make_collector(client, max_pages=4, state_file=state_file).collect()
+    
+    # Page 2 is fetched again; page 3 was fingerprinted, so its vehicle is not refetched
+    assert [call.kwargs["params"]["page"] for call in client.get_catalog.call_args_list] == [2, 3, 4]
+    assert [listing["id"] for listing in listings] == ["2", "4"]
+
+
+def test_partitioned_crawl_deduplicates_vehicles(client):
+    """Test that shards are crawled separately and overlapping vehicles are fetched once."""
+    shard_ids = {2020: ["1", "2", "3"], 2021: ["3", "4"], 2022: ["4", "5"]}
+    client.get_catalog.side_effect = lambda params: make_catalog(shard_ids[params["year"]])
+    client.get_vehicle_details.return_value = {"color": "white"}
+    
+    collector = make_collector(
+        client,
+        filters={"brand": "Toyota"},
+        partition={"dimensions": ["year"], "values": {"year": [2020, 2021, 2022]}, "max_workers": 3},
+    )
+    listings = collector.collect()
+    
+    assert sorted(listing["id"] for listing in listings) == ["1", "2", "3", "4", "5"]
+    assert client.get_vehicle_details.call_count == 5
+    queried = sorted(call.kwargs["params"]["year"] for call in client.get_catalog.call_args_list)
+    assert queried == [2020, 2021, 2022]
+
+
+def test_failed_vehicle_is_retried_by_other_shard(client):
+    """Test that a vehicle whose details failed in one shard can still be collected by another."""
+    shard_ids = {2020: ["1", "3"], 2021: ["3", "4"]}
+    client.get_catalog.side_effect = lambda params: make_catalog(shard_ids[params["year"]])
+    failed = []
+    
+    def get_vehicle_details(vehicle_id):
+        if vehicle_id == "3" and not failed:
+            failed.append(vehicle_id)
+            return None
+        return {"color": "white"}
+    
+    client.get_vehicle_details.side_effect = get_vehicle_details
+    
+    collector = make_collector(
+        client,
+        partition={"dimensions": ["year"], "values": {"year": [2020, 2021]}, "max_workers": 1},
+    )
+    listings = collector.collect()
+    
+    assert failed == ["3"]
+    assert sorted(listing["id"] for listing in listings) == ["1", "3", "4"]
+
+
+def test_invalid_partition_dimension(client):
+    """Test that unsupported partition dimensions are rejected."""
+    collector = make_collector(client, partition={"dimensions": ["color"]})
+    
+    assert not collector.validate_config()
+    assert collector.collect() == []
+
+
+def test_listing_images_are_stored_locally(client, tmp_path):
+    """Test that listings get the local paths of their images."""
+    client.get_catalog.return_value = make_catalog(["1", "2"])
+    client.get_vehicle_details.side_effect = lambda vehicle_id: {
+        "images": [f"https://img.test/{vehicle_id}.jpg", "https://img.test/stock.jpg"],
+    }
+    session = MagicMock()
+    session.get.side_effect = lambda url, timeout=None: MagicMock(content=url.encode(), headers={})
+    
+    listings = make_collector(client, image_store={"root": str(tmp_path), "session": session}).collect()
+    
+    assert [len(listing["image_paths"]) for listing in listings] == [2, 2]
+    assert listings[0]["image_paths"][1] == listings[1]["image_paths"][1]
+    assert session.get.call_count == 3
@@ -0,0 +1,106 @@
+"""
+Tests for the adaptive concurrency limiter of the Webmotors client.
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.services.webmotors.client import WebmotorsClient
+from src.services.webmotors.concurrency import AdaptiveLimiter, parse_retry_after
+from src.services.webmotors.token_cache import TokenCache
+
+pytestmark = pytest.mark.client
+
+
+def test_window_grows_on_healthy_responses():
+    """Test that fast successful responses grow the window additively."""
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=8)
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(latency=0.01, status_code=200)
+    
+    assert 4 <= limiter.limit <= 8
+
+
+def test_window_halves_on_throttling():
+    """Test that 429 responses cut the window multiplicatively."""
+    limiter = AdaptiveLimiter(initial_limit=8, min_limit=1)
+    limiter.acquire()
+    limiter.release(latency=0.01, status_code=429)
+    
+    assert limiter.limit == 4
+
+
+def test_slow_responses_shrink_window():
+    """Test that latency above the target shrinks the window."""
+    limiter = AdaptiveLimiter(initial_limit=10, latency_target=0.5)
+    limiter.acquire()
+    limiter.release(latency=1.0, status_code=200)
+    
+    assert limiter.limit == 9
+
+
+def test_retry_after_pauses_new_requests():
+    """Test that Retry-After blocks acquire until it has passed."""
+    limiter = AdaptiveLimiter(initial_limit=4)
+    limiter.acquire()
+    limiter.release(latency=0.01, status_code=503, retry_after=0.2)
+    
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.15
+
+
+def test_in_flight_never_exceeds_window():
+    """Test that concurrent callers are held to the window."""
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=2)
+    peak = []
+    
+    def worker():
+        limiter.acquire()
+        peak.append(limiter.in_flight)
+        time.sleep(0.02)
+        limiter.release()
+    
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert max(peak) <= 2
+
+
+def test_parse_retry_after():
+    """Test parsing delay seconds and HTTP dates."""
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not a date") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_client_retries_throttled_requests(mock_response):
+    """Test that the client retries a 429 and shrinks its window."""
+    client = WebmotorsClient(
+        client_id="test_client_id",
+        client_secret="test_client_secret",
+        api_username="test_username",
+        api_password="test_password",
+        token_cache=TokenCache(),
+        limiter=AdaptiveLimiter(initial_limit=8),
+    )
+    client.token_cache.set("token", expires_in=3600)
+    
+    responses = [
+        mock_response(status_code=429, headers={"Retry-After": "0"}),
+        mock_response(payload={"ok": True}),
+    ]
+    
+    with patch.object(client.session, "request", side_effect=responses) as request:
+        assert client.get_catalog() == {"ok": True}
+    
+    assert request.call_count == 2
+    assert client.concurrency_window == 4
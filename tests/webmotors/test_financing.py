@@ -0,0 +1,113 @@
+"""
+Tests for the local financing simulator and the memoized financing endpoint.
+"""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.services.lru_cache import LRUCache
+from src.services.webmotors.financing import (
+    CachedFinancingClient,
+    FinancingSimulator,
+    amortize,
+    implied_monthly_rate,
+)
+
+
+def make_simulation(price, down_payment, term, rate):
+    """Build an API-like simulation response for a known rate."""
+    return {
+        "vehiclePrice": price,
+        "downPayment": down_payment,
+        "termMonths": term,
+        "installmentValue": round(float(amortize(price - down_payment, rate, term)), 2),
+    }
+
+
+def test_amortize_matches_price_table():
+    """Test installments against the closed-form Price table formula."""
+    rate, term, principal = 0.0149, 48, 80000.0
+    expected = principal * rate / (1 - (1 + rate) ** -term)
+    
+    assert float(amortize(principal, rate, term)) == pytest.approx(expected)
+    assert float(amortize(1200.0, 0.0, 12)) == pytest.approx(100.0)
+    assert float(amortize(-10.0, rate, 12)) == 0.0
+
+
+def test_implied_rate_roundtrip():
+    """Test that solved rates reproduce the rates used to build installments."""
+    rates = np.array([0.005, 0.0149, 0.03])
+    terms = np.array([12, 48, 60])
+    installments = amortize(50000.0, rates, terms)
+    
+    assert implied_monthly_rate(50000.0, terms, installments) == pytest.approx(rates, abs=1e-9)
+    assert np.isnan(implied_monthly_rate(50000.0, 12, 100.0))
+
+
+def test_calibrate_per_term():
+    """Test that calibration recovers the rate charged for each term."""
+    simulations = [make_simulation(90000.0, down, 24, 0.012) for down in [10000.0, 20000.0, 30000.0]]
+    simulations += [make_simulation(90000.0, down, 60, 0.019) for down in [10000.0, 20000.0]]
+    simulations.append({"termMonths": 12})
+    
+    simulator = FinancingSimulator()
+    
+    assert simulator.calibrate(simulations) == 5
+    assert simulator.term_rates[24] == pytest.approx(0.012, abs=1e-5)
+    assert simulator.term_rates[60] == pytest.approx(0.019, abs=1e-5)
+    assert simulator.monthly_rate == pytest.approx(0.012, abs=1e-5)
+
+
+def test_installment_grid_shapes():
+    """Test that whole grids of financing options are computed at once."""
+    simulator = FinancingSimulator(monthly_rate=0.015, term_rates={36: 0.01})
+    down_payments = np.linspace(0, 50000, 11)
+    terms = [12, 24, 36, 48, 60]
+    
+    grid = simulator.installments(100000.0, down_payments, terms)
+    rate_grid = simulator.installments(100000.0, down_payments, terms, monthly_rates=[0.01, 0.02])
+    
+    assert grid.shape == (11, 5)
+    assert rate_grid.shape == (11, 5, 2)
+    assert grid[3, 2] == pytest.approx(float(amortize(100000.0 - down_payments[3], 0.01, 36)))
+    assert rate_grid[3, 0, 1] == pytest.approx(float(amortize(100000.0 - down_payments[3], 0.02, 12)))
+
+
+def test_simulate_uses_api_format():
+    """Test that single simulations look like API responses."""
+    simulation = FinancingSimulator(monthly_rate=0.0149).simulate(90000.0, 10000.0, 48)
+    
+    assert simulation["installmentValue"] == pytest.approx(round(float(amortize(80000.0, 0.0149, 48)), 2))
+    assert simulation["estimated"] is True
+
+
+def test_cached_client_memoizes_simulations():
+    """Test that repeated simulations hit the API once and failures are not cached."""
+    client = MagicMock()
+    client.get_financing_simulation.side_effect = [None, {"installmentValue": 100.0}]
+    cached = CachedFinancingClient(client)
+    
+    assert cached.get_financing_simulation("1", 1000.0, 12) is None
+    assert cached.get_financing_simulation("1", 1000.0, 12) == {"installmentValue": 100.0}
+    assert cached.get_financing_simulation("1", 1000, 12) == {"installmentValue": 100.0}
+    assert client.get_financing_simulation.call_count == 2
+
+
+def test_lru_cache_evicts_and_expires(monkeypatch):
+    """Test LRU eviction and TTL expiry."""
+    now = [0.0]
+    monkeypatch.setattr("src.services.lru_cache.time.monotonic", lambda: now[0])
+    cache = LRUCache(maxsize=2, ttl=10)
+    
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    
+    now[0] = 11.0
+    assert cache.get("c") is None